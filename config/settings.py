@@ -38,6 +38,54 @@ DATABASES = {
     )
 }
 
+# Cache (o.a. referentiedata: statussen, types, users). Per proces; zet een gedeelde backend
+# (Redis/Memcached) als invalidatie direct over alle workers moet gelden.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "hrm-default",
+    }
+}
+REFERENCE_CACHE_TIMEOUT = int(os.environ.get("REFERENCE_CACHE_TIMEOUT", "300"))
+
+# Achtergrondjobs (core.services.jobs). Zonder `manage.py run_jobs` blijven jobs liggen;
+# JOBS_EAGER=True voert ze direct na de commit uit in het request zelf.
+JOBS_EAGER = os.environ.get("JOBS_EAGER", "False") == "True"
+NOTIFICATION_BATCH_SIZE = int(os.environ.get("NOTIFICATION_BATCH_SIZE", "500"))
+# /notifications/stream/ (alleen onder ASGI): wake-ups komen via de in-process broker,
+# notificaties uit een losse worker ziet de stream uiterlijk na dit aantal seconden.
+NOTIFICATION_STREAM_POLL_INTERVAL = float(os.environ.get("NOTIFICATION_STREAM_POLL_INTERVAL", "15"))
+# fuzzy zoeken op personen (core.services.fuzzy): minimale trigram-overeenkomst, 0..1
+PERSON_FUZZY_THRESHOLD = float(os.environ.get("PERSON_FUZZY_THRESHOLD", "0.4"))
+# bewaartermijn history (manage.py archive_history): maanden in HistoryEvent, daarna in de
+# archieftabel, daarna als gzipped JSONL in HISTORY_ARCHIVE_DIR
+HISTORY_HOT_MONTHS = int(os.environ.get("HISTORY_HOT_MONTHS", "6"))
+HISTORY_ARCHIVE_MONTHS = int(os.environ.get("HISTORY_ARCHIVE_MONTHS", "24"))
+HISTORY_ARCHIVE_DIR = Path(os.environ.get("HISTORY_ARCHIVE_DIR", BASE_DIR / "archive" / "history"))
+# dashboardcijfers (core.services.dashboard): komen uit DashboardStat en worden zo lang gecachet;
+# manage.py rebuild_dashboard_stats telt de tabel opnieuw
+DASHBOARD_CACHE_TIMEOUT = int(os.environ.get("DASHBOARD_CACHE_TIMEOUT", "60"))
+DASHBOARD_WEEKS = int(os.environ.get("DASHBOARD_WEEKS", "12"))
+# inbox "mijn werk" (core.services.inbox): maximaal zoveel items per bron, en taken die
+# binnen zoveel dagen verlopen
+INBOX_LIMIT = int(os.environ.get("INBOX_LIMIT", "50"))
+INBOX_DUE_DAYS = int(os.environ.get("INBOX_DUE_DAYS", "7"))
+# taakherinneringen (manage.py run_reminders): "verloopt binnenkort" zoveel uur vóór de
+# deadline; taken met een status met een van deze keys gelden als afgerond
+TASK_REMINDER_DUE_SOON_HOURS = int(os.environ.get("TASK_REMINDER_DUE_SOON_HOURS", "24"))
+TASK_DONE_STATUS_KEYS = ["done"]
+# INCLUDE-kolommen van de covering indexes werken alleen op Postgres; op SQLite zit de
+# rowid (= id) al in elke index, dus daar is de waarschuwing zinloos
+SILENCED_SYSTEM_CHECKS = ["models.W040"]
+# queries per request meten (core.middleware.QueryBudgetMiddleware, standaard uit): Server-Timing-
+# header en een waarschuwing in log "core.querybudget" boven het budget of bij een queryvorm
+# die QUERY_BUDGET_REPEAT keer herhaald wordt (N+1); budget per url-naam in QUERY_BUDGET_VIEWS
+QUERY_BUDGET_ENABLED = os.environ.get("QUERY_BUDGET_ENABLED", "False") == "True"
+QUERY_BUDGET = int(os.environ.get("QUERY_BUDGET", "30"))
+QUERY_BUDGET_MS = float(os.environ.get("QUERY_BUDGET_MS", "500"))
+QUERY_BUDGET_REPEAT = int(os.environ.get("QUERY_BUDGET_REPEAT", "5"))
+QUERY_BUDGET_VIEWS = {}
+
 LOGIN_URL = "/login/"
 LOGIN_REDIRECT_URL = "/"
 LOGOUT_REDIRECT_URL = "/login/"
@@ -70,6 +118,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "core.middleware.QueryBudgetMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -90,6 +139,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'core.context_processors.notifications',
             ],
         },
     },
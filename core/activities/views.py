@@ -1,31 +1,23 @@
 from django.contrib.contenttypes.models import ContentType
-from django.core.paginator import Paginator
 from django.db.models import Q
 from django.shortcuts import render
 
 from core.auth import staff_required
-from core.models.history import HistoryEvent
+from core.pagination import ChainedKeysetPaginator
+from core.services.history import CHANGE_FIELD_LABELS, attach_change_rows, facets, filter_by_change
+from core.models.history import HistoryArchive, HistoryEvent
 from core.models.notifications import Notification
 
 
-@staff_required
-def activities_list(request):
-    qs = HistoryEvent.objects.select_related("actor", "content_type").order_by("-created_at")
-
+def _filtered(qs, notification_ct, q, action, model):
     # exclude notifications
-    notification_ct = ContentType.objects.get_for_model(Notification)
-    qs = qs.exclude(content_type=notification_ct)
-
-    # filters
-    q = (request.GET.get("q") or "").strip()
-    action = (request.GET.get("action") or "").strip()
-    model = (request.GET.get("model") or "").strip()
+    qs = qs.select_related("actor", "content_type").exclude(content_type=notification_ct)
 
     if q:
+        # waarden zoeken gaat via het veldfilter (geïndexeerd), niet via een scan over changes
         qs = qs.filter(
             Q(actor__username__icontains=q)
             | Q(action__icontains=q)
-            | Q(changes__icontains=q)
         )
 
     if action:
@@ -34,14 +26,32 @@ def activities_list(request):
     if model:
         qs = qs.filter(content_type__model=model)
 
-    # dropdown opties
-    raw_actions = (
-        HistoryEvent.objects
-        .exclude(content_type=notification_ct)
-        .values_list("action", flat=True)
-        .distinct()
-        .order_by("action")
-    )
+    return qs
+
+
+@staff_required
+def activities_list(request):
+    notification_ct = ContentType.objects.get_for_model(Notification)
+
+    # filters
+    q = (request.GET.get("q") or "").strip()
+    action = (request.GET.get("action") or "").strip()
+    model = (request.GET.get("model") or "").strip()
+    field = (request.GET.get("field") or "").strip()
+    old = (request.GET.get("old") or "").strip()
+    new = (request.GET.get("new") or "").strip()
+
+    qs = _filtered(HistoryEvent.objects.all(), notification_ct, q, action, model)
+    querysets = [qs]
+    if field in CHANGE_FIELD_LABELS:
+        # alleen de hete tabel: het archief heeft geen HistoryChange-rijen
+        querysets[0] = filter_by_change(qs, field, old=old, new=new)
+    else:
+        # oudere maanden (manage.py archive_history): na de laatste hete pagina bladert de lijst daar door
+        querysets.append(_filtered(HistoryArchive.objects.all(), notification_ct, q, action, model))
+
+    # dropdown opties (uit HistoryFacet, geen DISTINCT over de hele log)
+    action_counts, model_counts = facets(exclude_models=[notification_ct.model])
 
     ACTION_LABELS = {
         "created": "Aangemaakt",
@@ -58,25 +68,24 @@ def activities_list(request):
     actions = [
         {
             "value": a,
-            "label": ACTION_LABELS.get(a, a.replace("_", " ").capitalize())
+            "label": ACTION_LABELS.get(a, a.replace("_", " ").capitalize()),
+            "count": n,
         }
-        for a in raw_actions
+        for a, n in action_counts
     ]
-    models = (
-        HistoryEvent.objects.exclude(content_type=notification_ct)
-        .values_list("content_type__model", flat=True).distinct().order_by("content_type__model")
-    )
+    models = [{"value": m, "count": n} for m, n in model_counts]
 
-  
-
-    # pagination
-    paginator = Paginator(qs, 25)
-    page_obj = paginator.get_page(request.GET.get("page"))
+    # pagination (keyset: diep bladeren blijft even snel)
+    paginator = ChainedKeysetPaginator(querysets, 25, ["-created_at", "-id"])
+    page_obj = paginator.get_page(request.GET.get("cursor"))
 
     # maak display velden + link naar object
+    attach_change_rows(page_obj.object_list)
+
     events = []
     for h in page_obj.object_list:
-        actor_label = h.actor.username if h.actor_id else "Systeem"
+        # archief: de actor kan inmiddels verwijderd zijn
+        actor_label = h.actor.username if h.actor else "Systeem"
 
         action_label = ACTION_LABELS.get(h.action, h.action.replace("_", " ").capitalize())
         model_name = h.content_type.model if h.content_type_id else "onbekend"
@@ -98,7 +107,9 @@ def activities_list(request):
             "model": model_name,
             "object_id": h.object_id,
             "changes": h.changes,
+            "change_rows": h.change_rows,
             "url": url,
+            "archived": isinstance(h, HistoryArchive),
         })
 
     return render(request, "core/activities/list.html", {
@@ -107,7 +118,11 @@ def activities_list(request):
         "q": q,
         "action": action,
         "model": model,
+        "field": field,
+        "old": old,
+        "new": new,
         "actions": actions,
         "models": models,
+        "change_fields": CHANGE_FIELD_LABELS.items(),
         "active_nav": "activities",
     })
\ No newline at end of file
@@ -1,10 +1,67 @@
+
+from django import forms
+from django.core.exceptions import PermissionDenied
 from django.contrib import admin
 from django.contrib.contenttypes.admin import GenericTabularInline
+from django.template.response import TemplateResponse
+from django.urls import path
 
 from core.models import (
-    Signal, Task, Note, HistoryEvent, Status, SignalType, TaskType, Notification, Person
+    Signal, Task, Note, HistoryEvent, Status, SignalType, TaskType, Notification, Person, Job
 )
 
+from core.services import imports
+
+
+class CsvImportForm(forms.Form):
+    file = forms.FileField(label="CSV-bestand")
+    encoding = forms.ChoiceField(label="Codering", choices=imports.ENCODINGS.items(), initial="utf-8-sig")
+    batch_size = forms.IntegerField(label="Blokgrootte", initial=500, min_value=1, max_value=5000)
+    dry_run = forms.BooleanField(label="Alleen controleren", required=False)
+
+
+class CsvImportMixin:
+    """Voegt "Importeren (CSV)" toe aan de changelist; verwerkt via core.services.imports."""
+
+    import_kind = None
+    change_list_template = "admin/core/change_list_import.html"
+
+    def get_urls(self):
+        info = self.model._meta.app_label, self.model._meta.model_name
+        return [
+            path("import-csv/", self.admin_site.admin_view(self.import_csv_view), name="%s_%s_import_csv" % info),
+        ] + super().get_urls()
+
+    def import_csv_view(self, request):
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+
+        form = CsvImportForm(request.POST or None, request.FILES or None)
+        result = None
+        if request.method == "POST" and form.is_valid():
+            upload = form.cleaned_data["file"]
+            try:
+                rows = imports.read_csv(upload.file, encoding=form.cleaned_data["encoding"])
+            except imports.READ_ERRORS as e:
+                # al de kopregel is niet te lezen
+                form.add_error("file", imports.read_error(e))
+            else:
+                result = imports.import_rows(
+                    self.import_kind, rows, request.user,
+                    batch_size=form.cleaned_data["batch_size"],
+                    dry_run=form.cleaned_data["dry_run"],
+                )
+
+        return TemplateResponse(request, "admin/core/import_csv.html", {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": f"{self.model._meta.verbose_name_plural} importeren",
+            "form": form,
+            "result": result,
+            "columns": imports.IMPORTS[self.import_kind]["form"]._meta.fields,
+        })
+
+
 class NoteInline(GenericTabularInline):
     model = Note
     extra = 0
@@ -19,14 +76,16 @@ class HistoryInline(GenericTabularInline):
     can_delete = False
 
 @admin.register(Signal)
-class SignalAdmin(admin.ModelAdmin):
+class SignalAdmin(CsvImportMixin, admin.ModelAdmin):
+    import_kind = "signal"
     inlines = [NoteInline, HistoryInline]
     list_display = ("id", "type", "assigned_to", "active_from", "status", "is_archived", "created_at")
     list_filter = ("type", "status", "is_archived")
     search_fields = ("body",)
 
 @admin.register(Task)
-class TaskAdmin(admin.ModelAdmin):
+class TaskAdmin(CsvImportMixin, admin.ModelAdmin):
+    import_kind = "task"
     inlines = [NoteInline, HistoryInline]
     list_display = ("id", "type", "assigned_to", "due_at", "status", "is_archived", "created_at")
     list_filter = ("type", "status", "is_archived")
@@ -59,7 +118,14 @@ class NotificationAdmin(admin.ModelAdmin):
     search_fields = ("title", "body")
 
 @admin.register(Person)
-class PersonAdmin(admin.ModelAdmin):
+class PersonAdmin(CsvImportMixin, admin.ModelAdmin):
+    import_kind = "person"
     list_display = ("id", "person_type", "last_name", "first_name", "email", "phone", "created_at")
     list_filter = ("person_type",)
-    search_fields = ("first_name", "last_name", "email", "phone")
\ No newline at end of file
+    search_fields = ("first_name", "last_name", "email", "phone")
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "status", "attempts", "run_after", "created_at", "finished_at")
+    list_filter = ("status", "kind")
+    readonly_fields = ("created_at", "finished_at", "locked_at", "last_error")
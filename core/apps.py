@@ -3,3 +3,14 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from core.services import dashboard, fuzzy, reference, search
+        reference.connect_signals()
+        search.connect_signals()
+        fuzzy.connect_signals()
+        dashboard.connect_signals()
+
+        # registreert de job handlers
+        import core.services.bulk  # noqa: F401
+        import core.signals.services  # noqa: F401
@@ -0,0 +1,10 @@
+from django.utils.functional import SimpleLazyObject
+
+from core.services.notifications import unread_count
+
+
+def notifications(request):
+    # lazy: alleen een query als het template de badge echt rendert
+    return {
+        "unread_notification_count": SimpleLazyObject(lambda: unread_count(request.user)),
+    }
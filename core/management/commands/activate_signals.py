@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from core.services.activation import activate_signals
+
+
+class Command(BaseCommand):
+    help = (
+        "Dagelijkse ronde voor ingeplande meldingen: notificaties voor alles wat vandaag actief "
+        "wordt (bv. om 00:05 vanuit cron). Opnieuw draaien is veilig."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="Dag om te verwerken (YYYY-MM-DD, standaard vandaag).")
+        parser.add_argument("--days", type=int, default=1, help="Aantal dagen t/m --date, om gemiste dagen in te halen.")
+        parser.add_argument("--batch-size", type=int, default=None, help="Meldingen per transactie (standaard NOTIFICATION_BATCH_SIZE).")
+
+    def handle(self, *args, **options):
+        day = None
+        if options["date"]:
+            day = parse_date(options["date"])
+            if day is None:
+                raise CommandError("Ongeldige datum, verwacht YYYY-MM-DD.")
+        if options["days"] < 1:
+            raise CommandError("--days moet minstens 1 zijn.")
+
+        stats = activate_signals(day, days=options["days"], batch_size=options["batch_size"])
+        self.stdout.write(f"{stats['signals']} meldingen actief, {stats['notifications']} notificaties verstuurd")
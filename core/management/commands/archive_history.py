@@ -0,0 +1,47 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.models import HistoryArchive, HistoryEvent
+from core.services import archive
+
+
+class Command(BaseCommand):
+    help = (
+        "Verplaatst HistoryEvents ouder dan --keep-months naar de archieftabel en schrijft "
+        "archiefmaanden ouder dan --export-months naar gzipped JSONL (en haalt ze uit de database)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--keep-months", type=int, default=getattr(settings, "HISTORY_HOT_MONTHS", 6))
+        parser.add_argument("--export-months", type=int, default=getattr(settings, "HISTORY_ARCHIVE_MONTHS", 24))
+        parser.add_argument("--dir", default=None, help="Map voor de archiefbestanden (standaard HISTORY_ARCHIVE_DIR).")
+        parser.add_argument("--dry-run", action="store_true", help="Alleen laten zien welke maanden aan de beurt zijn.")
+
+    def handle(self, *args, **options):
+        keep = options["keep_months"]
+        # een maand gaat pas naar een bestand als hij ook uit de hete tabel is
+        export = max(options["export_months"], keep)
+        directory = Path(options["dir"]) if options["dir"] else None
+
+        hot_months = archive.months_before(HistoryEvent.objects.all(), archive.cutoff(keep))
+        for month in hot_months:
+            if options["dry_run"]:
+                self.stdout.write(f"{month:%Y-%m}: naar archieftabel")
+                continue
+            moved = archive.archive_month(month)
+            self.stdout.write(f"{month:%Y-%m}: {moved} events naar de archieftabel")
+
+        cold_months = archive.months_before(HistoryArchive.objects.all(), archive.cutoff(export))
+        for month in cold_months:
+            if options["dry_run"]:
+                self.stdout.write(f"{month:%Y-%m}: naar {archive.archive_path(month, directory)}")
+                continue
+            path, written = archive.export_month(month, directory)
+            self.stdout.write(f"{month:%Y-%m}: {written} events naar {path}")
+
+        if not hot_months and not cold_months:
+            self.stdout.write("Niets te archiveren.")
+        elif not options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS("Klaar."))
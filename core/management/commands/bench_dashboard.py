@@ -0,0 +1,92 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import HistoryEvent, Signal, SignalType, Status, Task, TaskType
+from core.services import dashboard
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Vergelijkt de dashboardcijfers: live GROUP BY's (live_stats) vs de DashboardStat-tabel "
+        "(summary_stats), bij groeiende tabellen. Alles draait in een transactie die aan het eind "
+        "wordt teruggedraaid."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="1000,10000,100000", help="Aantal meldingen/taken/events per stap.")
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(s) for s in options["sizes"].split(",") if s.strip())
+        try:
+            with transaction.atomic():
+                self._run(sizes, options)
+                raise Rollback
+        except Rollback:
+            pass
+        cache.delete(dashboard.CACHE_KEY)
+
+    def _run(self, sizes, options):
+        User = get_user_model()
+        users = User.objects.bulk_create([User(username=f"__bench_dashboard_{i}", is_staff=True) for i in range(20)])
+        signal_type = SignalType.objects.create(name="__bench_dashboard__")
+        task_type = TaskType.objects.create(name="__bench_dashboard__")
+        statuses = [Status.objects.create(key=f"bench-{i}", name=f"Bench {i}", scope="signal") for i in range(5)]
+        ct = ContentType.objects.get_for_model(Signal)
+
+        filled = 0
+        for size in sizes:
+            self._fill(filled, size, users, signal_type, task_type, statuses, ct, options["batch_size"])
+            filled = size
+            # bulk_create telt niet mee: de tabel één keer opnieuw vullen
+            dashboard.rebuild()
+
+            results = {}
+            for name, func in (("live", dashboard.live_stats), ("tabel", dashboard.summary_stats)):
+                timings = []
+                for _ in range(options["repeat"]):
+                    start = time.perf_counter()
+                    func()
+                    timings.append((time.perf_counter() - start) * 1000)
+                results[name] = statistics.median(timings)
+
+            self.stdout.write(
+                f"{size:>10} rijen/tabel  live {results['live']:.2f} ms  "
+                f"tabel {results['tabel']:.2f} ms  ({results['live'] / results['tabel']:.0f}x)"
+            )
+
+    def _fill(self, start, stop, users, signal_type, task_type, statuses, ct, batch_size):
+        rng = random.Random(start)
+        now = timezone.now()
+        for offset in range(start, stop, batch_size):
+            ids = range(offset, min(offset + batch_size, stop))
+            Signal.objects.bulk_create(
+                Signal(type=signal_type, status=rng.choice(statuses), body="bench", is_archived=rng.random() < 0.3)
+                for _ in ids
+            )
+            Task.objects.bulk_create(
+                Task(type=task_type, assigned_to=rng.choice(users), body="bench",
+                     due_at=now + timedelta(days=rng.randint(-60, 60)))
+                for _ in ids
+            )
+            events = HistoryEvent.objects.bulk_create(
+                HistoryEvent(content_type=ct, object_id=i, action="updated") for i in ids
+            )
+            # verspreid over de laatste maanden
+            for event in events:
+                event.created_at = now - timedelta(hours=rng.randint(0, 24 * 120))
+            HistoryEvent.objects.bulk_update(events, ["created_at"], batch_size=batch_size)
@@ -0,0 +1,63 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.models import Notification, Signal, SignalType
+from core.services.notifications import fan_out, fan_out_orm
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Vergelijkt notificatie fan-out: ORM-loop vs INSERT ... SELECT, per aantal ontvangers. "
+        "Alles draait in een transactie die aan het eind wordt teruggedraaid."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="100,1000,10000", help="Aantallen ontvangers.")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(s) for s in options["sizes"].split(",") if s.strip())
+        try:
+            with transaction.atomic():
+                self._run(sizes, options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _run(self, sizes, options):
+        User = get_user_model()
+        signal_type = SignalType.objects.create(name="__bench_fanout__")
+        signal = Signal.objects.create(type=signal_type, body="bench")
+        batch_size = options["batch_size"]
+
+        created = 0
+        for size in sizes:
+            User.objects.bulk_create(
+                [User(username=f"__bench_fanout_{i}", is_staff=True) for i in range(created, size)],
+                batch_size=5000,
+            )
+            created = size
+            recipients = User.objects.filter(is_staff=True, username__startswith="__bench_fanout_")
+
+            results = {}
+            for name, func in (("orm", fan_out_orm), ("sql", fan_out)):
+                timings = []
+                for _ in range(options["repeat"]):
+                    Notification.objects.filter(object_id=signal.id, kind="bench").delete()
+                    start = time.perf_counter()
+                    func(signal, recipients, kind="bench", title="Bench", body="bench", url="/", batch_size=batch_size)
+                    timings.append((time.perf_counter() - start) * 1000)
+                results[name] = min(timings)
+
+            self.stdout.write(
+                f"{size:>8} ontvangers  orm {results['orm']:8.1f} ms  sql {results['sql']:8.1f} ms  "
+                f"x{results['orm'] / max(results['sql'], 0.001):.1f}"
+            )
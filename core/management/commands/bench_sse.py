@@ -0,0 +1,169 @@
+import asyncio
+import statistics
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+from core.models import Signal, SignalType
+from core.services.notifications import fan_out
+from core.services.pubsub import broker
+
+PREFIX = "__bench_sse_"
+
+
+class Subscriber:
+    """Eén EventSource-client, rechtstreeks tegen de ASGI-applicatie (zonder netwerk)."""
+
+    def __init__(self, app, cookie: str):
+        self.app = app
+        self.cookie = cookie
+        self.connected = asyncio.Event()
+        self.disconnect = asyncio.Event()
+        self.arrivals = []
+        self.status = None
+        self._body_sent = False
+
+    async def receive(self):
+        if not self._body_sent:
+            self._body_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self.disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+        elif message["type"] == "http.response.body":
+            body = message.get("body", b"")
+            self.arrivals.extend([time.perf_counter()] * body.count(b"event: notification"))
+            self.connected.set()
+
+    async def run(self):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/notifications/stream/",
+            "raw_path": b"/notifications/stream/",
+            "query_string": b"",
+            "root_path": "",
+            "headers": [
+                (b"host", b"localhost"),
+                (b"accept", b"text/event-stream"),
+                (b"cookie", f"{settings.SESSION_COOKIE_NAME}={self.cookie}".encode()),
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": ("localhost", 80),
+        }
+        await self.app(scope, self.receive, self.send)
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Simuleert N gelijktijdige abonnees op /notifications/stream/ binnen de ASGI-applicatie "
+        "(config.asgi) en meet de tijd van fan-out tot event. Testdata wordt na afloop verwijderd."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--subscribers", type=int, default=300)
+        parser.add_argument("--notifications", type=int, default=5)
+        parser.add_argument("--timeout", type=float, default=30.0, help="Max. wachttijd (s) per stap.")
+
+    def handle(self, *args, **options):
+        from config.asgi import application
+
+        User = get_user_model()
+        n = options["subscribers"]
+        User.objects.bulk_create([User(username=f"{PREFIX}{i}", is_staff=True) for i in range(n)], batch_size=1000)
+        users = list(User.objects.filter(username__startswith=PREFIX))
+        signal_type = SignalType.objects.create(name=f"{PREFIX}type")
+
+        cookies = []
+        try:
+            for user in users:
+                client = Client()
+                client.force_login(user)
+                cookies.append(client.cookies[settings.SESSION_COOKIE_NAME].value)
+
+            start = time.perf_counter()
+            result = asyncio.run(self._run(application, cookies, users, signal_type, options))
+            result["total_s"] = time.perf_counter() - start
+        finally:
+            Session.objects.filter(session_key__in=cookies).delete()
+            Signal.objects.filter(type=signal_type).delete()
+            signal_type.delete()
+            User.objects.filter(username__startswith=PREFIX).delete()
+
+        self._report(result, options)
+
+    async def _run(self, app, cookies, users, signal_type, options):
+        timeout = options["timeout"]
+        subscribers = [Subscriber(app, cookie) for cookie in cookies]
+        tasks = [asyncio.create_task(s.run()) for s in subscribers]
+
+        connect_start = time.perf_counter()
+        await asyncio.wait_for(asyncio.gather(*(s.connected.wait() for s in subscribers)), timeout)
+        connect_s = time.perf_counter() - connect_start
+        listening = broker.subscriber_count()
+
+        recipients = get_user_model().objects.filter(id__in=[u.id for u in users])
+
+        def publish(i):
+            signal = Signal.objects.create(type=signal_type, body=f"bench {i}")
+            fan_out(signal, recipients, kind="signal_created", title=f"Bench {i}", url="/")
+
+        latencies, missing = [], 0
+        for i in range(options["notifications"]):
+            sent = time.perf_counter()
+            await sync_to_async(publish)(i)
+            deadline = sent + timeout
+            while any(len(s.arrivals) <= i for s in subscribers) and time.perf_counter() < deadline:
+                await asyncio.sleep(0.005)
+            for s in subscribers:
+                if len(s.arrivals) > i:
+                    latencies.append((s.arrivals[i] - sent) * 1000)
+                else:
+                    missing += 1
+
+        for s in subscribers:
+            s.disconnect.set()
+        await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), timeout)
+
+        return {
+            "subscribers": len(subscribers),
+            "listening": listening,
+            "connect_s": connect_s,
+            "latencies": sorted(latencies),
+            "missing": missing,
+            "left_open": broker.subscriber_count(),
+        }
+
+    def _report(self, result, options):
+        lat = result["latencies"]
+        expected = result["subscribers"] * options["notifications"]
+        self.stdout.write(
+            f"{result['subscribers']} abonnees verbonden in {result['connect_s']:.2f} s "
+            f"({result['listening']} in de broker)"
+        )
+        self.stdout.write(f"{len(lat)}/{expected} events afgeleverd, {result['missing']} gemist")
+        if lat:
+            self.stdout.write(
+                f"latentie  p50 {_percentile(lat, 50):7.1f} ms  p95 {_percentile(lat, 95):7.1f} ms  "
+                f"p99 {_percentile(lat, 99):7.1f} ms  max {lat[-1]:7.1f} ms"
+            )
+        self.stdout.write(f"na afloop nog {result['left_open']} streams open; totaal {result['total_s']:.1f} s")
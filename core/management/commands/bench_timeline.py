@@ -0,0 +1,78 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.models import HistoryEvent, Note, Person
+from core.services.timeline import get_timeline
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark detail-timeline (notes + history) bij groeiende tabellen. "
+        "Alles draait in een transactie die aan het eind wordt teruggedraaid."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="1000,10000,100000", help="Totaal aantal achtergrondrijen per stap.")
+        parser.add_argument("--per-object", type=int, default=20, help="Notes + history van het gemeten object.")
+        parser.add_argument("--repeat", type=int, default=50)
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(s) for s in options["sizes"].split(",") if s.strip())
+        try:
+            with transaction.atomic():
+                self._run(sizes, options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _run(self, sizes, options):
+        User = get_user_model()
+        user = User.objects.create(username="__bench_timeline__")
+        ct = ContentType.objects.get_for_model(Person)
+        target = Person.objects.create(first_name="Bench", last_name="Target")
+
+        per_object = options["per_object"]
+        Note.objects.bulk_create(
+            Note(content_type=ct, object_id=target.pk, author=user, body=f"notitie {i}") for i in range(per_object)
+        )
+        HistoryEvent.objects.bulk_create(
+            HistoryEvent(content_type=ct, object_id=target.pk, actor=user, action="updated", changes={"i": [i, i + 1]})
+            for i in range(per_object)
+        )
+
+        filled = 0
+        for size in sizes:
+            self._fill(ct, user, target.pk, filled, size, options["batch_size"])
+            filled = size
+
+            timings = []
+            for _ in range(options["repeat"]):
+                start = time.perf_counter()
+                get_timeline(target)
+                timings.append((time.perf_counter() - start) * 1000)
+
+            self.stdout.write(
+                f"{size:>10} rijen/tabel  median {statistics.median(timings):.2f} ms  "
+                f"p95 {sorted(timings)[int(len(timings) * 0.95) - 1]:.2f} ms"
+            )
+
+    def _fill(self, ct, user, target_id, start, stop, batch_size):
+        # achtergrondrijen op andere object_ids, half notes / half history
+        for offset in range(start, stop, batch_size):
+            ids = range(offset, min(offset + batch_size, stop))
+            Note.objects.bulk_create(
+                Note(content_type=ct, object_id=target_id + 1 + i, author=user, body="x") for i in ids
+            )
+            HistoryEvent.objects.bulk_create(
+                HistoryEvent(content_type=ct, object_id=target_id + 1 + i, actor=user, action="updated") for i in ids
+            )
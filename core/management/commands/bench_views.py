@@ -0,0 +1,204 @@
+import json
+import statistics
+import subprocess
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Person, Status
+from core.services.fakedata import VOLUMES, FakeData
+from core.services.querybudget import QueryRecorder
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+class Rollback(Exception):
+    pass
+
+
+def percentile(values, p: int) -> float:
+    values = sorted(values)
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[p - 1]
+
+
+def _commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark van de lijst-, detail- en wijzigviews via de test client: latency (p50/p90/p95/p99) "
+        "en queries per view, bij groeiende datavolumes (core.services.fakedata). Alles draait in een "
+        "transactie die aan het eind wordt teruggedraaid; --json schrijft de resultaten weg om commits "
+        "te vergelijken (--baseline)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scales", default="1,10", help="Veelvouden van de standaardvolumes, oplopend.")
+        parser.add_argument(
+            "--volume", action="append", default=[], metavar="SOORT=AANTAL",
+            help=f"Standaardvolume aanpassen (soorten: {', '.join(VOLUMES)}); mag vaker.",
+        )
+        parser.add_argument("--repeat", type=int, default=20, help="Gemeten requests per view.")
+        parser.add_argument("--warmup", type=int, default=2, help="Requests per view vooraf, niet gemeten.")
+        parser.add_argument("--views", default="", help="Alleen views waarvan de naam dit bevat (komma-gescheiden).")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--json", dest="json_path", help="Resultaten als JSON naar dit bestand.")
+        parser.add_argument("--baseline", help="Eerder --json-bestand om mee te vergelijken.")
+
+    def handle(self, *args, **options):
+        scales = sorted(float(s) for s in options["scales"].split(",") if s.strip())
+        base = dict(VOLUMES)
+        for item in options["volume"]:
+            kind, _, count = item.partition("=")
+            if kind not in VOLUMES or not count.isdigit():
+                raise CommandError(f"Ongeldig volume: {item!r}")
+            base[kind] = int(count)
+        baseline = self._load_baseline(options["baseline"])
+
+        report = {
+            "commit": _commit(),
+            "created_at": timezone.now().isoformat(timespec="seconds"),
+            "database": connection.vendor,
+            "seed": options["seed"],
+            "repeat": options["repeat"],
+            "warmup": options["warmup"],
+            "volumes": {},
+            "results": [],
+        }
+        try:
+            with transaction.atomic():
+                self._run(scales, base, options, report, baseline)
+                raise Rollback
+        except Rollback:
+            pass
+        cache.clear()
+
+        if options["json_path"]:
+            Path(options["json_path"]).write_text(json.dumps(report, indent=2))
+            self.stdout.write(f"Resultaten in {options['json_path']}")
+
+    def _load_baseline(self, path) -> dict:
+        if not path:
+            return {}
+        try:
+            data = json.loads(Path(path).read_text())
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Baseline niet te lezen: {e}")
+        return {(row["scale"], row["view"]): row for row in data.get("results", [])}
+
+    def _run(self, scales, base, options, report, baseline):
+        data = FakeData(seed=options["seed"], batch_size=options["batch_size"])
+        user = get_user_model().objects.create_user("__bench_views__", is_staff=True, is_superuser=True)
+        client = Client()
+        client.force_login(user)
+        only = [v.strip() for v in options["views"].split(",") if v.strip()]
+
+        for scale in scales:
+            started = time.perf_counter()
+            wanted = {kind: round(count * scale) for kind, count in base.items()}
+            data.fill({kind: wanted[kind] - data.counts[kind] for kind in wanted})
+            report["volumes"][str(scale)] = dict(data.counts)
+            self.stdout.write(
+                f"\nSchaal {scale:g}: {', '.join(f'{n} {k}' for k, n in data.counts.items())} "
+                f"(gevuld in {time.perf_counter() - started:.1f} s)"
+            )
+            self.stdout.write(f"{'view':<28}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'queries':>9}")
+
+            for name, method, url, payload in self._scenarios(data):
+                if only and not any(part in name for part in only):
+                    continue
+                # dashboardcijfers en referentiedata zoals na een deploy: eerst leeg
+                cache.clear()
+                row = {"scale": scale, "view": name, "method": method.upper(), "url": url,
+                       **self._measure(client, method, url, payload, options)}
+                report["results"].append(row)
+                self.stdout.write(self._line(row, baseline.get((scale, name))))
+
+    def _scenarios(self, data):
+        """(naam, methode, url, data) per view; de doelen komen uit de gegenereerde rijen."""
+        rng = data.rng
+        signal, task, person = (rng.choice(data.ids[kind]) for kind in ("signal", "task", "person"))
+        last_name = Person.objects.filter(pk=person).values_list("last_name", flat=True).first()
+        signal_status = Status.objects.filter(scope="signal").values_list("id", flat=True).first()
+        signal_form = {"type": data.signal_types[0], "active_from": timezone.localdate().isoformat(), "body": "Benchmark"}
+        task_form = {"type": data.task_types[0], "assigned_to": data.ids["user"][0],
+                     "due_at": timezone.localtime().strftime("%Y-%m-%dT%H:%M"), "body": "Benchmark"}
+        person_form = {"person_type": "student", "first_name": "Bench", "last_name": last_name}
+        return [
+            ("dashboard", "get", reverse("dashboard"), None),
+            ("inbox", "get", reverse("inbox"), None),
+            ("search", "get", reverse("search"), {"q": last_name}),
+            ("activities:list", "get", reverse("activities:list"), None),
+            ("signals:list", "get", reverse("signals:list"), None),
+            ("signals:list?q", "get", reverse("signals:list"), {"q": last_name}),
+            ("signals:list?sort=type", "get", reverse("signals:list"), {"sort": "type", "dir": "asc"}),
+            ("signals:detail", "get", reverse("signals:detail", args=[signal]), None),
+            ("signals:export", "get", reverse("signals:export"), None),
+            ("signals:create", "post", reverse("signals:create"), signal_form),
+            ("signals:set_status", "post", reverse("signals:set_status", args=[signal]), {"status_id": signal_status or ""}),
+            ("signals:add_note", "post", reverse("signals:add_note", args=[signal]), {"body": "Benchmark"}),
+            ("tasks:list", "get", reverse("tasks:list"), None),
+            ("tasks:detail", "get", reverse("tasks:detail", args=[task]), None),
+            ("tasks:create", "post", reverse("tasks:create"), task_form),
+            ("tasks:update", "post", reverse("tasks:update", args=[task]), task_form),
+            ("people:list", "get", reverse("people:list"), None),
+            ("people:list?q", "get", reverse("people:list"), {"q": last_name}),
+            ("people:detail", "get", reverse("people:detail", args=[person]), None),
+            ("people:update", "post", reverse("people:update", args=[person]), person_form),
+            ("notifications_mark_all_read", "post", reverse("notifications_mark_all_read"), None),
+        ]
+
+    def _measure(self, client, method, url, payload, options) -> dict:
+        timings, queries = [], []
+        cold_queries = None
+        for i in range(options["warmup"] + options["repeat"]):
+            with QueryRecorder() as recorder:
+                started = time.perf_counter()
+                response = getattr(client, method)(url, payload or {})
+                if response.streaming:
+                    b"".join(response.streaming_content)
+                elapsed = (time.perf_counter() - started) * 1000
+            if response.status_code >= 400:
+                raise CommandError(f"{method.upper()} {url} gaf {response.status_code}")
+            if cold_queries is None:
+                cold_queries = recorder.count
+            if i >= options["warmup"]:
+                timings.append(elapsed)
+                queries.append(recorder.count)
+        return {
+            "status": response.status_code,
+            **{f"p{p}_ms": round(percentile(timings, p), 2) for p in PERCENTILES},
+            "mean_ms": round(statistics.mean(timings), 2),
+            "max_ms": round(max(timings), 2),
+            "queries": max(queries),
+            "queries_cold": cold_queries,
+        }
+
+    def _line(self, row, before) -> str:
+        line = (
+            f"{row['view']:<28}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}"
+            f"{row['max_ms']:>9.1f}{row['queries']:>9}"
+        )
+        if before:
+            change = (row["p50_ms"] - before["p50_ms"]) / before["p50_ms"] * 100 if before["p50_ms"] else 0
+            line += f"  p50 {change:+.0f}%  queries {row['queries'] - before['queries']:+d}"
+        return line
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.services.dashboard import rebuild
+
+
+class Command(BaseCommand):
+    help = "Telt de dashboardcijfers (DashboardStat) opnieuw uit meldingen, taken en history."
+
+    def handle(self, *args, **options):
+        total = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"{total} tellingen opgeslagen"))
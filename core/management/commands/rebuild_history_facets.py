@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.services.history import rebuild_facets
+
+
+class Command(BaseCommand):
+    help = "Telt de facetten van de activiteitenlijst (HistoryFacet) opnieuw uit alle HistoryEvents."
+
+    def handle(self, *args, **options):
+        total = rebuild_facets()
+        self.stdout.write(self.style.SUCCESS(f"{total} events geteld"))
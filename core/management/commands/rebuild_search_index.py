@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services import fuzzy, search
+
+
+class Command(BaseCommand):
+    help = (
+        "Bouwt de zoekindex (SearchEntry) opnieuw op uit meldingen, taken, notities en personen, "
+        "plus de trigrammen voor fuzzy zoeken op personen (alleen zonder Postgres). "
+        "Nodig na de eerste migratie en na wijzigingen die signals omzeilen (bv. QuerySet.update)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        total = search.rebuild(chunk_size=options["chunk_size"])
+        grams = fuzzy.rebuild(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} objecten geïndexeerd ({type(search.get_backend()).__name__}), "
+            f"{grams} trigrammen, in {time.perf_counter() - start:.1f} s"
+        ))
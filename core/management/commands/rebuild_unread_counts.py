@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.services.notifications import rebuild_unread_counts
+
+
+class Command(BaseCommand):
+    help = "Herberekent de unread-tellers (NotificationCounter) van alle users uit de notificaties."
+
+    def handle(self, *args, **options):
+        updated = rebuild_unread_counts()
+        self.stdout.write(self.style.SUCCESS(f"{updated} tellers bijgewerkt"))
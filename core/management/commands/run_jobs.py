@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services.dashboard import fold_deltas
+from core.services.jobs import run_pending
+
+
+class Command(BaseCommand):
+    help = (
+        "Worker voor achtergrondjobs (notificaties e.d.); verwerkt elke ronde ook de dashboard-deltas. "
+        "Draait door tot Ctrl+C, of één ronde met --once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Eén ronde verwerken en stoppen.")
+        parser.add_argument("--batch-size", type=int, default=50, help="Aantal jobs per ronde.")
+        parser.add_argument("--sleep", type=float, default=2.0, help="Wachttijd (s) als er niets te doen is.")
+
+    def handle(self, *args, **options):
+        while True:
+            ok, failed = run_pending(options["batch_size"])
+            fold_deltas()
+            if ok or failed:
+                self.stdout.write(f"{ok} jobs klaar, {failed} mislukt")
+            if options["once"]:
+                return
+            if not (ok or failed):
+                time.sleep(options["sleep"])
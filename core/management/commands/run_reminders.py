@@ -0,0 +1,40 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.services.reminders import ReminderScheduler
+
+
+class Command(BaseCommand):
+    help = (
+        "Worker voor taakherinneringen (verloopt binnenkort / verlopen). Draait door tot Ctrl+C, "
+        "of één ronde met --once (bv. vanuit cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Eén ronde verwerken en stoppen.")
+        parser.add_argument("--batch-size", type=int, default=500, help="Notificaties per INSERT.")
+        parser.add_argument("--window", type=int, default=15, help="Minuten vooruit in de heap.")
+        parser.add_argument("--refresh", type=int, default=60, help="Seconden tussen het verversen van de heap.")
+        parser.add_argument("--catch-up", type=int, default=24, help="Uren terug voor gemiste herinneringen.")
+        parser.add_argument("--max-sleep", type=float, default=30.0, help="Langste wachttijd (s) tussen twee ticks.")
+
+    def handle(self, *args, **options):
+        scheduler = ReminderScheduler(
+            window=timedelta(minutes=options["window"]),
+            refresh=timedelta(seconds=options["refresh"]),
+            catch_up=timedelta(hours=options["catch_up"]),
+            batch_size=options["batch_size"],
+        )
+        while True:
+            sent = scheduler.tick()
+            if sent or options["once"]:
+                self.stdout.write(f"{sent} herinneringen verstuurd ({len(scheduler.heap)} in de wachtrij)")
+            if options["once"]:
+                return
+            # slapen tot de volgende herinnering of het volgende verversen, wat eerst komt
+            wake = min(filter(None, [scheduler.next_fire(), scheduler.next_load]))
+            delay = (wake - timezone.now()).total_seconds()
+            time.sleep(min(max(delay, 0.5), options["max_sleep"]))
@@ -0,0 +1,83 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core.services.fakedata import VOLUMES, FakeData
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# soort -> optie
+OPTIONS = {
+    "user": "users",
+    "person": "people",
+    "signal": "signals",
+    "task": "tasks",
+    "note": "notes",
+    "history": "history",
+    "notification": "notifications",
+}
+
+
+def _peak_memory_mb() -> float | None:
+    if resource is None:
+        return None
+    # Linux: kilobytes
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Command(BaseCommand):
+    help = (
+        "Grote hoeveelheden realistische testdata voor staging en performancetests: staff users, "
+        "personen, meldingen, taken, notities, history en notificaties (core.services.fakedata). "
+        "Per blok één transactie, met --copy op PostgreSQL via COPY. Dezelfde --seed op dezelfde "
+        "database geeft dezelfde data."
+    )
+
+    def add_arguments(self, parser):
+        for kind, option in OPTIONS.items():
+            parser.add_argument(f"--{option}", type=int, default=VOLUMES[kind], help=f"Aantal (standaard {VOLUMES[kind]}).")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rijen per blok (en per transactie).")
+        parser.add_argument("--copy", action="store_true", help="COPY i.p.v. INSERT (alleen PostgreSQL).")
+        parser.add_argument("--progress", type=float, default=5.0, help="Seconden tussen voortgangsregels (0 = geen).")
+
+    def handle(self, *args, **options):
+        if options["copy"] and connection.vendor != "postgresql":
+            raise CommandError("--copy kan alleen op PostgreSQL.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size moet minstens 1 zijn.")
+        volumes = {kind: options[option] for kind, option in OPTIONS.items()}
+
+        data = FakeData(seed=options["seed"], batch_size=options["batch_size"], copy=options["copy"])
+        started = time.perf_counter()
+        last_report = [started]
+
+        def progress(kind, done, total):
+            now = time.perf_counter()
+            if options["progress"] and now - last_report[0] >= options["progress"]:
+                last_report[0] = now
+                self.stdout.write(f"  {kind}: {done}/{total}")
+
+        try:
+            data.fill(volumes, progress=progress)
+        except ValueError as e:
+            raise CommandError(str(e))
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(f"{'soort':<14}{'rijen':>12}{'seconden':>10}{'rijen/s':>10}")
+        for kind in OPTIONS:
+            if data.counts[kind]:
+                seconds = data.seconds[kind]
+                self.stdout.write(
+                    f"{kind:<14}{data.counts[kind]:>12}{seconds:>10.1f}{data.counts[kind] / seconds if seconds else 0:>10.0f}"
+                )
+        total = sum(data.counts.values())
+        peak = _peak_memory_mb()
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} rijen in {elapsed:.1f} s ({total / elapsed if elapsed else 0:.0f} rijen/s)"
+            + (f", piekgeheugen {peak:.0f} MB" if peak else "")
+        ))
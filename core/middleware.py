@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from core.services.querybudget import QueryRecorder
+
+logger = logging.getLogger("core.querybudget")
+
+
+class QueryBudgetMiddleware:
+    """
+    Telt en timet de queries per request (alleen met QUERY_BUDGET_ENABLED):
+
+    - Server-Timing-header met de databasetijd, het aantal queries en de totale tijd
+      (zichtbaar in de devtools van de browser, tabblad Network -> Timing);
+    - een waarschuwing in log "core.querybudget" als de view meer queries doet dan zijn
+      budget (QUERY_BUDGET, per url-naam te verhogen in QUERY_BUDGET_VIEWS), langer dan
+      QUERY_BUDGET_MS in de database zit, of dezelfde queryvorm QUERY_BUDGET_REPEAT keer
+      of vaker uitvoert (N+1).
+
+    Queries die een StreamingHttpResponse pas tijdens het streamen doet, tellen niet mee.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "QUERY_BUDGET_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        return self._report(request, response, recorder, started)
+
+    async def __acall__(self, request):
+        # sync views draaien onder ASGI per request in één thread (thread_sensitive);
+        # de recorder moet aan de verbindingen van die thread hangen
+        started = time.perf_counter()
+        recorder = QueryRecorder()
+        await sync_to_async(recorder.start)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(recorder.stop)()
+        return self._report(request, response, recorder, started)
+
+    def _report(self, request, response, recorder: QueryRecorder, started: float):
+        total_ms = (time.perf_counter() - started) * 1000
+        repeated = recorder.repeated(getattr(settings, "QUERY_BUDGET_REPEAT", 5))
+        response["Server-Timing"] = (
+            f'db;dur={recorder.duration_ms:.1f};desc="{recorder.count} queries", '
+            f"total;dur={total_ms:.1f}"
+        )
+
+        match = request.resolver_match
+        view = match.view_name if match else ""
+        budget = getattr(settings, "QUERY_BUDGET_VIEWS", {}).get(view, getattr(settings, "QUERY_BUDGET", 30))
+        budget_ms = getattr(settings, "QUERY_BUDGET_MS", 500)
+        if recorder.count > budget or recorder.duration_ms > budget_ms or repeated:
+            details = {
+                "method": request.method,
+                "path": request.path,
+                "view": view,
+                "status": response.status_code,
+                "queries": recorder.count,
+                "budget": budget,
+                "db_ms": round(recorder.duration_ms, 1),
+                "budget_ms": budget_ms,
+                "total_ms": round(total_ms, 1),
+                "repeated": [{"count": n, "sql": sql} for sql, n in repeated],
+            }
+            logger.warning(
+                "Querybudget overschreden: %s %s (%s) %d queries (budget %d), %.1f ms in de database%s",
+                request.method, request.path, view or "-", recorder.count, budget, recorder.duration_ms,
+                "".join(f"\n  {n}x {sql}" for sql, n in repeated),
+                extra={"query_budget": details},
+            )
+        return response
@@ -0,0 +1,101 @@
+# Generated by Django 6.0.2 on 2026-10-18 16:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.utils import OperationalError
+
+POSTGRES_SQL = [
+    # Nederlandse stammen (titel zwaarder) + de losse woorden ('simple') voor prefix-zoeken
+    """
+    ALTER TABLE core_searchentry ADD COLUMN document tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('dutch', title), 'A')
+        || setweight(to_tsvector('dutch', body || ' ' || keywords), 'B')
+        || to_tsvector('simple', title || ' ' || body || ' ' || keywords)
+    ) STORED
+    """,
+    "CREATE INDEX searchentry_document_gin ON core_searchentry USING gin (document)",
+]
+
+SQLITE_SQL = [
+    """
+    CREATE VIRTUAL TABLE core_searchentry_fts USING fts5(
+        title_terms, terms,
+        content='core_searchentry', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER core_searchentry_fts_ai AFTER INSERT ON core_searchentry BEGIN
+        INSERT INTO core_searchentry_fts (rowid, title_terms, terms) VALUES (new.id, new.title_terms, new.terms);
+    END
+    """,
+    """
+    CREATE TRIGGER core_searchentry_fts_ad AFTER DELETE ON core_searchentry BEGIN
+        INSERT INTO core_searchentry_fts (core_searchentry_fts, rowid, title_terms, terms)
+        VALUES ('delete', old.id, old.title_terms, old.terms);
+    END
+    """,
+    """
+    CREATE TRIGGER core_searchentry_fts_au AFTER UPDATE ON core_searchentry BEGIN
+        INSERT INTO core_searchentry_fts (core_searchentry_fts, rowid, title_terms, terms)
+        VALUES ('delete', old.id, old.title_terms, old.terms);
+        INSERT INTO core_searchentry_fts (rowid, title_terms, terms) VALUES (new.id, new.title_terms, new.terms);
+    END
+    """,
+]
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        for sql in POSTGRES_SQL:
+            schema_editor.execute(sql)
+    elif vendor == "sqlite":
+        try:
+            for sql in SQLITE_SQL:
+                schema_editor.execute(sql)
+        except OperationalError:
+            # SQLite zonder FTS5: core.services.search valt terug op LIKE
+            pass
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS searchentry_document_gin")
+        schema_editor.execute("ALTER TABLE core_searchentry DROP COLUMN IF EXISTS document")
+    elif vendor == "sqlite":
+        for name in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS core_searchentry_fts_{name}")
+        schema_editor.execute("DROP TABLE IF EXISTS core_searchentry_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('core', '0006_notification_unread_counter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField()),
+                ('label', models.CharField(max_length=100)),
+                ('title', models.CharField(blank=True, max_length=200)),
+                ('body', models.TextField(blank=True)),
+                ('url', models.CharField(max_length=255)),
+                ('keywords', models.TextField(blank=True)),
+                ('title_terms', models.TextField(blank=True)),
+                ('terms', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('content_type', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('content_type', 'object_id'), name='searchentry_unique_object')],
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
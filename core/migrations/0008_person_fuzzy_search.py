@@ -0,0 +1,78 @@
+# Generated by Django 6.0.2 on 2026-10-18 16:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from core.services.normalize import fold_name, normalize_phone, trigrams
+
+POSTGRES_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX person_search_text_trgm ON core_person USING gin (search_text gin_trgm_ops)",
+    "CREATE INDEX person_phone_trgm ON core_person USING gin (phone_normalized gin_trgm_ops)",
+]
+
+
+def fill_fuzzy_search(apps, schema_editor):
+    Person = apps.get_model("core", "Person")
+    PersonTrigram = apps.get_model("core", "PersonTrigram")
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "postgresql":
+        for sql in POSTGRES_SQL:
+            schema_editor.execute(sql)
+
+    batch = []
+    for person in Person.objects.order_by("pk").iterator(chunk_size=1000):
+        person.search_text = fold_name(person.first_name, person.last_name, person.email)[:400]
+        person.phone_normalized = normalize_phone(person.phone)[:30]
+        batch.append(person)
+        if len(batch) >= 1000:
+            Person.objects.bulk_update(batch, ["search_text", "phone_normalized"])
+            batch = []
+    if batch:
+        Person.objects.bulk_update(batch, ["search_text", "phone_normalized"])
+
+    if vendor != "postgresql":
+        rows = []
+        for person_id, text, phone in Person.objects.values_list("id", "search_text", "phone_normalized").iterator():
+            rows.extend(PersonTrigram(person_id=person_id, trigram=t) for t in trigrams(f"{text} {phone}"))
+        PersonTrigram.objects.bulk_create(rows, batch_size=1000)
+
+
+def drop_fuzzy_search(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS person_search_text_trgm")
+        schema_editor.execute("DROP INDEX IF EXISTS person_phone_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='person',
+            name='phone_normalized',
+            field=models.CharField(blank=True, editable=False, max_length=30),
+        ),
+        migrations.AddField(
+            model_name='person',
+            name='search_text',
+            field=models.CharField(blank=True, editable=False, max_length=400),
+        ),
+        migrations.CreateModel(
+            name='PersonTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigram', models.CharField(max_length=3)),
+                ('person', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='trigrams', to='core.person')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['person'], name='persontrigram_person_idx')],
+                'constraints': [models.UniqueConstraint(fields=('trigram', 'person'), name='persontrigram_unique')],
+            },
+        ),
+        migrations.RunPython(fill_fuzzy_search, drop_fuzzy_search),
+    ]
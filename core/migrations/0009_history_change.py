@@ -0,0 +1,46 @@
+# Generated by Django 6.0.2 on 2026-10-18 17:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_changes(apps, schema_editor):
+    from core.services.history import change_value
+
+    HistoryEvent = apps.get_model("core", "HistoryEvent")
+    HistoryChange = apps.get_model("core", "HistoryChange")
+    rows = []
+    for event_id, changes in HistoryEvent.objects.values_list("id", "changes").iterator(chunk_size=2000):
+        for field, values in (changes or {}).items():
+            old, new = values if isinstance(values, (list, tuple)) and len(values) == 2 else (None, values)
+            rows.append(HistoryChange(
+                event_id=event_id, field=field[:50], old_value=change_value(old), new_value=change_value(new),
+            ))
+        if len(rows) >= 2000:
+            HistoryChange.objects.bulk_create(rows)
+            rows = []
+    HistoryChange.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_person_fuzzy_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HistoryChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(max_length=50)),
+                ('old_value', models.CharField(blank=True, max_length=255, null=True)),
+                ('new_value', models.CharField(blank=True, max_length=255, null=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='field_changes', to='core.historyevent')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['field', 'new_value', 'event'], name='historychange_new_idx'), models.Index(fields=['field', 'old_value', 'event'], name='historychange_old_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_changes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 6.0.2 on 2026-10-18 17:45
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_facets(apps, schema_editor):
+    HistoryEvent = apps.get_model("core", "HistoryEvent")
+    HistoryFacet = apps.get_model("core", "HistoryFacet")
+    rows = HistoryEvent.objects.values("content_type__model", "action").annotate(n=Count("id")).order_by()
+    HistoryFacet.objects.bulk_create(
+        HistoryFacet(model=row["content_type__model"], action=row["action"], count=row["n"]) for row in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_history_change'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HistoryFacet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=100)),
+                ('action', models.CharField(max_length=50)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('model', 'action'), name='historyfacet_unique')],
+            },
+        ),
+        migrations.RunPython(count_facets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 6.0.2 on 2026-10-18 18:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Postgres: dezelfde tabel opnieuw, maar PARTITION BY RANGE (created_at). De primary key moet
+# de partitiesleutel bevatten; de maandpartities maakt core.services.archive.ensure_partition.
+# historyarchive_created_idx komt uit de (uitgestelde) SQL van CreateModel, op de nieuwe tabel.
+POSTGRES_SQL = [
+    "ALTER TABLE core_historyarchive RENAME TO core_historyarchive_flat",
+    "CREATE TABLE core_historyarchive (LIKE core_historyarchive_flat INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+    "PARTITION BY RANGE (created_at)",
+    "DROP TABLE core_historyarchive_flat",
+    "ALTER TABLE core_historyarchive ADD PRIMARY KEY (id, created_at)",
+    "CREATE TABLE core_historyarchive_default PARTITION OF core_historyarchive DEFAULT",
+]
+
+
+def partition_archive(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for sql in POSTGRES_SQL:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('core', '0010_history_facet'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HistoryArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('object_id', models.PositiveIntegerField()),
+                ('action', models.CharField(max_length=50)),
+                ('changes', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField()),
+                ('actor', models.ForeignKey(blank=True, db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('content_type', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='contenttypes.contenttype')),
+            ],
+            options={
+                'ordering': ('-created_at',),
+                'indexes': [models.Index(fields=['created_at', 'id'], name='historyarchive_created_idx')],
+            },
+        ),
+        migrations.RunPython(partition_archive, migrations.RunPython.noop),
+    ]
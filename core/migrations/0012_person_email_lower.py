@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-18 18:40
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_history_archive'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='person',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='person_email_lower_idx'),
+        ),
+    ]
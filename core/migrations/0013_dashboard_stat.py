@@ -0,0 +1,62 @@
+# Generated by Django 6.0.2 on 2026-10-18 19:05
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate, TruncWeek
+from django.utils import timezone
+
+
+def count_stats(apps, schema_editor):
+    # zelfde tellingen als core.services.dashboard.live_counts, met de historische modellen
+    Signal = apps.get_model("core", "Signal")
+    Task = apps.get_model("core", "Task")
+    DashboardStat = apps.get_model("core", "DashboardStat")
+
+    counts = Counter()
+    open_signals = Signal.objects.filter(is_archived=False).order_by()
+    for status_id, n in open_signals.values_list("status_id").annotate(n=Count("id")):
+        counts["signal_status", str(status_id or "")] += n
+    for type_id, n in open_signals.values_list("type_id").annotate(n=Count("id")):
+        counts["signal_type", str(type_id)] += n
+    due = (
+        Task.objects.filter(is_archived=False, due_at__isnull=False).order_by()
+        .annotate(day=TruncDate("due_at")).values_list("assigned_to_id", "day").annotate(n=Count("id"))
+    )
+    for user_id, day, n in due:
+        counts["task_due", f"{user_id}:{day.isoformat()}"] += n
+    for name in ("HistoryEvent", "HistoryArchive"):
+        weeks = (
+            apps.get_model("core", name).objects.exclude(content_type__model="notification").order_by()
+            .annotate(week=TruncWeek("created_at")).values_list("week").annotate(n=Count("id"))
+        )
+        for week, n in weeks:
+            counts["activity_week", timezone.localtime(week).date().isoformat()] += n
+
+    DashboardStat.objects.bulk_create(
+        DashboardStat(metric=metric, key=key, count=n) for (metric, key), n in counts.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_person_email_lower'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=30)),
+                ('key', models.CharField(blank=True, max_length=40)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('metric', 'key'), name='dashboardstat_unique')],
+            },
+        ),
+        migrations.RunPython(count_stats, migrations.RunPython.noop),
+    ]
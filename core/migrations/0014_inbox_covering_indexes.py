@@ -0,0 +1,32 @@
+# Generated by Django 6.0.2 on 2026-10-18 19:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('core', '0013_dashboard_stat'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='notification_unread_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='signal',
+            name='signal_live_assignee_idx',
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['user', '-created_at'], include=('id',), name='notification_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='signal',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['assigned_to', '-active_from', '-created_at'], include=('id',), name='signal_live_assignee_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 6.0.2 on 2026-10-18 20:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_inbox_covering_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardStatDelta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=30)),
+                ('key', models.CharField(blank=True, max_length=40)),
+                ('count', models.IntegerField()),
+            ],
+        ),
+    ]
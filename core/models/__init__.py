@@ -1,15 +1,21 @@
 from .core import Signal, Task
 from .notes import Note
-from .history import HistoryEvent
+from .history import HistoryArchive, HistoryChange, HistoryEvent, HistoryFacet
 from .status import Status
 from .types import SignalType, TaskType
-from .notifications import Notification
-from .people import Person
+from .notifications import Notification, NotificationCounter
+from .people import Person, PersonTrigram
+from .jobs import Job
+from .search import SearchEntry
+from .dashboard import DashboardStat, DashboardStatDelta
 
 __all__ = [
     "Signal", "Task",
-    "Note", "HistoryEvent",
+    "Note", "HistoryEvent", "HistoryChange", "HistoryFacet", "HistoryArchive",
     "Status", "SignalType", "TaskType",
-    "Notification",
-    "Person",
+    "Notification", "NotificationCounter",
+    "Person", "PersonTrigram",
+    "Job",
+    "SearchEntry",
+    "DashboardStat", "DashboardStatDelta",
 ]
\ No newline at end of file
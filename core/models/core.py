@@ -1,6 +1,7 @@
 from django.contrib.contenttypes.fields import GenericRelation
 from django.conf import settings
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
 
 from .base import TimeStampedModel
@@ -32,6 +33,40 @@ class Signal(TimeStampedModel):
     body = models.TextField()  # alleen omschrijving, geen aparte title
     is_archived = models.BooleanField(default=False)
 
+    class Meta:
+        # Afgestemd op signal_list: filter is_archived=False (+ optioneel status/type/assignee),
+        # sortering op SORT_MAP-kolom met tie-breakers -active_from, -created_at.
+        indexes = [
+            models.Index(fields=["-active_from", "-created_at"], name="signal_active_created_idx"),
+            models.Index(fields=["-created_at"], name="signal_created_idx"),
+            models.Index(
+                fields=["-active_from", "-created_at"],
+                condition=Q(is_archived=False),
+                name="signal_live_active_idx",
+            ),
+            models.Index(
+                fields=["-created_at"],
+                condition=Q(is_archived=False),
+                name="signal_live_created_idx",
+            ),
+            models.Index(
+                fields=["status", "-active_from", "-created_at"],
+                condition=Q(is_archived=False),
+                name="signal_live_status_idx",
+            ),
+            models.Index(
+                fields=["type", "-active_from", "-created_at"],
+                condition=Q(is_archived=False),
+                name="signal_live_type_idx",
+            ),
+            # INCLUDE id: de inbox (core.services.inbox) leest alleen de index (Postgres)
+            models.Index(
+                fields=["assigned_to", "-active_from", "-created_at"],
+                condition=Q(is_archived=False),
+                include=["id"],
+                name="signal_live_assignee_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Signal #{self.id}"
@@ -48,5 +83,37 @@ class Task(TimeStampedModel):
     body = models.TextField(blank=True)
     is_archived = models.BooleanField(default=False)
 
+    class Meta:
+        # Afgestemd op task_list: filter is_archived=False, sortering op SORT_MAP-kolom + id.
+        indexes = [
+            models.Index(fields=["due_at", "id"], name="task_due_idx"),
+            models.Index(fields=["created_at", "id"], name="task_created_idx"),
+            models.Index(
+                fields=["due_at", "id"],
+                condition=Q(is_archived=False),
+                name="task_live_due_idx",
+            ),
+            models.Index(
+                fields=["created_at", "id"],
+                condition=Q(is_archived=False),
+                name="task_live_created_idx",
+            ),
+            models.Index(
+                fields=["status", "due_at", "id"],
+                condition=Q(is_archived=False),
+                name="task_live_status_idx",
+            ),
+            models.Index(
+                fields=["type", "due_at", "id"],
+                condition=Q(is_archived=False),
+                name="task_live_type_idx",
+            ),
+            models.Index(
+                fields=["assigned_to", "due_at", "id"],
+                condition=Q(is_archived=False),
+                name="task_live_assignee_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"Task #{self.id}"
\ No newline at end of file
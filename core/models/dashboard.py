@@ -0,0 +1,43 @@
+from django.db import models
+
+
+class DashboardStat(models.Model):
+    """
+    Voorgetelde aantallen voor het dashboard, zodat dat geen GROUP BY over Signal, Task
+    en HistoryEvent hoeft te doen. Bijgehouden door core.services.dashboard (bij elke
+    wijziging); rebuild_dashboard_stats telt alles opnieuw.
+
+    metric            key
+    signal_status     status_id ("" = geen status)   open meldingen
+    signal_type       type_id                        open meldingen
+    task_due          "<assignee_id>:<JJJJ-MM-DD>"   open taken per deadline-dag
+    activity_week     maandag als JJJJ-MM-DD         HistoryEvents (zonder notificaties)
+    """
+
+    metric = models.CharField(max_length=30)
+    key = models.CharField(max_length=40, blank=True)
+    # geen PositiveIntegerField: een tijdelijk negatieve stand mag een save niet laten mislukken
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["metric", "key"], name="dashboardstat_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.metric}[{self.key}]: {self.count}"
+
+
+class DashboardStatDelta(models.Model):
+    """
+    Nog niet verwerkte wijzigingen op DashboardStat, alleen toegevoegd: zo zetten requests
+    die history schrijven geen lock op dezelfde activity_week-rij tot hun commit.
+    summary_stats telt ze mee; core.services.dashboard.fold_deltas verwerkt ze.
+    """
+
+    metric = models.CharField(max_length=30)
+    key = models.CharField(max_length=40, blank=True)
+    count = models.IntegerField()
+
+    def __str__(self):
+        return f"{self.metric}[{self.key}]: {self.count:+d}"
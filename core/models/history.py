@@ -5,7 +5,8 @@ from django.contrib.contenttypes.models import ContentType
 
 
 class HistoryEvent(models.Model):
-    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    # geen losse FK-index: de timeline-index begint met content_type
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, db_index=False)
     object_id = models.PositiveIntegerField()
     content_object = GenericForeignKey("content_type", "object_id")
 
@@ -17,6 +18,83 @@ class HistoryEvent(models.Model):
 
     class Meta:
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["content_type", "object_id", "-created_at"], name="historyevent_timeline_idx"),
+        ]
 
     def __str__(self):
-        return f"{self.action} #{self.id}"
\ No newline at end of file
+        return f"{self.action} #{self.id}"
+
+
+class HistoryChange(models.Model):
+    """
+    Genormaliseerde kopie van HistoryEvent.changes: één rij per gewijzigd veld, met oude en
+    nieuwe waarde als tekst (core.services.history.change_value). Gevuld door log_history.
+
+    Zo is "alle events waar status_id naar X ging" een index-lookup in plaats van een
+    tekstscan over elk JSON-document.
+    """
+
+    event = models.ForeignKey(HistoryEvent, on_delete=models.CASCADE, related_name="field_changes")
+    field = models.CharField(max_length=50)
+    old_value = models.CharField(max_length=255, null=True, blank=True)
+    new_value = models.CharField(max_length=255, null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["field", "new_value", "event"], name="historychange_new_idx"),
+            models.Index(fields=["field", "old_value", "event"], name="historychange_old_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.field}: {self.old_value} -> {self.new_value}"
+
+
+class HistoryFacet(models.Model):
+    """
+    Aantal HistoryEvents per (model, action), voor de filterdropdowns van de activiteitenlijst.
+    Bijgehouden door log_history; rebuild_history_facets telt alles opnieuw.
+    """
+
+    model = models.CharField(max_length=100)
+    action = models.CharField(max_length=50)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["model", "action"], name="historyfacet_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.model}.{self.action}: {self.count}"
+
+
+class HistoryArchive(models.Model):
+    """
+    HistoryEvents ouder dan HISTORY_HOT_MONTHS, verplaatst door `manage.py archive_history`
+    (zelfde id en kolommen). Op Postgres per maand gepartitioneerd op created_at, zodat een
+    maand naar een archiefbestand schrijven en weggooien een DETACH + DROP is.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    # geen FK-constraints (het archief mag verwijzingen overleven) en geen losse FK-indexen
+    content_type = models.ForeignKey(
+        ContentType, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, related_name="+",
+    )
+    object_id = models.PositiveIntegerField()
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True,
+        on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, related_name="+",
+    )
+    action = models.CharField(max_length=50)
+    changes = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="historyarchive_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.action} #{self.id} (archief)"
@@ -5,7 +5,8 @@ from django.contrib.contenttypes.models import ContentType
 
 
 class Note(models.Model):
-    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    # geen losse FK-index: de timeline-index begint met content_type
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, db_index=False)
     object_id = models.PositiveIntegerField()
     content_object = GenericForeignKey("content_type", "object_id")
 
@@ -16,6 +17,9 @@ class Note(models.Model):
 
     class Meta:
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["content_type", "object_id", "-created_at"], name="note_timeline_idx"),
+        ]
 
     def __str__(self):
         return f"Note #{self.id}"
\ No newline at end of file
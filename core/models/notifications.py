@@ -2,18 +2,22 @@ from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.db.models import F, Q
 from django.utils import timezone
 
 class Notification(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="notifications")
 
-    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    # geen losse FK-index: de timeline-index begint met content_type
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, db_index=False)
     object_id = models.PositiveIntegerField()
     content_object = GenericForeignKey("content_type", "object_id")
 
     title = models.CharField(max_length=160)
     body = models.TextField(blank=True)
     url = models.CharField(max_length=255, blank=True)
+    # soort notificatie (bv. "signal_created"); samen met user + object uniek -> fan-out is idempotent
+    kind = models.CharField(max_length=50, blank=True, default="")
 
     is_read = models.BooleanField(default=False)
     read_at = models.DateTimeField(null=True, blank=True)
@@ -21,9 +25,51 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ["is_read", "-created_at"]
+        indexes = [
+            models.Index(fields=["content_type", "object_id", "-created_at"], name="notification_timeline_idx"),
+            # alleen ongelezen rijen: klein, en precies wat badge/inbox/"alles gelezen" nodig hebben
+            models.Index(
+                fields=["user", "-created_at"],
+                condition=Q(is_read=False),
+                include=["id"],
+                name="notification_unread_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "content_type", "object_id", "kind"],
+                condition=~Q(kind=""),
+                name="notification_unique_kind",
+            ),
+        ]
 
     def mark_read(self):
-        if not self.is_read:
-            self.is_read = True
-            self.read_at = timezone.now()
-            self.save(update_fields=["is_read", "read_at"])
\ No newline at end of file
+        if self.is_read:
+            return
+        self.is_read = True
+        self.read_at = timezone.now()
+        # conditionele UPDATE: bij twee gelijktijdige klikken telt alleen de eerste
+        updated = Notification.objects.filter(pk=self.pk, is_read=False).update(is_read=True, read_at=self.read_at)
+        if updated:
+            NotificationCounter.objects.filter(user_id=self.user_id, unread__gt=0).update(unread=F("unread") - 1)
+
+
+class NotificationCounter(models.Model):
+    """
+    Aantal ongelezen notificaties per user, zodat de badge in de navbar één
+    primary-key lookup is in plaats van een COUNT(*) per pagina.
+
+    Bijgewerkt door de fan-out (core.services.notifications), Notification.mark_read
+    en mark_all_read. Herberekenen: manage.py rebuild_unread_counts.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="notification_counter",
+    )
+    unread = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.unread}"
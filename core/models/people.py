@@ -1,4 +1,8 @@
 from django.db import models
+from django.db.models.functions import Lower
+
+from core.services.normalize import fold_name, normalize_phone
+
 
 class Person(models.Model):
     PERSON_TYPE_CHOICES = [
@@ -16,10 +20,49 @@ class Person(models.Model):
 
     notes = models.TextField(blank=True)
 
+    # genormaliseerd voor fuzzy zoeken (core.services.fuzzy); gezet in save()/normalize()
+    search_text = models.CharField(max_length=400, blank=True, editable=False)
+    phone_normalized = models.CharField(max_length=30, blank=True, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ["last_name", "first_name"]
+        indexes = [
+            # dubbelen herkennen bij de import (core.services.imports), hoofdletterongevoelig
+            models.Index(Lower("email"), name="person_email_lower_idx"),
+        ]
 
     def __str__(self):
-        return f"{self.first_name} {self.last_name}"
\ No newline at end of file
+        return f"{self.first_name} {self.last_name}"
+
+    def normalize(self):
+        """Vult search_text/phone_normalized; roep dit zelf aan vóór bulk_create."""
+        self.search_text = fold_name(self.first_name, self.last_name, self.email)[:400]
+        self.phone_normalized = normalize_phone(self.phone)[:30]
+
+    def save(self, *args, **kwargs):
+        self.normalize()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "search_text", "phone_normalized"}
+        super().save(*args, **kwargs)
+
+
+class PersonTrigram(models.Model):
+    """
+    Trigram-index voor fuzzy zoeken op SQLite (Postgres gebruikt pg_trgm op Person zelf).
+    Eén rij per (persoon, trigram) uit search_text en phone_normalized.
+    """
+
+    person = models.ForeignKey(Person, on_delete=models.CASCADE, related_name="trigrams", db_index=False)
+    trigram = models.CharField(max_length=3)
+
+    class Meta:
+        constraints = [
+            # trigram vooraan: de zoekquery filtert op trigram IN (...) en groepeert op person
+            models.UniqueConstraint(fields=["trigram", "person"], name="persontrigram_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["person"], name="persontrigram_person_idx"),
+        ]
@@ -0,0 +1,40 @@
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+
+
+class SearchEntry(models.Model):
+    """
+    Eén rij per doorzoekbaar object (Signal, Task, Note, Person); bijgehouden door
+    core.services.search. De eigenlijke inverted index hangt per database aan deze tabel
+    (zie migratie 0007): op Postgres een gegenereerde tsvector-kolom `document` met
+    GIN-index, op SQLite een FTS5-tabel core_searchentry_fts die via triggers meeloopt.
+    """
+
+    # geen losse FK-index: de unieke constraint begint met content_type
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, db_index=False)
+    object_id = models.PositiveIntegerField()
+    content_object = GenericForeignKey("content_type", "object_id")
+
+    # alleen weergave, niet doorzocht ("Melding #12", "Notitie bij taak #3")
+    label = models.CharField(max_length=100)
+    # doorzocht en getoond; title weegt zwaarder dan body
+    title = models.CharField(max_length=200, blank=True)
+    body = models.TextField(blank=True)
+    url = models.CharField(max_length=255)
+
+    # extra zoektermen die niet getoond worden (gesplitst e-mailadres, telefoon als cijfers, assignee)
+    keywords = models.TextField(blank=True)
+    # alleen SQLite: gestemde tokens voor FTS5 (Postgres stemt zelf)
+    title_terms = models.TextField(blank=True)
+    terms = models.TextField(blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["content_type", "object_id"], name="searchentry_unique_object"),
+        ]
+
+    def __str__(self):
+        return f"{self.label} · {self.title}" if self.title else self.label
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import datetime
+import json
+
+from django.db import connections
+from django.db.models import F, Q
+from django.db.models.constants import LOOKUP_SEP
+
+
+def _cursor_default(value):
+    # volledige precisie (DjangoJSONEncoder kapt microseconden af -> rijen overgeslagen)
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+class KeysetPage:
+    def __init__(self, object_list, paginator, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+
+class KeysetPaginator:
+    """
+    Seek-paginatie: i.p.v. OFFSET + COUNT(*) filtert elke pagina op de sorteersleutel
+    van de laatste (of eerste) rij van de vorige pagina. Kosten blijven gelijk, hoe diep je ook bladert.
+
+    `ordering` is dezelfde lijst als voor order_by(), bv. ["-active_from", "-created_at"].
+    Een unieke tie-breaker ("id") wordt toegevoegd als die ontbreekt.
+    NULLs komen in beide richtingen achteraan, zodat de volgorde op SQLite en Postgres gelijk is.
+    """
+
+    # approx_total telt nooit verder dan dit (SQLite / geen planner-schatting)
+    count_cap = 1000
+
+    def __init__(self, queryset, per_page: int, ordering):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.keys = self._normalize(queryset, ordering)
+        self._approx_total = None
+
+    # -------------------------
+    # ordering
+    # -------------------------
+
+    @staticmethod
+    def _is_nullable(queryset, path: str) -> bool:
+        if path in queryset.query.annotations:
+            # annotatie (bv. een score): NOT NULL, tenzij het output_field anders zegt
+            return bool(getattr(queryset.query.annotations[path].output_field, "null", False))
+        model = queryset.model
+        nullable = False
+        for name in path.split(LOOKUP_SEP):
+            field = model._meta.get_field(name)
+            nullable = nullable or field.null
+            if field.is_relation:
+                model = field.related_model
+        return nullable
+
+    @classmethod
+    def _normalize(cls, queryset, ordering):
+        keys = []
+        seen = set()
+        for item in ordering:
+            desc = item.startswith("-")
+            name = item.lstrip("-")
+            if name == "pk":
+                name = "id"
+            if name in seen:
+                continue
+            seen.add(name)
+            keys.append((name, desc, cls._is_nullable(queryset, name)))
+        if "id" not in seen:
+            keys.append(("id", keys[-1][1] if keys else False, False))
+        return keys
+
+    def _order_by(self, reverse: bool):
+        exprs = []
+        for name, desc, nullable in self.keys:
+            if reverse:
+                desc = not desc
+            expr = F(name).desc if desc else F(name).asc
+            if not nullable:
+                exprs.append(expr())
+            elif reverse:
+                exprs.append(expr(nulls_first=True))
+            else:
+                exprs.append(expr(nulls_last=True))
+        return exprs
+
+    def ordered(self):
+        """De hele queryset in de volgorde van de pagina's (NULLs achteraan), bv. voor een export."""
+        return self.queryset.order_by(*self._order_by(False))
+
+    def _seek(self, values, reverse: bool) -> Q:
+        """Alle rijen ná `values` in leesrichting (of ervóór als reverse)."""
+        condition = Q(pk__in=[])
+        prefix = Q()
+        for (name, desc, nullable), value in zip(self.keys, values):
+            op = "lt" if desc != reverse else "gt"
+            if value is None:
+                # NULLs staan achteraan: vooruit komt er niets meer, terug alles wat niet NULL is
+                if reverse:
+                    condition |= prefix & Q(**{f"{name}__isnull": False})
+                prefix &= Q(**{f"{name}__isnull": True})
+                continue
+
+            step = Q(**{f"{name}__{op}": value})
+            if nullable and not reverse:
+                step |= Q(**{f"{name}__isnull": True})
+            condition |= prefix & step
+            prefix &= Q(**{name: value})
+        return condition
+
+    # -------------------------
+    # cursors
+    # -------------------------
+
+    def _fingerprint(self):
+        return [f"{'-' if desc else ''}{name}" for name, desc, _ in self.keys]
+
+    def _values_for(self, obj):
+        values = []
+        for name, _, _ in self.keys:
+            value = obj
+            for attr in name.split(LOOKUP_SEP):
+                value = getattr(value, attr, None)
+                if value is None:
+                    break
+            values.append(value)
+        return values
+
+    def encode_cursor(self, obj, direction: str) -> str:
+        payload = {"d": direction, "o": self._fingerprint(), "k": self._values_for(obj)}
+        raw = json.dumps(payload, default=_cursor_default, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str | None):
+        if not cursor:
+            return None, None
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            payload = json.loads(raw)
+        except (binascii.Error, ValueError):
+            return None, None
+        if not isinstance(payload, dict) or payload.get("o") != self._fingerprint():
+            # cursor hoort bij een andere sortering -> terug naar de eerste pagina
+            return None, None
+        values = payload.get("k")
+        if payload.get("d") not in ("n", "p") or not isinstance(values, list) or len(values) != len(self.keys):
+            return None, None
+        return payload["d"], values
+
+    # -------------------------
+    # pages
+    # -------------------------
+
+    def get_page(self, cursor: str | None) -> KeysetPage:
+        direction, values = self.decode_cursor(cursor)
+        reverse = direction == "p"
+
+        rows = self._fetch(values, reverse, self.per_page + 1)
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if reverse:
+            rows.reverse()
+
+        if not rows:
+            return KeysetPage([], self)
+
+        if reverse:
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+
+        return KeysetPage(
+            rows,
+            self,
+            next_cursor=self.encode_cursor(rows[-1], "n") if has_next else None,
+            previous_cursor=self.encode_cursor(rows[0], "p") if has_previous else None,
+        )
+
+    def _fetch(self, values, reverse: bool, limit: int) -> list:
+        return self._fetch_from(self.queryset, values, reverse, limit)
+
+    def _fetch_from(self, queryset, values, reverse: bool, limit: int) -> list:
+        qs = queryset.order_by(*self._order_by(reverse))
+        if values is not None:
+            qs = qs.filter(self._seek(values, reverse))
+        return list(qs[:limit])
+
+    @property
+    def approx_total(self):
+        """
+        Schatting van het totaal: planner-schatting op Postgres, anders een COUNT die stopt
+        bij `count_cap`. Alleen uitgerekend als de template erom vraagt.
+        """
+        if self._approx_total is None:
+            self._approx_total = self._estimate()
+        return self._approx_total
+
+    @property
+    def approx_total_capped(self):
+        return self.approx_total >= self.count_cap
+
+    def _estimate(self) -> int:
+        return self._estimate_from(self.queryset)
+
+    def _estimate_from(self, queryset) -> int:
+        qs = queryset.order_by()
+        if connections[qs.db].vendor == "postgresql":
+            plan = json.loads(qs.explain(format="json"))
+            return min(int(plan[0]["Plan"]["Plan Rows"]), self.count_cap)
+        return qs[: self.count_cap].count()
+
+
+class ChainedKeysetPaginator(KeysetPaginator):
+    """
+    Bladert door meerdere querysets alsof het er één is, bv. HistoryEvent en daarna
+    HistoryArchive. Voorwaarde: in de sortering komen alle rijen van querysets[i] vóór
+    die van querysets[i + 1], en de sorteervelden heten overal hetzelfde. Een cursor werkt
+    dan in elke queryset; de volgende wordt alleen gevraagd als de vorige op is.
+    """
+
+    def __init__(self, querysets, per_page: int, ordering):
+        super().__init__(querysets[0], per_page, ordering)
+        self.querysets = list(querysets)
+
+    def _fetch(self, values, reverse: bool, limit: int) -> list:
+        rows = []
+        for queryset in reversed(self.querysets) if reverse else self.querysets:
+            rows += self._fetch_from(queryset, values, reverse, limit - len(rows))
+            if len(rows) >= limit:
+                break
+        return rows
+
+    def _estimate(self) -> int:
+        total = 0
+        for queryset in self.querysets:
+            total += self._estimate_from(queryset)
+            if total >= self.count_cap:
+                return self.count_cap
+        return total
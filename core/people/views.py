@@ -1,26 +1,44 @@
 from django.contrib import messages
-from django.contrib.contenttypes.models import ContentType
-from django.core.paginator import Paginator
 from django.db import transaction
-from django.db.models import Q
 from django.shortcuts import get_object_or_404, redirect, render
 from django.views.decorators.http import require_POST
 
 from core.auth import staff_required
-from core.models.history import HistoryEvent
 from core.models.notes import Note
 from core.models.people import Person
+from core.pagination import KeysetPaginator
+from core.services import export, search
+from core.services.fuzzy import fuzzy_people
+from core.services.history import attach_change_rows
+from core.services.timeline import get_timeline
 from .forms import PersonForm
 
 from core.signals.services import log_history  # hergebruik jouw logger
 
 
-@staff_required
-def person_list(request):
+# kolommen van de export (kop -> lookup)
+EXPORT_COLUMNS = {
+    "id": "id",
+    "person_type": "person_type",
+    "first_name": "first_name",
+    "last_name": "last_name",
+    "email": "email",
+    "phone": "phone",
+    "notes": "notes",
+    "created_at": "created_at",
+}
+
+
+def _filtered_people(request):
+    """Queryset + filterwaarden van de lijst; gedeeld door person_list en person_export."""
     qs = Person.objects.all()
 
     q = (request.GET.get("q") or "").strip()
     person_type = (request.GET.get("type") or "").strip()  # student|employee|"" (alles)
+    match = (request.GET.get("match") or "fuzzy").strip()  # fuzzy (typefouten) | words (volledige woorden)
+    if match not in ("fuzzy", "words"):
+        match = "fuzzy"
+    fuzzy = bool(q) and match == "fuzzy"
 
     # sorting
     SORT_MAP = {
@@ -30,41 +48,57 @@ def person_list(request):
         "phone": "phone",
         "created_at": "created_at",
     }
-    sort = (request.GET.get("sort") or "name").strip()
+    sort = (request.GET.get("sort") or ("relevance" if fuzzy else "name")).strip()
     dir_ = (request.GET.get("dir") or "asc").strip().lower()
     if dir_ not in ("asc", "desc"):
         dir_ = "asc"
 
-    if q:
-        qs = qs.filter(
-            Q(first_name__icontains=q)
-            | Q(last_name__icontains=q)
-            | Q(email__icontains=q)
-            | Q(phone__icontains=q)
-        )
-
     if person_type in ("student", "employee"):
         qs = qs.filter(person_type=person_type)
 
-    sort_field = SORT_MAP.get(sort, "last_name")
-    prefix = "-" if dir_ == "desc" else ""
-    qs = qs.order_by(f"{prefix}{sort_field}", "first_name", "id")
+    if fuzzy:
+        qs = fuzzy_people(q, qs)
+    elif q:
+        qs = qs.filter(pk__in=search.matching_ids(Person, q))
 
-    paginator = Paginator(qs, 25)
-    page_obj = paginator.get_page(request.GET.get("page"))
+    if sort == "relevance" and fuzzy:
+        ordering = ["-fuzzy_score", "last_name", "first_name", "id"]
+    else:
+        sort_field = SORT_MAP.get(sort, "last_name")
+        prefix = "-" if dir_ == "desc" else ""
+        ordering = [f"{prefix}{sort_field}", "first_name", "id"]
 
-    return render(request, "core/people/list.html", {
-        "page_obj": page_obj,
-        "people": page_obj.object_list,
+    return qs, ordering, {
         "q": q,
         "person_type": person_type,
+        "match": match,
         "sort": sort,
         "dir": dir_,
+    }
+
+
+@staff_required
+def person_list(request):
+    qs, ordering, filters = _filtered_people(request)
+
+    paginator = KeysetPaginator(qs, 25, ordering)
+    page_obj = paginator.get_page(request.GET.get("cursor"))
+
+    return render(request, "core/people/list.html", {
+        "page_obj": page_obj,
+        "people": page_obj.object_list,
+        **filters,
         "type_choices": Person.PERSON_TYPE_CHOICES,
         "active_nav": "people",
     })
 
 
+@staff_required
+def person_export(request):
+    qs, ordering, _ = _filtered_people(request)
+    return export.export_response(KeysetPaginator(qs, 25, ordering).ordered(), EXPORT_COLUMNS, "personen", request.GET.get("format", "csv"))
+
+
 @staff_required
 @transaction.atomic
 def person_create(request):
@@ -89,27 +123,14 @@ def person_detail(request, pk: int):
     person = get_object_or_404(Person, pk=pk)
     form = PersonForm(instance=person)
 
-    person_ct = ContentType.objects.get_for_model(Person)
-
-    notes = (
-        Note.objects
-        .select_related("author")
-        .filter(content_type=person_ct, object_id=person.pk)
-        .order_by("-created_at")
-    )
-
-    history = (
-        HistoryEvent.objects
-        .select_related("actor")
-        .filter(content_type=person_ct, object_id=person.pk)
-        .order_by("-created_at")
-    )
+    notes, history = get_timeline(person)
 
     ACTION_LABELS = {
         "created": "Persoon aangemaakt",
         "updated": "Persoon bijgewerkt",
         "note_added": "Notitie toegevoegd",
     }
+    attach_change_rows(history, "person")
     for h in history:
         h.action_label = ACTION_LABELS.get(h.action, h.action.replace("_", " ").capitalize())
 
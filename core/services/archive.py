@@ -0,0 +1,187 @@
+"""
+Bewaartermijn van de history.
+
+- HistoryEvent is de "hete" tabel: alleen de laatste HISTORY_HOT_MONTHS maanden. Daar
+  sorteren de activiteitenlijst en het dashboard over, dus die blijft klein.
+- Oudere maanden gaan naar HistoryArchive (op Postgres één partitie per maand); de
+  activiteitenlijst bladert daar vanzelf in door.
+- Na HISTORY_ARCHIVE_MONTHS gaat een maand als gzipped JSONL naar HISTORY_ARCHIVE_DIR
+  en verdwijnt uit de database.
+
+Alles per hele maand (Europe/Amsterdam), via `manage.py archive_history`.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import shutil
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.models.history import HistoryArchive, HistoryChange, HistoryEvent
+from core.services.history import add_facet_counts, count_by_facet
+from core.services.sql import insert_select
+
+ARCHIVE_COLUMNS = ["id", "content_type_id", "object_id", "actor_id", "action", "changes", "created_at"]
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+# -------------------------
+# Maanden
+# -------------------------
+
+def month_start(value=None):
+    value = timezone.localtime(value)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month, n: int):
+    index = month.year * 12 + month.month - 1 + n
+    # opnieuw lokaliseren: de UTC-offset verschilt tussen zomer- en wintertijd
+    naive = timezone.make_naive(month).replace(year=index // 12, month=index % 12 + 1)
+    return timezone.make_aware(naive)
+
+
+def cutoff(months: int, now=None):
+    """Begin van de maand `months` maanden geleden; alles daarvóór valt eronder."""
+    return add_months(month_start(now), -months)
+
+
+def months_before(queryset, before) -> list:
+    """Begin van elke maand met rijen in `queryset` vóór `before`, oudste eerst."""
+    return [
+        month_start(day)
+        for day in queryset.filter(created_at__lt=before).datetimes("created_at", "month")
+    ]
+
+
+# -------------------------
+# Partities (alleen Postgres)
+# -------------------------
+
+def partition_name(month) -> str:
+    return f"{HistoryArchive._meta.db_table}_y{month:%Y}m{month:%m}"
+
+
+def _uses_partitions() -> bool:
+    return connection.vendor == "postgresql"
+
+
+def ensure_partition(month) -> None:
+    if not _uses_partitions():
+        return
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {qn(partition_name(month))} "
+            f"PARTITION OF {qn(HistoryArchive._meta.db_table)} FOR VALUES FROM (%s) TO (%s)",
+            [month, add_months(month, 1)],
+        )
+
+
+def _drop_partition(month) -> bool:
+    name = partition_name(month)
+    if not _uses_partitions() or name not in connection.introspection.table_names():
+        return False
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {qn(HistoryArchive._meta.db_table)} DETACH PARTITION {qn(name)}")
+        cursor.execute(f"DROP TABLE {qn(name)}")
+    return True
+
+
+# -------------------------
+# Hete tabel -> archieftabel
+# -------------------------
+
+@transaction.atomic
+def archive_month(month) -> int:
+    """Verplaatst de HistoryEvents van één maand naar HistoryArchive (HistoryChange-rijen vervallen)."""
+    start, end = month, add_months(month, 1)
+    ensure_partition(month)
+    events = HistoryEvent.objects.filter(created_at__gte=start, created_at__lt=end).order_by()
+    # ON CONFLICT DO NOTHING: een afgebroken run kan gewoon opnieuw
+    insert_select(HistoryArchive, events, {name: F(name) for name in ARCHIVE_COLUMNS})
+
+    qn = connection.ops.quote_name
+    event_table = qn(HistoryEvent._meta.db_table)
+    with connection.cursor() as cursor:
+        # rechtstreeks i.p.v. .delete(): de Collector zou elk event eerst ophalen
+        cursor.execute(
+            f"DELETE FROM {qn(HistoryChange._meta.db_table)} WHERE event_id IN "
+            f"(SELECT id FROM {event_table} WHERE created_at >= %s AND created_at < %s)",
+            [start, end],
+        )
+        cursor.execute(f"DELETE FROM {event_table} WHERE created_at >= %s AND created_at < %s", [start, end])
+        return cursor.rowcount
+
+
+# -------------------------
+# Archieftabel -> bestand
+# -------------------------
+
+def archive_dir() -> Path:
+    return Path(_setting("HISTORY_ARCHIVE_DIR", Path(settings.BASE_DIR) / "archive" / "history"))
+
+
+def archive_path(month, directory: Path | None = None) -> Path:
+    return (directory or archive_dir()) / f"history-{month:%Y-%m}.jsonl.gz"
+
+
+def export_month(month, directory: Path | None = None, chunk_size: int = 2000) -> tuple[Path, int]:
+    """
+    Schrijft de HistoryArchive-rijen van één maand als JSON-regels naar
+    history-JJJJ-MM.jsonl.gz en haalt ze daarna uit de database. Een bestaand bestand
+    wordt aangevuld (gzip mag uit meerdere delen bestaan).
+
+    Alles gaat eerst naar een tijdelijk bestand, dat pas na de DELETE (en vóór de commit)
+    het echte bestand vervangt: breekt een run eerder af, dan staat het bestand nog zoals
+    het was en schrijft de volgende run dezelfde rijen niet dubbel weg.
+    """
+    start, end = month, add_months(month, 1)
+    rows = HistoryArchive.objects.filter(created_at__gte=start, created_at__lt=end)
+    path = archive_path(month, directory)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+
+    written = 0
+    try:
+        with open(tmp, "wb") as raw:
+            if path.exists():
+                with open(path, "rb") as existing:
+                    shutil.copyfileobj(existing, raw)
+            with gzip.open(raw, "wt", encoding="utf-8") as out:
+                values = rows.order_by("created_at", "id").values(*ARCHIVE_COLUMNS, "content_type__app_label", "content_type__model")
+                for row in values.iterator(chunk_size=chunk_size):
+                    # app_label.model erbij: content_type_id is niet overdraagbaar tussen databases
+                    row["model"] = f"{row.pop('content_type__app_label')}.{row.pop('content_type__model')}"
+                    out.write(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n")
+                    written += 1
+            raw.flush()
+            os.fsync(raw.fileno())
+
+        with transaction.atomic():
+            add_facet_counts({key: -n for key, n in count_by_facet(rows).items()})
+            if not _drop_partition(month):
+                rows.delete()
+            # mislukt dit, dan rolt de DELETE terug
+            os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return path, written
+
+
+def read_export(path: Path):
+    """De rijen uit een archiefbestand terug, als dicts (bv. om te doorzoeken of terug te zetten)."""
+    with gzip.open(path, "rt", encoding="utf-8") as lines:
+        for line in lines:
+            yield json.loads(line)
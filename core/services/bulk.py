@@ -0,0 +1,145 @@
+"""
+Bulkacties op de meldingen- en takenlijst: status zetten, (her)toewijzen, archiveren.
+
+Per actie: één SELECT (welke rijen veranderen echt, met hun oude waarde), één
+UPDATE ... WHERE id IN (...), de history via buffered_history (bulk_create) en de
+zoekindex in één upsert. Notificaties voor nieuwe assignees gaan na de commit in één
+INSERT ... SELECT via een achtergrondjob.
+"""
+from __future__ import annotations
+
+from datetime import timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from core.models.core import Signal, Task
+from core.models.status import Status
+from core.services import dashboard, search
+from core.services.history import buffered_history
+from core.services.jobs import enqueue_on_commit, job_handler
+from core.services.notifications import notify_assignees
+from core.signals.services import log_history
+
+User = get_user_model()
+
+# meer geselecteerde rijen dan dit weigeren we (de lijst toont er 25 per pagina)
+MAX_IDS = 1000
+
+ACTIONS = {
+    "status": "Status zetten",
+    "assign": "Toewijzen",
+    "archive": "Archiveren",
+    "unarchive": "Uit archief halen",
+}
+
+MODELS = {
+    "signal": Signal,
+    "task": Task,
+}
+
+ASSIGNED_MESSAGES = {
+    "signal": ("Melding aan je toegewezen", "/signals/"),
+    "task": ("Taak aan je toegewezen", "/tasks/"),
+}
+
+
+def assignment_kind(assigned_at) -> str:
+    """
+    Notification.kind per toewijzing (UTC, op de microseconde): (user, object, kind) is
+    uniek, dus met een vaste kind zou een tweede toewijzing aan dezelfde user wegvallen.
+    Dezelfde job opnieuw draaien geeft wel geen dubbelen.
+    """
+    return f"assigned:{assigned_at.astimezone(dt_timezone.utc):%Y%m%d%H%M%S%f}"
+
+
+def _is_id(value) -> bool:
+    # isdigit() alleen is ook waar voor "²" en andere Unicode-cijfers, waar int() op faalt
+    value = str(value)
+    return value.isascii() and value.isdigit()
+
+
+def parse_ids(values) -> list[int]:
+    """De geselecteerde ids; niet-numerieke waarden vallen weg, meer dan MAX_IDS geeft een ValueError."""
+    ids = sorted({int(v) for v in values if _is_id(v)})
+    if len(ids) > MAX_IDS:
+        raise ValueError(f"Selecteer maximaal {MAX_IDS} regels tegelijk.")
+    return ids
+
+
+def _set_field(model, ids, actor, *, field: str, value, action: str) -> list[int]:
+    """`field` = `value` voor alle `ids` waar dat nog niet zo is; geeft de gewijzigde ids terug."""
+    # history op dezelfde manier als de losse endpoints: {"status_id": [oud, nieuw]}
+    rows = list(
+        model.objects.select_for_update()
+        .filter(id__in=ids)
+        .exclude(**{field: value})
+        .values_list("id", field)
+    )
+    changed = [pk for pk, _ in rows]
+    if not changed:
+        return changed
+
+    # .update() slaat post_save over: dashboardtellingen en zoekindex (assignee + status) zelf bijwerken
+    with dashboard.tracking(model, changed):
+        model.objects.filter(id__in=changed).update(**{field: value})
+    for pk, old in rows:
+        log_history(model(id=pk), actor, action, {field: [old, value]})
+    search.index_objects(model.objects.filter(id__in=changed))
+    return changed
+
+
+@transaction.atomic
+def apply(model, ids, actor, action: str, *, status_id: str = "", assigned_to: str = "") -> int:
+    """
+    Voert een bulkactie uit op `ids` van `model` (Signal of Task). Ongeldige invoer geeft
+    een ValueError met een melding voor de gebruiker. Geeft het aantal gewijzigde rijen terug.
+    """
+    if action not in ACTIONS:
+        raise ValueError("Kies een bulkactie.")
+    if not ids:
+        raise ValueError("Selecteer eerst een of meer regels.")
+
+    model_name = model._meta.model_name
+    with buffered_history():
+        if action == "status":
+            if not _is_id(status_id):
+                raise ValueError("Ongeldige status.")
+            status = Status.objects.filter(pk=int(status_id), scope=model_name).first()
+            if status is None:
+                raise ValueError("Ongeldige status.")
+            return len(_set_field(model, ids, actor, field="status_id", value=status.id, action="status_changed"))
+
+        if action == "assign":
+            user_id = None
+            if assigned_to:
+                if not _is_id(assigned_to) or not User.objects.filter(pk=int(assigned_to), is_staff=True).exists():
+                    raise ValueError("Ongeldige gebruiker.")
+                user_id = int(assigned_to)
+            elif not model._meta.get_field("assigned_to").null:
+                raise ValueError("Kies een gebruiker.")
+            changed = _set_field(model, ids, actor, field="assigned_to_id", value=user_id, action="reassigned")
+            if changed and user_id is not None:
+                enqueue_on_commit("assignment_notifications", {
+                    "model": model_name,
+                    "ids": changed,
+                    "actor_id": getattr(actor, "id", None),
+                    "kind": assignment_kind(timezone.now()),
+                })
+            return len(changed)
+
+        archived = action == "archive"
+        return len(_set_field(model, ids, actor, field="is_archived", value=archived, action="archived_toggled"))
+
+
+@job_handler("assignment_notifications")
+def deliver_assignment_notifications(model: str, ids: list, actor_id: int | None = None, kind: str = "assigned"):
+    title, url_prefix = ASSIGNED_MESSAGES[model]
+    notify_assignees(
+        MODELS[model].objects.filter(id__in=ids),
+        kind=kind,
+        title=title,
+        url_prefix=url_prefix,
+        exclude_user_id=actor_id,
+    )
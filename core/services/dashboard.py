@@ -0,0 +1,386 @@
+"""
+Cijfers voor het dashboard: open meldingen per status en type, te late taken per
+assignee en activiteit per week.
+
+Het dashboard leest ze uit DashboardStat (één kleine query) in plaats van bij elke
+hit GROUP BY's over Signal, Task en HistoryEvent te draaien. De tabel wordt bijgewerkt
+op het moment dat er iets verandert:
+
+- save/delete van Signal en Task via pre_save/post_save en pre_delete/post_delete (bij een
+  delete gaan ook de weken van de meegenomen HistoryEvents eraf);
+- .update() en bulk_create slaan die signals over: daar `tracking()` resp. `count_created()`;
+- HistoryEvents via `bump_activity()` in history.write_events. Elk request met history
+  zou hier dezelfde activity_week-rij bijwerken en die tot zijn commit op slot houden;
+  daarom gaan deze als losse rijen naar DashboardStatDelta (alleen INSERT). summary_stats
+  telt ze mee; de jobworker (`manage.py run_jobs`) verwerkt ze elke ronde met
+  `fold_deltas()` in DashboardStat, rebuild gooit ze weg.
+
+`manage.py rebuild_dashboard_stats` telt alles opnieuw (bv. 's nachts, of na een
+migratie of handmatige SQL). `live_stats()` is de naïeve variant, voor de benchmark
+(`manage.py bench_dashboard`) en de tests.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from contextlib import contextmanager
+from itertools import chain
+from datetime import date, datetime, time, timedelta
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate, TruncWeek
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.utils import timezone
+
+from core.models.core import Signal, Task
+from core.models.dashboard import DashboardStat, DashboardStatDelta
+from core.models.history import HistoryArchive, HistoryEvent
+from core.services import reference
+
+CACHE_KEY = "dashboard:stats"
+
+# velden die meetellen; bij een save zonder een van deze velden hoeft er niets
+TRACKED_FIELDS = {
+    Signal: ("status_id", "type_id", "is_archived"),
+    Task: ("assigned_to_id", "due_at", "is_archived"),
+}
+
+# pre_save: deze save raakt geen TRACKED_FIELDS (of is een fixture-load)
+_UNCHANGED = object()
+
+
+def _timeout() -> int:
+    return getattr(settings, "DASHBOARD_CACHE_TIMEOUT", 60)
+
+
+def _weeks() -> int:
+    return getattr(settings, "DASHBOARD_WEEKS", 12)
+
+
+def week_start(value) -> date:
+    """Maandag van de week van `value` (datetime), in de lokale tijdzone."""
+    day = timezone.localdate(value)
+    return day - timedelta(days=day.weekday())
+
+
+def _start_of(day: date):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+# -------------------------
+# Sleutels per rij
+# -------------------------
+
+def _signal_keys(status_id, type_id, is_archived) -> list:
+    if is_archived:
+        return []
+    return [("signal_status", str(status_id or "")), ("signal_type", str(type_id))]
+
+
+def _task_keys(assigned_to_id, due_at, is_archived) -> list:
+    if is_archived or due_at is None:
+        return []
+    return [("task_due", f"{assigned_to_id}:{timezone.localdate(due_at).isoformat()}")]
+
+
+KEYS = {
+    Signal: _signal_keys,
+    Task: _task_keys,
+}
+
+
+def contributions(model, rows) -> Counter:
+    """{(metric, key): n} voor `rows` (tuples in de volgorde van TRACKED_FIELDS[model])."""
+    keys = KEYS[model]
+    return Counter(key for row in rows for key in keys(*row))
+
+
+def _values(model, obj) -> tuple:
+    return tuple(getattr(obj, name) for name in TRACKED_FIELDS[model])
+
+
+def _rows(model, ids):
+    return model.objects.filter(id__in=ids).values_list(*TRACKED_FIELDS[model])
+
+
+# -------------------------
+# Bijwerken
+# -------------------------
+
+def add_counts(counts) -> None:
+    """{(metric, key): n} erbij (of eraf, n < 0); één UPDATE per sleutel, een INSERT alleen de eerste keer."""
+    missing = []
+    for (metric, key), n in counts.items():
+        if n and not DashboardStat.objects.filter(metric=metric, key=key).update(count=F("count") + n) and n > 0:
+            missing.append((metric, key))
+    if missing:
+        # gelijktijdige eerste keer: de ene INSERT wint, de UPDATE telt voor beide
+        DashboardStat.objects.bulk_create(
+            [DashboardStat(metric=metric, key=key, count=0) for metric, key in missing],
+            ignore_conflicts=True,
+        )
+        for metric, key in missing:
+            DashboardStat.objects.filter(metric=metric, key=key).update(count=F("count") + counts[metric, key])
+
+
+def count_created(model, objs) -> None:
+    """Na bulk_create (geen post_save): de nieuwe rijen meetellen."""
+    add_counts(contributions(model, (_values(model, obj) for obj in objs)))
+
+
+@contextmanager
+def tracking(model, ids):
+    """
+    Rond een .update() op `ids` (geen post_save): telt het verschil tussen de stand
+    vóór en na het blok. Twee extra queries, ongeacht het aantal rijen.
+    """
+    before = contributions(model, _rows(model, ids))
+    yield
+    delta = contributions(model, _rows(model, ids))
+    delta.subtract(before)
+    add_counts(delta)
+
+
+def add_deltas(counts) -> None:
+    """Als add_counts, maar als nieuwe DashboardStatDelta-rijen: één INSERT, geen lock op DashboardStat."""
+    DashboardStatDelta.objects.bulk_create(
+        DashboardStatDelta(metric=metric, key=key, count=n) for (metric, key), n in counts.items() if n
+    )
+
+
+def fold_deltas(batch_size: int = 5000) -> int:
+    """
+    Verwerkt de DashboardStatDelta-rijen in DashboardStat, per `batch_size` in een eigen
+    transactie. Gelijktijdig aanroepen mag. Geeft het aantal verwerkte rijen terug.
+    """
+    folded = 0
+    while True:
+        with transaction.atomic():
+            qs = DashboardStatDelta.objects.order_by("id")
+            if connection.features.has_select_for_update_skip_locked:
+                qs = qs.select_for_update(skip_locked=True)
+            rows = list(qs.values_list("id", "metric", "key", "count")[:batch_size])
+            if not rows:
+                return folded
+            deleted, _ = DashboardStatDelta.objects.filter(id__in=[row[0] for row in rows]).delete()
+            if deleted != len(rows):
+                # een andere aanroep was ons voor (zonder SKIP LOCKED, bv. SQLite) en telt ze al
+                transaction.set_rollback(True)
+                return folded
+            counts = Counter()
+            for _, metric, key, n in rows:
+                counts[metric, key] += n
+            add_counts(counts)
+        folded += len(rows)
+        if len(rows) < batch_size:
+            return folded
+
+
+def bump_activity(events) -> None:
+    """Telt nieuwe HistoryEvents op bij hun week (notificaties tellen niet mee, net als op het dashboard)."""
+    add_deltas(Counter(
+        ("activity_week", week_start(h.created_at).isoformat())
+        for h in events
+        if ContentType.objects.get_for_id(h.content_type_id).model != "notification"
+    ))
+
+
+# -------------------------
+# Opnieuw tellen
+# -------------------------
+
+def live_counts() -> Counter:
+    """Alle DashboardStat-tellingen rechtstreeks uit de brontabellen."""
+    counts = Counter()
+    open_signals = Signal.objects.filter(is_archived=False).order_by()
+    for status_id, n in open_signals.values_list("status_id").annotate(n=Count("id")):
+        counts["signal_status", str(status_id or "")] += n
+    for type_id, n in open_signals.values_list("type_id").annotate(n=Count("id")):
+        counts["signal_type", str(type_id)] += n
+
+    due = (
+        Task.objects.filter(is_archived=False, due_at__isnull=False).order_by()
+        .annotate(day=TruncDate("due_at"))
+        .values_list("assigned_to_id", "day")
+        .annotate(n=Count("id"))
+    )
+    for user_id, day, n in due:
+        counts["task_due", f"{user_id}:{day.isoformat()}"] += n
+
+    for queryset in (HistoryEvent.objects.all(), HistoryArchive.objects.all()):
+        for week, n in _activity_rows(queryset):
+            counts["activity_week", week.isoformat()] += n
+    return counts
+
+
+def _activity_rows(queryset):
+    rows = (
+        queryset.exclude(content_type__model="notification").order_by()
+        .annotate(week=TruncWeek("created_at"))
+        .values_list("week")
+        .annotate(n=Count("id"))
+    )
+    return [(timezone.localtime(week).date(), n) for week, n in rows]
+
+
+@transaction.atomic
+def rebuild() -> int:
+    """Vult DashboardStat opnieuw uit Signal, Task, HistoryEvent en HistoryArchive (de deltas vervallen)."""
+    counts = live_counts()
+    DashboardStat.objects.all().delete()
+    DashboardStatDelta.objects.all().delete()
+    DashboardStat.objects.bulk_create(
+        DashboardStat(metric=metric, key=key, count=n) for (metric, key), n in counts.items() if n
+    )
+    cache.delete(CACHE_KEY)
+    return len(counts)
+
+
+# -------------------------
+# Lezen
+# -------------------------
+
+def _overdue_between(start, end) -> Counter:
+    """Open taken per assignee met een deadline in [start, end); start None = alles vóór end."""
+    qs = Task.objects.filter(is_archived=False, due_at__lt=end)
+    if start is not None:
+        qs = qs.filter(due_at__gte=start)
+    return Counter(dict(qs.order_by().values_list("assigned_to_id").annotate(n=Count("id"))))
+
+
+def _ranked(counts: Counter, labels: dict, empty: str) -> list:
+    rows = [(labels.get(pk, f"#{pk}") if pk is not None else empty, n) for pk, n in counts.items() if n > 0]
+    return sorted(rows, key=lambda row: (-row[1], row[0]))
+
+
+def _present(by_status, by_type, overdue, weeks, first_week) -> dict:
+    activity = [(first_week + timedelta(weeks=i), weeks.get(first_week + timedelta(weeks=i), 0)) for i in range(_weeks())]
+    peak = max((n for _, n in activity), default=0) or 1
+    return {
+        "open_signals": sum(by_status.values()),
+        "signals_by_status": _ranked(by_status, reference.status_map(), "Geen status"),
+        "signals_by_type": _ranked(by_type, reference.signal_type_map(), "Onbekend"),
+        "overdue_tasks": sum(overdue.values()),
+        "overdue_by_assignee": _ranked(overdue, reference.user_map(), "Niemand"),
+        "activity_weeks": [{"week": week, "count": n, "percent": round(100 * n / peak)} for week, n in activity],
+    }
+
+
+def summary_stats(now=None) -> dict:
+    """
+    De dashboardcijfers uit DashboardStat: één query op de tabel, één op de nog niet
+    verwerkte deltas en één voor de taken die vandaag verlopen zijn.
+    """
+    now = now or timezone.now()
+    today = timezone.localdate(now)
+    first_week = week_start(now) - timedelta(weeks=_weeks() - 1)
+
+    old_weeks = Q(metric="activity_week") & Q(key__lt=first_week.isoformat())
+    rows = chain(
+        DashboardStat.objects.exclude(count=0).exclude(old_weeks).values_list("metric", "key", "count"),
+        DashboardStatDelta.objects.exclude(old_weeks).order_by().values_list("metric", "key").annotate(n=Sum("count")),
+    )
+    by_status, by_type, overdue, weeks = Counter(), Counter(), Counter(), Counter()
+    for metric, key, n in rows:
+        if metric == "signal_status":
+            by_status[int(key) if key else None] += n
+        elif metric == "signal_type":
+            by_type[int(key)] += n
+        elif metric == "task_due":
+            user_id, day = key.split(":")
+            if date.fromisoformat(day) < today:
+                overdue[int(user_id)] += n
+        elif metric == "activity_week":
+            weeks[date.fromisoformat(key)] += n
+
+    # de tabel telt per dag; van vandaag is alleen wat vóór nu viel al te laat
+    overdue.update(_overdue_between(_start_of(today), now))
+    return _present(by_status, by_type, overdue, weeks, first_week)
+
+
+def live_stats(now=None) -> dict:
+    """Dezelfde cijfers als summary_stats, met GROUP BY's over de brontabellen (de naïeve variant)."""
+    now = now or timezone.now()
+    first_week = week_start(now) - timedelta(weeks=_weeks() - 1)
+
+    open_signals = Signal.objects.filter(is_archived=False).order_by()
+    by_status = Counter(dict(open_signals.values_list("status_id").annotate(n=Count("id"))))
+    by_type = Counter(dict(open_signals.values_list("type_id").annotate(n=Count("id"))))
+    overdue = _overdue_between(None, now)
+    weeks = Counter()
+    for queryset in (HistoryEvent.objects.all(), HistoryArchive.objects.all()):
+        weeks.update(dict(_activity_rows(queryset.filter(created_at__gte=_start_of(first_week)))))
+    return _present(by_status, by_type, overdue, weeks, first_week)
+
+
+def stats() -> dict:
+    """summary_stats, DASHBOARD_CACHE_TIMEOUT seconden gecachet (de tabel zelf is altijd bij)."""
+    value = cache.get(CACHE_KEY)
+    if value is None:
+        value = summary_stats()
+        cache.set(CACHE_KEY, value, _timeout())
+    return value
+
+
+# -------------------------
+# Signals
+# -------------------------
+
+def _written(fields, update_fields) -> set:
+    """De TRACKED_FIELDS die deze save schrijft (update_fields mag "status" of "status_id" bevatten)."""
+    if update_fields is None:
+        return set(fields)
+    return {name for name in fields if name in update_fields or name.removesuffix("_id") in update_fields}
+
+
+def _remember(sender, instance, raw=False, update_fields=None, **kwargs):
+    # de stand uit de database, niet van het object: dat kan verouderd zijn (bv. na een bulk .update())
+    if raw or not _written(TRACKED_FIELDS[sender], update_fields):
+        instance._dashboard_before = _UNCHANGED
+    elif instance.pk is None:
+        instance._dashboard_before = None
+    else:
+        instance._dashboard_before = _rows(sender, [instance.pk]).first()
+
+
+def _count_saved(sender, instance, update_fields=None, **kwargs):
+    before = instance.__dict__.pop("_dashboard_before", _UNCHANGED)
+    if before is _UNCHANGED:
+        return
+    fields = TRACKED_FIELDS[sender]
+    after = _values(sender, instance)
+    if before is not None:
+        # velden die deze save niet schreef houden hun waarde uit de database
+        written = _written(fields, update_fields)
+        after = tuple(new if name in written else old for name, new, old in zip(fields, after, before))
+    delta = contributions(sender, [after])
+    if before is not None:
+        delta.subtract(contributions(sender, [before]))
+    add_counts(delta)
+
+
+def _remember_deleted(sender, instance, **kwargs):
+    counts = contributions(sender, _rows(sender, [instance.pk]))
+    # de HistoryEvents gaan via de GenericRelation mee (één GROUP BY over de timeline-index)
+    for week, n in _activity_rows(instance.history.all()):
+        counts["activity_week", week.isoformat()] += n
+    instance._dashboard_deleted = counts
+
+
+def _count_deleted(sender, instance, **kwargs):
+    counts = instance.__dict__.pop("_dashboard_deleted", {})
+    # de weken via de deltas, net als bump_activity: daar staan de nog niet verwerkte events
+    add_counts({key: -n for key, n in counts.items() if key[0] != "activity_week"})
+    add_deltas({key: -n for key, n in counts.items() if key[0] == "activity_week"})
+
+
+def connect_signals():
+    for model in TRACKED_FIELDS:
+        label = model._meta.label_lower
+        pre_save.connect(_remember, sender=model, dispatch_uid=f"dashboard-pre-save-{label}")
+        post_save.connect(_count_saved, sender=model, dispatch_uid=f"dashboard-save-{label}")
+        pre_delete.connect(_remember_deleted, sender=model, dispatch_uid=f"dashboard-pre-delete-{label}")
+        post_delete.connect(_count_deleted, sender=model, dispatch_uid=f"dashboard-delete-{label}")
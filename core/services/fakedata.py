@@ -0,0 +1,382 @@
+"""
+Nepdata in bulk (Faker, nl_NL) voor benchmarks (manage.py bench_views): staff users,
+personen, meldingen, taken, notities, history en notificaties.
+
+Per soort worden de rijen door een generator gemaakt en per `batch_size` met bulk_create
+weggeschreven, elk blok in een eigen transactie. Wat normaal via post_save of log_history
+meeloopt, doen we per blok zelf in bulk: zoekindex, trigrammen van personen,
+dashboardtellers, HistoryChange-rijen en facetten; de unread-tellers aan het eind.
+created_at ligt verspreid over het afgelopen jaar, bij notities, history en notificaties
+na die van de melding, taak of persoon waar ze aan hangen.
+
+Met copy=True (alleen PostgreSQL) gaan de rijen via COPY in plaats van INSERT.
+
+Deterministisch per seed: dezelfde seed op dezelfde database geeft dezelfde data.
+Notities, history en notificaties verwijzen alleen naar rijen uit dezelfde run.
+Het geheugengebruik hangt niet af van de volumes: alleen het huidige blok staat in het
+geheugen, de ids uit de run als aaneengesloten reeksen (IdPool).
+"""
+from __future__ import annotations
+
+import random
+import time
+from bisect import bisect_right
+from collections import Counter
+from datetime import timedelta
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections, reset_queries, router, transaction
+from django.urls import reverse
+from django.utils import timezone
+from faker import Faker
+
+from core.models import HistoryChange, HistoryEvent, Note, Notification, Person, Signal, SignalType, Status, Task, TaskType
+from core.services import dashboard, fuzzy, reference, search
+from core.services.history import bump_facets, change_rows_for
+from core.services.notifications import rebuild_unread_counts
+from core.services.sql import copy_insert
+
+User = get_user_model()
+
+# standaardvolumes (ongeveer de huidige productie); in deze volgorde gevuld, want
+# notities, history en notificaties verwijzen naar de soorten ervoor
+VOLUMES = {
+    "user": 20,
+    "person": 2000,
+    "signal": 5000,
+    "task": 5000,
+    "note": 10000,
+    "history": 20000,
+    "notification": 20000,
+}
+
+# waar notities en history aan hangen
+PARENTS = {"signal": Signal, "task": Task, "person": Person}
+
+HISTORY_ACTIONS = ["updated", "status_changed", "reassigned", "note_added"]
+
+MODELS = {"user": User, "person": Person, "signal": Signal, "task": Task, "note": Note,
+          "history": HistoryEvent, "notification": Notification}
+
+
+def _chunks(iterable, size: int):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class IdPool:
+    """
+    Ids als reeksen (begin, lengte): bulk_create en sequences geven vrijwel altijd
+    aaneengesloten ids, dus een miljoen ids zijn een handvol reeksen. Gedraagt zich als
+    een (alleen-lezen) lijst, dus rng.choice(pool) werkt.
+    """
+
+    def __init__(self, ids=()):
+        self.starts = []
+        self.lengths = []
+        self.offsets = []  # aantal ids vóór elke reeks
+        self.total = 0
+        self.extend(ids)
+
+    def extend(self, ids):
+        for pk in ids:
+            if self.starts and pk == self.starts[-1] + self.lengths[-1]:
+                self.lengths[-1] += 1
+            else:
+                self.starts.append(pk)
+                self.lengths.append(1)
+                self.offsets.append(self.total)
+            self.total += 1
+
+    def __len__(self):
+        return self.total
+
+    def __getitem__(self, index: int) -> int:
+        if index < 0:
+            index += self.total
+        if not 0 <= index < self.total:
+            raise IndexError(index)
+        run = bisect_right(self.offsets, index) - 1
+        return self.starts[run] + index - self.offsets[run]
+
+    def __iter__(self):
+        for start, length in zip(self.starts, self.lengths):
+            yield from range(start, start + length)
+
+
+class FakeData:
+    """
+    Vult de database met `fill({soort: aantal})`; meerdere keren vullen mag (bv. per
+    schaal van een benchmark). `ids` houdt per soort de ids uit deze run bij, `counts` en
+    `seconds` de aantallen en de tijd per soort.
+    """
+
+    def __init__(self, seed: int = 0, batch_size: int = 2000, locale: str = "nl_NL", copy: bool = False):
+        self.seed = seed
+        self.batch_size = batch_size
+        self.copy = copy
+        self.rng = random.Random(seed)
+        self.fake = Faker(locale)
+        self.fake.seed_instance(seed)
+        self.now = timezone.now()
+        self.ids = {kind: IdPool() for kind in VOLUMES}
+        self.counts = Counter()
+        self.seconds = Counter()
+        self._reference_loaded = False
+
+    # ---- referentiedata ----
+
+    def _load_reference(self):
+        if self._reference_loaded:
+            return
+        defaults = {
+            "signal": [("open", "Open"), ("done", "Afgerond")],
+            "task": [("todo", "Te doen"), ("done", "Afgerond")],
+        }
+        self.statuses = {}
+        for scope, pairs in defaults.items():
+            if not Status.objects.filter(scope=scope, is_active=True).exists():
+                Status.objects.bulk_create(Status(key=key, name=name, scope=scope) for key, name in pairs)
+            self.statuses[scope] = list(
+                Status.objects.filter(scope=scope, is_active=True).order_by("id").values_list("id", flat=True)
+            )
+        self.signal_types = self._types(SignalType, ["Algemeen", "Contract", "Verzuim"])
+        self.task_types = self._types(TaskType, ["Opvolgen", "Administratie", "Bellen"])
+        self.ct_ids = {kind: ContentType.objects.get_for_model(model).id for kind, model in PARENTS.items()}
+        # bulk_create slaat de invalidatie via post_save over
+        reference.invalidate()
+        self._reference_loaded = True
+
+    def _types(self, model, names) -> list:
+        if not model.objects.filter(is_active=True).exists():
+            model.objects.bulk_create(model(name=name) for name in names)
+        return list(model.objects.filter(is_active=True).order_by("id").values_list("id", flat=True))
+
+    def _staff(self) -> IdPool:
+        if not self.ids["user"]:
+            self.ids["user"] = IdPool(
+                User.objects.filter(is_staff=True, is_active=True).order_by("id").values_list("id", flat=True)
+            )
+        if not self.ids["user"]:
+            raise ValueError("Geen staff users: vul eerst 'user'.")
+        return self.ids["user"]
+
+    # ---- rijen maken ----
+
+    def _created_at(self):
+        return self.now - timedelta(minutes=self.rng.randint(0, 365 * 24 * 60))
+
+    def _build_user(self, count: int):
+        # make_password(None): onbruikbaar wachtwoord, zonder te hashen
+        start = User.objects.count()
+        for i in range(start, start + count):
+            first, last = self.fake.first_name(), self.fake.last_name()
+            yield User(
+                username=f"{self.fake.user_name()}.{i}", first_name=first, last_name=last,
+                email=self.fake.email(), is_staff=True, password=make_password(None),
+            )
+
+    def _build_person(self, count: int):
+        for _ in range(count):
+            person = Person(
+                person_type=self.rng.choice(["student", "employee"]),
+                first_name=self.fake.first_name(),
+                last_name=self.fake.last_name(),
+                email=self.fake.email() if self.rng.random() < 0.9 else "",
+                phone=self.fake.phone_number() if self.rng.random() < 0.7 else "",
+            )
+            person.normalize()
+            yield person
+
+    def _build_signal(self, count: int):
+        users = self._staff()
+        for _ in range(count):
+            created_at = self._created_at()
+            # ~5% ingepland: actief vanaf een dag na het aanmaken
+            delay = self.rng.randint(1, 30) if self.rng.random() < 0.05 else 0
+            yield Signal(
+                type_id=self.rng.choice(self.signal_types),
+                status_id=self.rng.choice(self.statuses["signal"] + [None]),
+                assigned_to_id=self.rng.choice(users) if self.rng.random() < 0.7 else None,
+                active_from=timezone.localdate(created_at) + timedelta(days=delay),
+                body=self.fake.paragraph(nb_sentences=3),
+                is_archived=self.rng.random() < 0.2,
+                created_at=created_at,
+            )
+
+    def _build_task(self, count: int):
+        users = self._staff()
+        for _ in range(count):
+            yield Task(
+                type_id=self.rng.choice(self.task_types),
+                status_id=self.rng.choice(self.statuses["task"] + [None]),
+                assigned_to_id=self.rng.choice(users),
+                due_at=self.now + timedelta(hours=self.rng.randint(-60 * 24, 60 * 24)),
+                body=self.fake.sentence(nb_words=10),
+                is_archived=self.rng.random() < 0.2,
+                created_at=self._created_at(),
+            )
+
+    def _parent(self) -> tuple[str, int]:
+        kinds = [kind for kind in PARENTS if self.ids[kind]]
+        if not kinds:
+            raise ValueError("Notities en history hebben meldingen, taken of personen uit deze run nodig.")
+        kind = self.rng.choices(kinds, weights=[len(self.ids[k]) for k in kinds])[0]
+        return kind, self.rng.choice(self.ids[kind])
+
+    def _build_note(self, count: int):
+        users = self._staff()
+        for _ in range(count):
+            kind, object_id = self._parent()
+            yield Note(
+                content_type_id=self.ct_ids[kind], object_id=object_id,
+                author_id=self.rng.choice(users), body=self.fake.paragraph(nb_sentences=2),
+            )
+
+    def _build_history(self, count: int):
+        users = self._staff()
+        for _ in range(count):
+            kind, object_id = self._parent()
+            action = self.rng.choice(HISTORY_ACTIONS)
+            changes = {}
+            if action == "status_changed" and kind != "person":
+                changes = {"status_id": self.rng.sample(self.statuses[kind] + [None], 2)}
+            elif action == "reassigned" and kind != "person":
+                changes = {"assigned_to_id": [self.rng.choice(users), self.rng.choice(users)]}
+            elif action == "updated":
+                changes = {"body": ["", self.fake.sentence()]}
+            yield HistoryEvent(
+                content_type_id=self.ct_ids[kind], object_id=object_id,
+                actor_id=self.rng.choice(users), action=action, changes=changes,
+            )
+
+    def _build_notification(self, count: int):
+        users = self._staff()
+        targets = [kind for kind in ("signal", "task") if self.ids[kind]]
+        if not targets:
+            raise ValueError("Notificaties hebben meldingen of taken uit deze run nodig.")
+        for _ in range(count):
+            kind = self.rng.choice(targets)
+            object_id = self.rng.choice(self.ids[kind])
+            yield Notification(
+                user_id=self.rng.choice(users),
+                content_type_id=self.ct_ids[kind], object_id=object_id,
+                kind=f"{kind}_created",
+                title="Nieuwe melding" if kind == "signal" else "Nieuwe taak",
+                body=self.fake.sentence(),
+                url=reverse(f"{kind}s:detail", args=[object_id]),
+                is_read=self.rng.random() < 0.7,
+            )
+
+    # ---- wegschrijven ----
+
+    def _insert(self, model, objs: list, ignore_conflicts: bool = False) -> list:
+        if self.copy:
+            return copy_insert(model, objs, ignore_conflicts=ignore_conflicts)
+        return model.objects.bulk_create(objs, ignore_conflicts=ignore_conflicts)
+
+    def _backdate(self, model, rows: list):
+        """
+        Personen, notities, history en notificaties hebben created_at = auto_now_add: na het
+        wegschrijven staan ze allemaal op nu. Verspreid ze over het afgelopen jaar, en wat
+        aan een melding, taak of persoon hangt tussen het aanmaken daarvan en nu.
+        """
+        if model is Person:
+            for row in rows:
+                row.created_at = self._created_at()
+        else:
+            parents = {}
+            for ct_id in sorted({row.content_type_id for row in rows}):
+                ids = {row.object_id for row in rows if row.content_type_id == ct_id}
+                parent = ContentType.objects.get_for_id(ct_id).model_class()
+                parents[ct_id] = dict(parent.objects.filter(id__in=ids).values_list("id", "created_at"))
+            for row in rows:
+                born = parents[row.content_type_id][row.object_id]
+                row.created_at = born + (self.now - born) * self.rng.random()
+        # rechtstreeks: bulk_update bouwt per rij een CASE WHEN, bij deze aantallen merkbaar trager
+        connection = connections[router.db_for_write(model)]
+        field = model._meta.get_field("created_at")
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"UPDATE {connection.ops.quote_name(model._meta.db_table)} "
+                f"SET {connection.ops.quote_name(field.column)} = %s WHERE id = %s",
+                [(field.get_db_prep_value(row.created_at, connection), row.pk) for row in rows],
+            )
+
+    def _save(self, kind: str, objs: list) -> list:
+        if kind == "history":
+            # zoals write_events, maar created_at eerst verspreid: de activiteitsweken tellen erop
+            events = self._insert(HistoryEvent, objs)
+            self._backdate(HistoryEvent, events)
+            self._insert(HistoryChange, [row for event in events for row in change_rows_for(event)])
+            bump_facets(events)
+            dashboard.bump_activity(events)
+            return events
+        if kind == "notification":
+            # (user, object, kind) is uniek: dubbelen uit het toeval slaan we over; zonder ids
+            # terug zoeken we de rijen van dit blok op die sleutel op
+            self._insert(Notification, objs, ignore_conflicts=True)
+            keys = {(n.user_id, n.content_type_id, n.object_id, n.kind) for n in objs}
+            rows = [
+                n for n in Notification.objects.filter(
+                    content_type_id__in={n.content_type_id for n in objs},
+                    object_id__in={n.object_id for n in objs},
+                    kind__in={n.kind for n in objs},
+                ).only("id", "user_id", "content_type_id", "object_id", "kind").order_by("id")
+                if (n.user_id, n.content_type_id, n.object_id, n.kind) in keys
+            ]
+            self._backdate(Notification, rows)
+            return objs
+
+        model = MODELS[kind]
+        created = self._insert(model, objs)
+        if kind == "user":
+            reference.invalidate("user")
+            return created
+        if kind in ("person", "note"):
+            self._backdate(model, created)
+        search.index_objects(created, batch_size=self.batch_size)
+        if kind == "person":
+            fuzzy.index_people(created)
+        elif kind in ("signal", "task"):
+            dashboard.count_created(model, created)
+        return created
+
+    def fill(self, volumes: dict, progress=None) -> Counter:
+        """
+        Maakt per soort (zie VOLUMES) het opgegeven aantal rijen. Geeft de aantallen van
+        deze aanroep terug. `progress(soort, klaar, totaal)` na elk blok.
+        """
+        self._load_reference()
+        counts = Counter()
+        for kind in VOLUMES:
+            count = volumes.get(kind, 0)
+            if count <= 0:
+                continue
+            build = getattr(self, f"_build_{kind}")
+            started = time.perf_counter()
+            for chunk in _chunks(build(count), self.batch_size):
+                with transaction.atomic():
+                    created = self._save(kind, chunk)
+                if kind not in ("history", "notification"):
+                    self.ids[kind].extend(obj.pk for obj in created)
+                counts[kind] += len(chunk)
+                # met DEBUG onthoudt Django de SQL van elke query (tot 9000 stuks)
+                reset_queries()
+                if progress:
+                    progress(kind, counts[kind], count)
+            self.seconds[kind] += time.perf_counter() - started
+        if counts["history"]:
+            started = time.perf_counter()
+            dashboard.fold_deltas()
+            self.seconds["history"] += time.perf_counter() - started
+        if counts["notification"]:
+            started = time.perf_counter()
+            rebuild_unread_counts(User.objects.filter(is_staff=True))
+            self.seconds["notification"] += time.perf_counter() - started
+        self.counts.update(counts)
+        return counts
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import math
+
+from django.conf import settings
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.db.models import BooleanField, Count, FloatField
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_save
+
+from core.models.people import Person, PersonTrigram
+from core.services.normalize import fold_name, normalize_phone, trigrams
+
+
+def _threshold() -> float:
+    return getattr(settings, "PERSON_FUZZY_THRESHOLD", 0.4)
+
+
+def _query_parts(q: str) -> tuple[str, str]:
+    text = fold_name(q)
+    # pas bij 3+ cijfers is het waarschijnlijk (een stuk van) een telefoonnummer
+    digits = normalize_phone(q) if sum(ch.isdigit() for ch in q) >= 3 else ""
+    return text, digits
+
+
+def fuzzy_people(q: str, queryset=None):
+    """
+    Personen die ongeveer op `q` lijken (naam, e-mail, telefoon), geannoteerd met
+    `fuzzy_score` (hoger = beter). Eén query, via de trigram-index:
+
+    - Postgres: pg_trgm word similarity (`<%`) op search_text + LIKE op phone_normalized,
+      beide via een GIN gin_trgm_ops index.
+    - Anders: PersonTrigram; score = aantal gedeelde trigrammen, minimaal
+      PERSON_FUZZY_THRESHOLD van de trigrammen in de zoekterm.
+    """
+    queryset = Person.objects.all() if queryset is None else queryset
+    text, digits = _query_parts(q)
+    if not text:
+        return queryset.none().annotate(fuzzy_score=RawSQL("0", [], output_field=FloatField()))
+
+    if connection.vendor == "postgresql":
+        conditions, params = ["%s <%% core_person.search_text"], [text]
+        score, score_params = "word_similarity(%s, core_person.search_text)", [text]
+        if digits:
+            conditions.append("core_person.phone_normalized LIKE %s")
+            params.append(f"%{digits}%")
+            score = f"GREATEST({score}, CASE WHEN core_person.phone_normalized LIKE %s THEN 1.0 ELSE 0.0 END)"
+            score_params.append(f"%{digits}%")
+        return (
+            queryset
+            .filter(RawSQL(f"({' OR '.join(conditions)})", params, output_field=BooleanField()))
+            .annotate(fuzzy_score=RawSQL(score, score_params, output_field=FloatField()))
+        )
+
+    wanted = trigrams(text) | trigrams(digits)
+    min_hits = max(1, math.ceil(len(wanted) * _threshold()))
+    return (
+        queryset
+        .filter(trigrams__trigram__in=wanted)
+        .annotate(fuzzy_score=Count("trigrams"))
+        .filter(fuzzy_score__gte=min_hits)
+    )
+
+
+# -------------------------
+# Trigram-tabel (alleen zonder Postgres)
+# -------------------------
+
+def _uses_trigram_table() -> bool:
+    return connection.vendor != "postgresql"
+
+
+def _rows(person_id: int, search_text: str, phone_normalized: str):
+    return [PersonTrigram(person_id=person_id, trigram=t) for t in trigrams(f"{search_text} {phone_normalized}")]
+
+
+def index_people(people) -> int:
+    """(Her)bouwt de trigrammen van deze personen. Na bulk_create/update zelf aanroepen."""
+    if not _uses_trigram_table():
+        return 0
+    people = list(people)
+    PersonTrigram.objects.filter(person_id__in=[p.pk for p in people]).delete()
+    rows = [row for p in people for row in _rows(p.pk, p.search_text, p.phone_normalized)]
+    PersonTrigram.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def rebuild(chunk_size: int = 1000) -> int:
+    if not _uses_trigram_table():
+        return 0
+    PersonTrigram.objects.all().delete()
+    total = 0
+    rows = []
+    for person_id, text, phone in Person.objects.values_list("id", "search_text", "phone_normalized").iterator(chunk_size=chunk_size):
+        rows.extend(_rows(person_id, text, phone))
+        if len(rows) >= chunk_size:
+            PersonTrigram.objects.bulk_create(rows)
+            total += len(rows)
+            rows = []
+    PersonTrigram.objects.bulk_create(rows)
+    return total + len(rows)
+
+
+# -------------------------
+# Signals
+# -------------------------
+
+def _index_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_people([instance])
+
+
+def _set_threshold(sender, connection, **kwargs):
+    # maakt `<%` (en dus de GIN-index) net zo ruim als PERSON_FUZZY_THRESHOLD
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT set_config('pg_trgm.word_similarity_threshold', %s, false)", [str(_threshold())])
+
+
+def connect_signals():
+    post_save.connect(_index_saved, sender=Person, dispatch_uid="fuzzy-save-person")
+    connection_created.connect(_set_threshold, dispatch_uid="fuzzy-pg-threshold")
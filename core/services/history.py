@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+import json
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction
+from django.db.models import Count, F
+
+from core.models.history import HistoryArchive, HistoryChange, HistoryEvent, HistoryFacet
+from core.models.status import Status
+from core.models.types import SignalType, TaskType
+from core.services import dashboard
+
+User = get_user_model()
+
+LABEL_FIELDS = {
+    Status: "name",
+    SignalType: "name",
+    TaskType: "name",
+    User: "username",
+}
+
+TYPE_MODELS = {
+    "signal": SignalType,
+    "task": TaskType,
+}
+
+# velden waarop de activiteitenlijst kan filteren (changes-sleutels uit de views)
+CHANGE_FIELD_LABELS = {
+    "status_id": "Status",
+    "type_id": "Type",
+    "assigned_to_id": "Toegewezen aan",
+    "active_from": "Actief vanaf",
+    "due_at": "Deadline",
+    "is_archived": "Archief",
+    "body": "Omschrijving",
+    "note_id": "Notitie",
+    "person_type": "Soort persoon",
+    "first_name": "Voornaam",
+    "last_name": "Achternaam",
+    "email": "Email",
+    "phone": "Telefoon",
+    "notes": "Notities",
+}
+
+# wat je in het filter typt voor "geen waarde"
+EMPTY_VALUE_WORDS = {"leeg", "-", "–"}
+
+
+def _reference_models(model_name: str | None) -> dict:
+    refs = {"status_id": Status, "assigned_to_id": User}
+    if model_name in TYPE_MODELS:
+        refs["type_id"] = TYPE_MODELS[model_name]
+    return refs
+
+
+def _label(labels, Model, value):
+    if not isinstance(value, int) or isinstance(value, bool):
+        return None
+    return labels.get(Model, {}).get(value)
+
+
+def attach_change_rows(events, model_name: str | None = None):
+    """
+    Zet `h.change_rows` op elk HistoryEvent: [{"field", "old", "new"}, ...] met verwijzingen
+    (status_id, type_id, assigned_to_id) al vertaald naar hun naam.
+
+    Alleen ids die in deze events voorkomen worden opgehaald: één in_bulk per model.
+    `model_name` ("signal", "task", ...) als alle events bij hetzelfde model horen; anders
+    wordt h.content_type.model gebruikt (dus select_related("content_type")).
+    """
+    events = list(events)
+
+    wanted = defaultdict(set)
+    for h in events:
+        refs = _reference_models(model_name or h.content_type.model)
+        for field, values in (h.changes or {}).items():
+            Model = refs.get(field)
+            if Model is None or not isinstance(values, (list, tuple)):
+                continue
+            wanted[Model].update(v for v in values[:2] if isinstance(v, int) and not isinstance(v, bool))
+
+    labels = {}
+    for Model, ids in wanted.items():
+        label_field = LABEL_FIELDS[Model]
+        objs = Model.objects.only("pk", label_field).in_bulk(ids)
+        labels[Model] = {pk: getattr(obj, label_field) for pk, obj in objs.items()}
+
+    for h in events:
+        refs = _reference_models(model_name or h.content_type.model)
+        rows = []
+        for field, values in (h.changes or {}).items():
+            if isinstance(values, (list, tuple)) and len(values) == 2:
+                old, new = values
+            else:
+                old, new = None, values
+            Model = refs.get(field)
+            if Model is not None:
+                old = _label(labels, Model, old)
+                new = _label(labels, Model, new)
+            rows.append({"field": field, "old": old, "new": new})
+        h.change_rows = rows
+
+    return events
+
+
+# -------------------------
+# Genormaliseerde changes (HistoryChange)
+# -------------------------
+
+def change_value(value) -> str | None:
+    """Waarde uit HistoryEvent.changes als tekst voor HistoryChange: 5 -> "5", True -> "true"."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value[:255]
+    return json.dumps(value, sort_keys=True, default=str)[:255]
+
+
+def change_rows_for(event) -> list[HistoryChange]:
+    rows = []
+    for field, values in (event.changes or {}).items():
+        if isinstance(values, (list, tuple)) and len(values) == 2:
+            old, new = values
+        else:
+            old, new = None, values
+        rows.append(HistoryChange(
+            event_id=event.id,
+            field=field[:50],
+            old_value=change_value(old),
+            new_value=change_value(new),
+        ))
+    return rows
+
+
+def _reference_ids(field: str, text: str) -> list[str] | None:
+    """Naam -> id('s) voor verwijzingsvelden ("Open" -> ["3"]); None als `field` geen verwijzing is."""
+    from core.services import reference
+
+    maps = {
+        "status_id": [reference.status_map],
+        "type_id": [reference.signal_type_map, reference.task_type_map],
+        "assigned_to_id": [reference.user_map],
+    }.get(field)
+    if maps is None:
+        return None
+    wanted = text.casefold()
+    return [str(pk) for load in maps for pk, label in load().items() if str(label).casefold() == wanted]
+
+
+def _value_condition(field: str, column: str, text: str) -> dict:
+    if text.casefold() in EMPTY_VALUE_WORDS:
+        return {f"{column}__isnull": True}
+    if not text.isdigit():
+        ids = _reference_ids(field, text)
+        if ids is not None:
+            return {f"{column}__in": ids}
+    return {column: text[:255]}
+
+
+def filter_by_change(queryset, field: str, old: str = "", new: str = ""):
+    """
+    HistoryEvents waarin `field` wijzigde, optioneel van `old` en/of naar `new`.
+    Waarden zoals in de changes ("3", "true", "2026-01-31"); voor status_id, type_id en
+    assigned_to_id mag ook de naam. "leeg" = geen waarde. Via historychange_new/old_idx.
+    """
+    conditions = {"field": field}
+    if old:
+        conditions.update(_value_condition(field, "old_value", old))
+    if new:
+        conditions.update(_value_condition(field, "new_value", new))
+    return queryset.filter(pk__in=HistoryChange.objects.filter(**conditions).values("event_id"))
+
+
+# -------------------------
+# Facetten (HistoryFacet)
+# -------------------------
+
+def bump_facets(events) -> None:
+    """Telt nieuwe events op bij HistoryFacet."""
+    # get_for_id uit de ContentType-cache: events met alleen content_type_id (bulk) kosten zo geen query per stuk
+    add_facet_counts(Counter((ContentType.objects.get_for_id(h.content_type_id).model, h.action) for h in events))
+
+
+def add_facet_counts(counts) -> None:
+    """{(model, action): n} erbij (of eraf, n < 0); één UPDATE per paar, een INSERT alleen de eerste keer."""
+    missing = []
+    for (model, action), n in counts.items():
+        if not HistoryFacet.objects.filter(model=model, action=action).update(count=F("count") + n) and n > 0:
+            missing.append((model, action))
+    if missing:
+        # gelijktijdige eerste events: de ene INSERT wint, de UPDATE telt voor beide
+        HistoryFacet.objects.bulk_create(
+            [HistoryFacet(model=model, action=action, count=0) for model, action in missing],
+            ignore_conflicts=True,
+        )
+        for model, action in missing:
+            HistoryFacet.objects.filter(model=model, action=action).update(count=F("count") + counts[model, action])
+
+
+def facets(exclude_models=()) -> tuple[list, list]:
+    """([(action, count), ...], [(model, count), ...]) uit de facettabel: één kleine query."""
+    rows = list(
+        HistoryFacet.objects.exclude(model__in=exclude_models).filter(count__gt=0)
+        .values_list("model", "action", "count")
+    )
+    actions, models = Counter(), Counter()
+    for model, action, count in rows:
+        actions[action] += count
+        models[model] += count
+    return sorted(actions.items()), sorted(models.items())
+
+
+def count_by_facet(queryset) -> Counter:
+    """{(model, action): aantal} voor een HistoryEvent- of HistoryArchive-queryset."""
+    rows = queryset.values_list("content_type__model", "action").annotate(n=Count("id")).order_by()
+    return Counter({(model, action): n for model, action, n in rows})
+
+
+@transaction.atomic
+def rebuild_facets() -> int:
+    """Telt HistoryFacet opnieuw uit HistoryEvent en HistoryArchive (alles wat de activiteitenlijst toont)."""
+    counts = count_by_facet(HistoryEvent.objects.all()) + count_by_facet(HistoryArchive.objects.all())
+    HistoryFacet.objects.all().delete()
+    HistoryFacet.objects.bulk_create(
+        HistoryFacet(model=model, action=action, count=n) for (model, action), n in counts.items()
+    )
+    return sum(counts.values())
+
+
+# -------------------------
+# Schrijven (direct of gebufferd)
+# -------------------------
+
+# aantal flushes per batchgrootte: {1: 812, 500: 14, ...}
+flush_sizes = Counter()
+
+_writer: ContextVar[HistoryWriter | None] = ContextVar("history_writer", default=None)
+
+
+def write_events(events) -> list:
+    """Schrijft HistoryEvents met hun HistoryChange-rijen en facetten weg: een vast aantal queries per batch."""
+    events = list(events)
+    if not events:
+        return events
+    if connection.features.can_return_rows_from_bulk_insert:
+        HistoryEvent.objects.bulk_create(events)
+    else:
+        # zonder RETURNING geen ids voor de HistoryChange-rijen
+        for event in events:
+            event.save()
+    rows = [row for event in events for row in change_rows_for(event)]
+    HistoryChange.objects.bulk_create(rows, batch_size=1000)
+    bump_facets(events)
+    dashboard.bump_activity(events)
+    flush_sizes[len(events)] += 1
+    return events
+
+
+class HistoryWriter:
+    """Verzamelt HistoryEvents en schrijft ze per `batch_size` weg met write_events."""
+
+    def __init__(self, batch_size: int = 1000):
+        self.batch_size = batch_size
+        self.pending = []
+        self.written = 0
+
+    def add(self, event):
+        self.pending.append(event)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> int:
+        events, self.pending = self.pending, []
+        write_events(events)
+        self.written += len(events)
+        return len(events)
+
+    def discard(self):
+        self.pending = []
+
+
+@contextmanager
+def buffered_history(batch_size: int = 1000):
+    """
+    Alle log_history-aanroepen binnen dit blok gaan naar één HistoryWriter en worden aan het
+    eind (vlak voor de commit) in bulk geschreven. Het blok is één transactie: bij een fout
+    wordt niets geschreven. Genest gebruik schrijft mee met de buitenste buffer.
+
+        with buffered_history() as writer:
+            for signal in signals:
+                ...
+                log_history(signal, user, "status_changed", {...})
+    """
+    current = _writer.get()
+    if current is not None:
+        yield current
+        return
+
+    writer = HistoryWriter(batch_size)
+    token = _writer.set(writer)
+    try:
+        with transaction.atomic():
+            yield writer
+            writer.flush()
+    finally:
+        _writer.reset(token)
+        writer.discard()
+
+
+def record(event):
+    """Schrijft `event` meteen weg, of zet hem in de buffer van een lopend buffered_history-blok."""
+    writer = _writer.get()
+    if writer is None:
+        write_events([event])
+    else:
+        writer.add(event)
+    return event
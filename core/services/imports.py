@@ -0,0 +1,259 @@
+"""
+CSV-import voor personen, meldingen en taken (manage.py import_csv en "Importeren" in de admin).
+
+Het bestand wordt regel voor regel gelezen en per blok van `batch_size` regels verwerkt:
+
+- elke regel via het gewone formulier (PersonForm / SignalForm / TaskForm);
+- personen met een e-mailadres dat al bestaat (of eerder in het bestand stond) slaan we over;
+- per blok één bulk_create, de history via buffered_history en de zoekindexen in bulk.
+
+Alleen het huidige blok staat in het geheugen, hoe groot het bestand ook is.
+
+Kolommen heten zoals de formuliervelden (first_name, email, type, assigned_to, ...).
+Bij type, status en assigned_to mag ook de naam / username in plaats van het id.
+Een lege of ontbrekende kolom krijgt de standaardwaarde van het model.
+"""
+from __future__ import annotations
+
+import csv
+import io
+from itertools import chain, islice
+
+from django.db.models.functions import Lower
+
+from core.models.core import Signal, Task
+from core.models.people import Person
+from core.people.forms import PersonForm
+from core.services import dashboard, fuzzy, reference, search
+from core.services.history import buffered_history
+from core.signals.forms import SignalForm
+from core.signals.services import log_history
+from core.tasks.forms import TaskForm
+
+# meer foutregels dan dit bewaren we niet (wel geteld)
+MAX_REPORTED_ERRORS = 1000
+
+# Excel NL bewaart CSV meestal als cp1252, niet als UTF-8
+ENCODINGS = {
+    "utf-8-sig": "UTF-8",
+    "cp1252": "Windows-1252 (Excel)",
+}
+
+# fouten bij het lezen van het bestand zelf, niet van één regel
+READ_ERRORS = (UnicodeDecodeError, csv.Error)
+
+
+def _names(objects, attr="name") -> dict:
+    return {str(getattr(obj, attr)).casefold(): obj.pk for obj in objects}
+
+
+IMPORTS = {
+    "person": {
+        "model": Person,
+        "form": PersonForm,
+        "references": {},
+        "required": [],
+        "dedupe_email": True,
+    },
+    "signal": {
+        "model": Signal,
+        "form": SignalForm,
+        "references": {
+            "type": lambda: _names(reference.active_signal_types()),
+            "status": lambda: _names(reference.active_statuses("signal")),
+            "assigned_to": lambda: _names(reference.staff_users(), "username"),
+        },
+        "required": ["type"],
+        "dedupe_email": False,
+    },
+    "task": {
+        "model": Task,
+        "form": TaskForm,
+        "references": {
+            "type": lambda: _names(reference.active_task_types()),
+            "status": lambda: _names(reference.active_statuses("task")),
+            "assigned_to": lambda: _names(reference.staff_users(), "username"),
+        },
+        "required": ["type"],
+        "dedupe_email": False,
+    },
+}
+
+
+class ImportResult:
+    def __init__(self, on_error=None):
+        self.on_error = on_error
+        self.rows = 0
+        self.created = 0
+        self.duplicates = 0
+        self.error_count = 0
+        # het bestand kon vanaf een regel niet verder gelezen worden; eerdere blokken staan er al in
+        self.aborted = False
+        # [(regelnummer, {veld: [meldingen]})], duplicaten ook (onder "email")
+        self.errors = []
+
+    def report(self, line: int, errors: dict, duplicate: bool = False):
+        if duplicate:
+            self.duplicates += 1
+        else:
+            self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, errors))
+        if self.on_error:
+            self.on_error(line, errors)
+
+    @property
+    def truncated(self) -> bool:
+        return self.error_count + self.duplicates > len(self.errors)
+
+
+# -------------------------
+# Lezen
+# -------------------------
+
+def read_csv(fileobj, encoding: str = "utf-8-sig"):
+    """
+    Regels als dicts (kolomnamen in kleine letters), zonder het hele bestand te lezen.
+    `fileobj` mag binair of tekst zijn; "," en ";" (Excel NL) worden allebei herkend.
+    """
+    if isinstance(fileobj, io.TextIOBase):
+        text = iter(fileobj)
+    else:
+        # per regel decoderen: een ongeldig teken geeft een leesfout op die regel, in plaats
+        # van halverwege een blok van TextIOWrapper (dan gaan de regels ervoor ook verloren)
+        text = (line.decode(encoding) for line in fileobj)
+    header = next(text, "")
+    delimiter = ";" if header.count(";") > header.count(",") else ","
+    reader = csv.DictReader(chain([header], text), delimiter=delimiter)
+    reader.fieldnames = [(name or "").strip().lower() for name in reader.fieldnames or []]
+    return reader
+
+
+def read_error(e: Exception) -> str:
+    """Melding voor de gebruiker bij een van READ_ERRORS."""
+    if isinstance(e, UnicodeDecodeError):
+        return f"Het bestand is geen {e.encoding}; kies een andere codering (bv. cp1252 voor Excel)."
+    return f"Ongeldige CSV: {e}"
+
+
+def _numbered(rows, result: ImportResult):
+    """(regelnummer, regel); een leesfout komt als fout op die regel in `result` en stopt de import."""
+    # regel 1 is de kopregel
+    iterator = iter(rows)
+    line = 2
+    while True:
+        try:
+            row = next(iterator)
+        except StopIteration:
+            return
+        except READ_ERRORS as e:
+            result.report(line, {"bestand": [read_error(e)]})
+            result.aborted = True
+            return
+        yield line, row
+        line += 1
+
+
+def _chunks(iterable, size: int):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+# -------------------------
+# Verwerken
+# -------------------------
+
+def _form_data(spec, row: dict, lookups: dict) -> dict:
+    model = spec["model"]
+    data = {}
+    for name in spec["form"]._meta.fields:
+        value = (row.get(name) or "").strip()
+        if not value:
+            field = model._meta.get_field(name)
+            if field.has_default():
+                value = field.get_default()
+        elif name in lookups and not value.isdigit():
+            # naam i.p.v. id; onbekend -> laten staan, het formulier meldt het
+            value = lookups[name].get(value.casefold(), value)
+        data[name] = value
+    return data
+
+
+def _validate(spec, row: dict, lookups: dict):
+    form = spec["form"](data=_form_data(spec, row, lookups))
+    if not form.is_valid():
+        return None, {field: [str(m) for m in messages] for field, messages in form.errors.items()}
+    obj = form.save(commit=False)
+    # het formulier laat type leeg toe, het model niet
+    missing = {name: ["Dit veld is verplicht."] for name in spec["required"] if getattr(obj, f"{name}_id") is None}
+    return (None, missing) if missing else (obj, None)
+
+
+def _without_duplicates(valid, result: ImportResult) -> list:
+    """Haalt personen eruit waarvan het e-mailadres al bestaat; één query per blok (person_email_lower_idx)."""
+    emails = {obj.email.lower() for _, obj in valid if obj.email}
+    existing = set()
+    if emails:
+        existing = set(
+            Person.objects.annotate(email_lower=Lower("email"))
+            .filter(email_lower__in=emails)
+            .values_list("email_lower", flat=True)
+        )
+    kept = []
+    for line, obj in valid:
+        email = obj.email.lower()
+        if email in existing:
+            result.report(line, {"email": [f"Bestaat al: {obj.email}"]}, duplicate=True)
+            continue
+        if email:
+            existing.add(email)
+        kept.append((line, obj))
+    return kept
+
+
+def _insert(spec, objs: list, actor, batch_size: int):
+    model = spec["model"]
+    if model is Person:
+        for obj in objs:
+            obj.normalize()
+    with buffered_history(batch_size):
+        created = model.objects.bulk_create(objs, batch_size=batch_size)
+        for obj in created:
+            log_history(obj, actor, "created", {})
+        # bulk_create slaat post_save over: de indexen en dashboardtellingen zelf bijwerken
+        search.index_objects(created, batch_size=batch_size)
+        if model is Person:
+            fuzzy.index_people(created)
+        else:
+            dashboard.count_created(model, created)
+
+
+def import_rows(kind: str, rows, actor=None, *, batch_size: int = 500, dry_run: bool = False, on_error=None) -> ImportResult:
+    """
+    Importeert `rows` (dicts, bv. uit read_csv) als `kind` ("person", "signal" of "task").
+    Elk blok is één transactie. `on_error(regel, fouten)` wordt per afgekeurde of
+    dubbele regel aangeroepen; dry_run valideert alleen. Een leesfout (codering, kapotte
+    CSV) stopt de import met een fout op die regel (result.aborted).
+    """
+    spec = IMPORTS[kind]
+    lookups = {name: load() for name, load in spec["references"].items()}
+    result = ImportResult(on_error)
+
+    for chunk in _chunks(_numbered(rows, result), batch_size):
+        valid = []
+        for line, row in chunk:
+            result.rows += 1
+            obj, errors = _validate(spec, row, lookups)
+            if errors:
+                result.report(line, errors)
+                continue
+            valid.append((line, obj))
+
+        if spec["dedupe_email"]:
+            valid = _without_duplicates(valid, result)
+        if valid and not dry_run:
+            _insert(spec, [obj for _, obj in valid], actor, batch_size)
+        result.created += len(valid)
+
+    return result
@@ -0,0 +1,137 @@
+"""
+"Mijn werk": alles wat op een gebruiker wacht, als één gesorteerde lijst.
+
+- open meldingen die aan de gebruiker zijn toegewezen, of aan niemand (= voor iedereen);
+- open taken die aan de gebruiker zijn toegewezen en binnen INBOX_DUE_DAYS dagen verlopen (of al verlopen zijn),
+  zonder afgeronde status (TASK_DONE_STATUS_KEYS); de langst verlopen eerst binnen de limiet;
+- ongelezen notificaties.
+
+Eén UNION ALL-query met per bron een eigen ORDER BY ... LIMIT over een (covering) index,
+daarna per model één id__in-query voor de weergave: altijd 4 queries, hoe groot de
+achterstand ook is. Per bron halen we er één extra op om te weten of er meer is.
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import CharField, DateTimeField, F, Value
+from django.db.models.functions import Cast
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models.core import Signal, Task
+from core.models.notifications import Notification
+from core.services.reminders import done_status_keys
+from core.services.sql import union_all
+
+# bron -> (label, model)
+SOURCES = {
+    "signal_mine": ("Melding", Signal),
+    "signal_all": ("Melding", Signal),
+    "task": ("Taak", Task),
+    "notification": ("Notificatie", Notification),
+}
+
+# bronnen die hun limiet oplopend nemen; de rest aflopend
+ASCENDING = {"task"}
+
+
+def _limit() -> int:
+    return getattr(settings, "INBOX_LIMIT", 50)
+
+
+def _due_days() -> int:
+    return getattr(settings, "INBOX_DUE_DAYS", 7)
+
+
+def _source(qs, name: str, sort_at, ordering: list, limit: int):
+    # sorteren op de indexkolommen zelf; sort_at is alleen de gemeenschappelijke kolom voor de UNION
+    return (
+        qs.order_by(*ordering)
+        .annotate(source=Value(name, output_field=CharField()), item_id=F("id"), sort_at=sort_at)
+        .values_list("source", "item_id", "sort_at")[:limit + 1]
+    )
+
+
+def _sources(user, now, limit: int) -> list:
+    today = timezone.localdate(now)
+    signals = Signal.objects.filter(is_archived=False, active_from__lte=today)
+    signal_order = ["-active_from", "-created_at", "-id"]
+    signal_sort = Cast("active_from", DateTimeField())
+    return [
+        # twee bronnen i.p.v. één OR: elk een gelijkheid op signal_live_assignee_idx
+        _source(signals.filter(assigned_to=user), "signal_mine", signal_sort, signal_order, limit),
+        _source(signals.filter(assigned_to__isnull=True), "signal_all", signal_sort, signal_order, limit),
+        # oplopend: bij meer dan `limit` taken vallen de verste deadlines af, niet de langst verlopen
+        _source(
+            Task.objects.filter(is_archived=False, assigned_to=user, due_at__lte=now + timedelta(days=_due_days()))
+            .exclude(status__key__in=done_status_keys()),
+            "task", F("due_at"), ["due_at", "id"], limit,
+        ),
+        _source(
+            Notification.objects.filter(user=user, is_read=False),
+            "notification", F("created_at"), ["-created_at", "-id"], limit,
+        ),
+    ]
+
+
+def _objects(rows) -> dict:
+    """{(model, id): object} voor de rijen uit de UNION; één query per model."""
+    ids = {}
+    for source, pk, _ in rows:
+        ids.setdefault(SOURCES[source][1], []).append(pk)
+    loaded = {}
+    for model, pks in ids.items():
+        qs = model.objects.filter(id__in=pks)
+        if model is not Notification:
+            qs = qs.select_related("type", "status")
+        loaded.update({(model, obj.pk): obj for obj in qs})
+    return loaded
+
+
+def _item(source: str, obj, now) -> dict:
+    label = SOURCES[source][0]
+    if isinstance(obj, Notification):
+        return {"kind": source, "label": label, "title": obj.title, "body": obj.body, "url": obj.url,
+                "when": obj.created_at, "overdue": False}
+    if isinstance(obj, Signal):
+        return {"kind": source, "label": label, "title": f"{obj.type.name} #{obj.pk}", "body": obj.body,
+                "url": reverse("signals:detail", args=[obj.pk]), "when": obj.active_from, "overdue": False,
+                "status": obj.status.name if obj.status_id else "", "for_everyone": obj.assigned_to_id is None}
+    return {"kind": source, "label": label, "title": f"{obj.type.name} #{obj.pk}", "body": obj.body,
+            "url": reverse("tasks:detail", args=[obj.pk]), "when": obj.due_at, "overdue": obj.due_at < now,
+            "status": obj.status.name if obj.status_id else ""}
+
+
+def inbox(user, *, limit: int | None = None, now=None) -> dict:
+    """
+    {"items": [...], "more": {bron: bool}} voor `user`, nieuwste (resp. laatste deadline) eerst.
+    Per bron maximaal `limit` (INBOX_LIMIT) items.
+    """
+    limit = limit or _limit()
+    now = now or timezone.now()
+    rows = union_all(_sources(user, now, limit), ["-sort_at", "source", "-item_id"])
+
+    # per bron de eerste `limit` in de volgorde van die bron; taken lopen oplopend (zie _sources)
+    per_source = {source: [] for source in SOURCES}
+    for row in rows:
+        per_source[row[0]].append(row)
+    keep = set()
+    for source, source_rows in per_source.items():
+        if source in ASCENDING:
+            source_rows = source_rows[::-1]
+        keep.update(source_rows[:limit])
+    kept = [row for row in rows if row in keep]
+
+    objects = _objects(kept)
+    items = []
+    for source, pk, _ in kept:
+        obj = objects.get((SOURCES[source][1], pk))
+        # tussen de twee queries verwijderd
+        if obj is not None:
+            items.append(_item(source, obj, now))
+    return {
+        "items": items,
+        "more": {source: len(source_rows) > limit for source, source_rows in per_source.items()},
+    }
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models.jobs import Job
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+
+# een job die langer dan dit "running" staat, hoort bij een gecrashte worker en mag opnieuw
+STALE_AFTER = timedelta(minutes=10)
+
+
+def job_handler(kind: str):
+    def register(func):
+        HANDLERS[kind] = func
+        return func
+    return register
+
+
+def enqueue(kind: str, payload: dict | None = None, run_after=None, max_attempts: int = 5) -> Job:
+    return Job.objects.create(
+        kind=kind,
+        payload=payload or {},
+        run_after=run_after or timezone.now(),
+        max_attempts=max_attempts,
+    )
+
+
+def enqueue_on_commit(kind: str, payload: dict | None = None, **kwargs):
+    """
+    Zet de job pas in de queue als de huidige transactie commit: geen jobs voor
+    rollbacks, en de worker ziet nooit een object dat nog niet bestaat.
+    Met JOBS_EAGER = True draait de job direct (handig lokaal / in tests).
+    """
+    def _enqueue():
+        job = enqueue(kind, payload, **kwargs)
+        if getattr(settings, "JOBS_EAGER", False):
+            run_job(job)
+
+    transaction.on_commit(_enqueue)
+
+
+def claim_jobs(limit: int) -> list[Job]:
+    now = timezone.now()
+    with transaction.atomic():
+        qs = (
+            Job.objects
+            .filter(
+                Q(status=Job.STATUS_PENDING, run_after__lte=now)
+                | Q(status=Job.STATUS_RUNNING, locked_at__lt=now - STALE_AFTER)
+            )
+            .order_by("run_after", "id")
+        )
+        if connection.features.has_select_for_update_skip_locked:
+            qs = qs.select_for_update(skip_locked=True)
+        jobs = list(qs[:limit])
+        for job in jobs:
+            job.status = Job.STATUS_RUNNING
+            job.locked_at = now
+            job.attempts += 1
+        Job.objects.bulk_update(jobs, ["status", "locked_at", "attempts"])
+    return jobs
+
+
+def run_job(job: Job) -> bool:
+    if job.status != Job.STATUS_RUNNING:
+        # eager / handmatig: niet via claim_jobs gegaan
+        job.status = Job.STATUS_RUNNING
+        job.attempts += 1
+
+    handler = HANDLERS.get(job.kind)
+    try:
+        if handler is None:
+            raise LookupError(f"Geen handler voor job '{job.kind}'")
+        with transaction.atomic():
+            handler(**job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            job.status = Job.STATUS_PENDING
+            # 30s, 1m, 2m, 4m, ...
+            job.run_after = timezone.now() + timedelta(seconds=30 * 2 ** max(job.attempts - 1, 0))
+        else:
+            job.status = Job.STATUS_FAILED
+            job.finished_at = timezone.now()
+        logger.warning("job %s (%s) mislukt, poging %s/%s", job.id, job.kind, job.attempts, job.max_attempts)
+        job.save(update_fields=["status", "run_after", "last_error", "finished_at", "attempts"])
+        return False
+
+    job.status = Job.STATUS_DONE
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "finished_at", "attempts"])
+    return True
+
+
+def run_pending(limit: int = 50) -> tuple[int, int]:
+    """Eén ronde van de worker. Geeft (gelukt, mislukt) terug."""
+    ok = failed = 0
+    for job in claim_jobs(limit):
+        if run_job(job):
+            ok += 1
+        else:
+            failed += 1
+    return ok, failed
@@ -0,0 +1,34 @@
+"""
+Normalisatie voor fuzzy zoeken op personen (zonder model-imports: Person.save gebruikt dit).
+"""
+from __future__ import annotations
+
+import re
+
+from core.services.stemming import fold
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def fold_name(*parts: str) -> str:
+    """"Dé  Vries-Öztürk" -> "de vries ozturk": kleine letters, zonder accenten, alleen woorden."""
+    return " ".join(WORD_RE.findall(fold(" ".join(p for p in parts if p))))
+
+
+def normalize_phone(phone: str) -> str:
+    """Alleen cijfers, met +31 / 0031 omgezet naar een 0: "+31 6-1234 5678" -> "0612345678"."""
+    digits = re.sub(r"\D", "", phone or "")
+    if phone and phone.strip().startswith("+31"):
+        return "0" + digits[2:]
+    if digits.startswith("0031"):
+        return "0" + digits[4:]
+    return digits
+
+
+def trigrams(text: str) -> set[str]:
+    """Trigrammen zoals pg_trgm ze maakt: per woord, met twee spaties ervoor en één erachter."""
+    grams = set()
+    for word in WORD_RE.findall(text):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
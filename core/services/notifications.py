@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import BooleanField, CharField, Count, DateTimeField, F, IntegerField, OuterRef, Subquery, TextField, Value
+from django.db.models.functions import Cast, Coalesce, Concat, Substr
+from django.utils import timezone
+
+from core.models.notifications import Notification, NotificationCounter
+from core.services.pubsub import broker
+from core.services.sql import insert_select
+
+User = get_user_model()
+
+
+def _notification_values(obj, *, kind, title, body, url):
+    return {
+        "content_type_id": ContentType.objects.get_for_model(obj.__class__).id,
+        "object_id": obj.pk,
+        "kind": kind,
+        "title": title[:160],
+        "body": body,
+        "url": url,
+    }
+
+
+def notify_users(obj, user_ids, *, kind: str, title: str, body: str = "", url: str = "") -> int:
+    """Notificaties voor een kleine, bekende lijst users (bv. de assignee)."""
+    return fan_out(obj, User.objects.filter(id__in=list(user_ids)), kind=kind, title=title, body=body, url=url)
+
+
+def fan_out(obj, recipients, *, kind: str, title: str, body: str = "", url: str = "", batch_size: int | None = None) -> int:
+    """
+    Notificaties voor alle users in `recipients` (een User-queryset) met één
+    INSERT ... SELECT per batch: de users komen nooit naar Python.
+
+    Batches lopen over id-ranges van `batch_size` users (None = alles in één statement).
+    Bestaande (user, object, kind) combinaties worden overgeslagen (ON CONFLICT DO NOTHING),
+    dus opnieuw uitvoeren is veilig. Geeft het aantal nieuwe notificaties terug.
+
+    De unread-tellers van de ontvangers lopen in dezelfde batch mee op; na de commit
+    krijgen open notificatie-streams van de ontvangers een wake-up (zie pubsub).
+    """
+    values = _notification_values(obj, kind=kind, title=title, body=body, url=url)
+    recipients = recipients.order_by()
+    ids = recipients.order_by("id").values_list("id", flat=True)
+
+    inserted = 0
+    last_id = None
+    while True:
+        batch = recipients if last_id is None else recipients.filter(id__gt=last_id)
+        upper = None
+        if batch_size:
+            upper = (ids if last_id is None else ids.filter(id__gt=last_id))[batch_size - 1:batch_size].first()
+            if upper is not None:
+                batch = batch.filter(id__lte=upper)
+
+        inserted += _deliver(batch, values)
+
+        if upper is None:
+            break
+        last_id = upper
+
+    if inserted:
+        _announce(recipients)
+    return inserted
+
+
+def _deliver(recipients, values) -> int:
+    now = timezone.now()
+    columns = {
+        "user_id": F("id"),
+        "content_type_id": Value(values["content_type_id"], output_field=IntegerField()),
+        "object_id": Value(values["object_id"], output_field=IntegerField()),
+        "kind": Value(values["kind"], output_field=CharField()),
+        "title": Value(values["title"], output_field=CharField()),
+        "body": Value(values["body"], output_field=TextField()),
+        "url": Value(values["url"], output_field=CharField()),
+        "is_read": Value(False, output_field=BooleanField()),
+        "created_at": Value(now, output_field=DateTimeField()),
+    }
+    inserted = insert_select(Notification, recipients, columns)
+    if inserted:
+        # alleen rijen uit deze INSERT dragen precies deze created_at; overgeslagen dubbelen niet
+        new_rows = Notification.objects.filter(
+            content_type_id=values["content_type_id"],
+            object_id=values["object_id"],
+            kind=values["kind"],
+            created_at=now,
+        )
+        _bump_unread(new_rows)
+    return inserted
+
+
+def notify_assignees(objects, *, kind: str, title: str, url_prefix: str, exclude_user_id: int | None = None,
+                     with_body: bool = False) -> int:
+    """
+    Eén notificatie per object in `objects` (Signal- of Task-queryset) voor zijn assigned_to,
+    in één INSERT ... SELECT: bv. na een bulk-toewijzing. url = f"{url_prefix}{id}/".
+    Objecten zonder assignee of toegewezen aan `exclude_user_id` (de actor) slaan we over.
+    with_body: de omschrijving van het object (eerste 4000 tekens) als body.
+    """
+    objects = objects.filter(assigned_to__isnull=False).order_by()
+    if exclude_user_id is not None:
+        objects = objects.exclude(assigned_to_id=exclude_user_id)
+
+    now = timezone.now()
+    content_type_id = ContentType.objects.get_for_model(objects.model).id
+    columns = {
+        "user_id": F("assigned_to_id"),
+        "content_type_id": Value(content_type_id, output_field=IntegerField()),
+        "object_id": F("id"),
+        "kind": Value(kind, output_field=CharField()),
+        "title": Value(title[:160], output_field=CharField()),
+        "body": Substr("body", 1, 4000, output_field=TextField()) if with_body else Value("", output_field=TextField()),
+        "url": Concat(Value(url_prefix), Cast("id", CharField()), Value("/"), output_field=CharField()),
+        "is_read": Value(False, output_field=BooleanField()),
+        "created_at": Value(now, output_field=DateTimeField()),
+    }
+    inserted = insert_select(Notification, objects, columns)
+    if inserted:
+        _bump_unread(Notification.objects.filter(
+            content_type_id=content_type_id,
+            object_id__in=objects.values("id"),
+            kind=kind,
+            created_at=now,
+        ))
+        _announce(User.objects.filter(id__in=objects.values("assigned_to_id")))
+    return inserted
+
+
+def notify_rows(rows: list[dict]) -> int:
+    """
+    Notificaties die elk een eigen ontvanger, object en kind hebben (bv. herinneringen),
+    in één bulk INSERT. Bestaande (user, object, kind) slaan we over, dus opnieuw is veilig.
+    `rows`: dicts met user_id, content_type_id, object_id, kind, title, body en url.
+    """
+    if not rows:
+        return 0
+    objs = Notification.objects.bulk_create(
+        [Notification(**{**row, "title": row["title"][:160]}) for row in rows],
+        ignore_conflicts=True,
+    )
+    # bulk_create zet created_at per object (auto_now_add); alleen rijen uit deze INSERT
+    # hebben precies die waarde, ook als een andere worker intussen dezelfde objecten deed
+    ours = {(o.user_id, o.content_type_id, o.object_id, o.kind, o.created_at) for o in objs}
+    candidates = Notification.objects.filter(
+        content_type_id__in={row["content_type_id"] for row in rows},
+        object_id__in={row["object_id"] for row in rows},
+        kind__in={row["kind"] for row in rows},
+    ).values_list("id", "user_id", "content_type_id", "object_id", "kind", "created_at")
+    new_ids = [pk for pk, *key in candidates if tuple(key) in ours]
+    if new_ids:
+        new_rows = Notification.objects.filter(id__in=new_ids)
+        _bump_unread(new_rows)
+        _announce(User.objects.filter(id__in=new_rows.values("user_id")))
+    return len(new_ids)
+
+
+def _announce(recipients):
+    # alleen users met een open stream in dit proces; meestal een handvol
+    listening = broker.user_ids()
+    if not listening:
+        return
+    user_ids = list(recipients.filter(id__in=listening).values_list("id", flat=True))
+    if user_ids:
+        transaction.on_commit(lambda: broker.publish(user_ids), using=recipients.db)
+
+
+def _bump_unread(new_rows):
+    """unread + het aantal nieuwe rijen per user; `new_rows` = Notification-queryset met precies de nieuwe rijen."""
+    user_ids = new_rows.values("user_id")
+    insert_select(
+        NotificationCounter,
+        User.objects.filter(id__in=user_ids).order_by(),
+        {"user_id": F("id"), "unread": Value(0, output_field=IntegerField())},
+    )
+    per_user = (
+        new_rows.filter(user_id=OuterRef("user_id"))
+        .order_by()
+        .values("user_id")
+        .annotate(n=Count("id"))
+        .values("n")
+    )
+    NotificationCounter.objects.filter(user_id__in=user_ids).update(
+        unread=F("unread") + Subquery(per_user, output_field=IntegerField()),
+    )
+
+
+def unread_count(user) -> int:
+    """Voor de badge: één primary-key lookup, geen COUNT over notificaties."""
+    if not getattr(user, "is_authenticated", False):
+        return 0
+    return NotificationCounter.objects.filter(user_id=user.id).values_list("unread", flat=True).first() or 0
+
+
+def mark_all_read(user) -> int:
+    """Alle ongelezen notificaties van `user` in één UPDATE (via notification_unread_idx)."""
+    updated = Notification.objects.filter(user=user, is_read=False).update(is_read=True, read_at=timezone.now())
+    NotificationCounter.objects.filter(user=user).update(unread=0)
+    return updated
+
+
+def rebuild_unread_counts(users=None) -> int:
+    """
+    Zet de tellers van `users` (User-queryset, None = iedereen) opnieuw gelijk aan de
+    werkelijke aantallen. Voor als notificaties buiten deze module om zijn aangepast.
+    """
+    users = (User.objects.all() if users is None else users).order_by()
+    insert_select(NotificationCounter, users, {"user_id": F("id"), "unread": Value(0, output_field=IntegerField())})
+    unread = (
+        Notification.objects
+        .filter(user_id=OuterRef("user_id"), is_read=False)
+        .order_by()
+        .values("user_id")
+        .annotate(n=Count("id"))
+        .values("n")
+    )
+    return NotificationCounter.objects.filter(user_id__in=users.values("id")).update(
+        unread=Coalesce(Subquery(unread, output_field=IntegerField()), 0),
+    )
+
+
+def fan_out_orm(obj, recipients, *, kind: str, title: str, body: str = "", url: str = "", batch_size: int | None = None) -> int:
+    """Oude aanpak (users ophalen, Notification per rij). Alleen nog voor bench_fanout."""
+    values = _notification_values(obj, kind=kind, title=title, body=body, url=url)
+    created = Notification.objects.bulk_create(
+        [Notification(user=u, **values) for u in recipients],
+        batch_size=batch_size,
+        ignore_conflicts=True,
+    )
+    return len(created)
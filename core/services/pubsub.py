@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import defaultdict
+
+
+class Subscription:
+    """
+    Eén open stream (bv. een SSE-verbinding) van een user.
+
+    Berichten zijn alleen wake-ups: de stream leest de nieuwe rijen zelf uit de DB.
+    De queue heeft daarom maar één plek; extra wake-ups voor een stream die nog
+    niet bij is vallen samen.
+    """
+
+    def __init__(self, broker: Broker, user_id: int, loop: asyncio.AbstractEventLoop):
+        self.broker = broker
+        self.user_id = user_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=1)
+
+    def _put(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            pass
+
+    async def wait(self, timeout: float):
+        """Wacht op een wake-up. None bij timeout (-> toch de DB checken)."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class Broker:
+    """
+    In-process pub/sub per user-id.
+
+    publish() mag vanuit elke thread (sync views, de job-worker in hetzelfde proces);
+    de wake-up wordt via call_soon_threadsafe in de event loop van de stream gezet.
+    Andere processen (bv. een losse run_jobs) bereikt dit niet: daarvoor pollt de
+    stream de DB als fallback.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = Subscription(self, user_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subs = self._subscriptions.get(subscription.user_id)
+            if subs is not None:
+                subs.discard(subscription)
+                if not subs:
+                    del self._subscriptions[subscription.user_id]
+
+    def user_ids(self) -> set[int]:
+        with self._lock:
+            return set(self._subscriptions)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subs) for subs in self._subscriptions.values())
+
+    def publish(self, user_ids, message=True) -> int:
+        """Wekt alle streams van `user_ids`. Geeft het aantal gewekte streams terug."""
+        with self._lock:
+            targets = [sub for user_id in set(user_ids) for sub in self._subscriptions.get(user_id, ())]
+
+        woken = 0
+        for sub in targets:
+            try:
+                sub.loop.call_soon_threadsafe(sub._put, message)
+            except RuntimeError:
+                # loop is al dicht; de stream ruimt zichzelf op
+                continue
+            woken += 1
+        return woken
+
+
+broker = Broker()
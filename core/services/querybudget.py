@@ -0,0 +1,77 @@
+"""
+Queries tellen en timen, en herhaalde queryvormen herkennen (N+1: dezelfde query per rij).
+
+QueryRecorder hangt als execute_wrapper aan de databaseverbindingen van de huidige thread
+en onthoudt per query de SQL en de duur. shape() maakt van de SQL een "vorm": literals en
+placeholders worden ?, IN-lijsten (...), zodat `... WHERE id = 1` en `... WHERE id = 2`
+als dezelfde query tellen.
+
+Gebruikt door core.middleware.QueryBudgetMiddleware en de query-tests.
+"""
+from __future__ import annotations
+
+import re
+import time
+from collections import Counter
+
+from django.db import connections
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|%s|\B\?|\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+def shape(sql: str) -> str:
+    """De vorm van een query: zonder waarden, IN-lijsten ingeklapt, witruimte genormaliseerd."""
+    sql = _LITERALS.sub("?", sql)
+    sql = _IN_LISTS.sub("(...)", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+
+class QueryRecorder:
+    """
+    Verzamelt de queries tussen start() en stop() (of binnen `with recorder:`), over alle
+    databaseverbindingen van de huidige thread.
+    """
+
+    def __init__(self):
+        self.queries = []  # [(sql, ms)]
+        self._connections = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, (time.perf_counter() - started) * 1000))
+
+    def start(self):
+        self._connections = list(connections.all())
+        for conn in self._connections:
+            conn.execute_wrappers.append(self)
+
+    def stop(self):
+        for conn in self._connections:
+            if self in conn.execute_wrappers:
+                conn.execute_wrappers.remove(self)
+        self._connections = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def duration_ms(self) -> float:
+        return sum(ms for _, ms in self.queries)
+
+    def repeated(self, threshold: int = 2) -> list[tuple[str, int]]:
+        """[(vorm, aantal)] van de vormen die minstens `threshold` keer voorkwamen, meeste eerst."""
+        counts = Counter(shape(sql) for sql, _ in self.queries)
+        return [(s, n) for s, n in counts.most_common() if n >= threshold]
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+
+from core.models.status import Status
+from core.models.types import SignalType, TaskType
+
+User = get_user_model()
+
+# Referentiedata (statussen, types, users) verandert zelden maar wordt op bijna elke pagina gebruikt.
+# Let op: met de locmem-default heeft elk proces een eigen cache; invalidatie via signals raakt dan
+# alleen het eigen proces. REFERENCE_CACHE_TIMEOUT begrenst hoe lang andere workers oude data zien.
+CACHE_PREFIX = "refdata"
+
+GROUP_KEYS = {
+    "status": ["status:map", "status:active:all", "status:active:signal", "status:active:task"],
+    "signaltype": ["signaltype:map", "signaltype:active"],
+    "tasktype": ["tasktype:map", "tasktype:active"],
+    "user": ["user:map", "user:staff:active", "user:staff:all"],
+}
+
+
+def _timeout():
+    return getattr(settings, "REFERENCE_CACHE_TIMEOUT", 300)
+
+
+def _cached(key: str, loader):
+    full_key = f"{CACHE_PREFIX}:{key}"
+    value = cache.get(full_key)
+    if value is None:
+        value = loader()
+        cache.set(full_key, value, _timeout())
+    return value
+
+
+def invalidate(*groups: str):
+    keys = [f"{CACHE_PREFIX}:{key}" for group in (groups or GROUP_KEYS) for key in GROUP_KEYS[group]]
+    cache.delete_many(keys)
+
+
+# -------------------------
+# Maps (id -> label)
+# -------------------------
+
+def status_map() -> dict:
+    return _cached("status:map", lambda: dict(Status.objects.values_list("id", "name")))
+
+
+def signal_type_map() -> dict:
+    return _cached("signaltype:map", lambda: dict(SignalType.objects.values_list("id", "name")))
+
+
+def task_type_map() -> dict:
+    return _cached("tasktype:map", lambda: dict(TaskType.objects.values_list("id", "name")))
+
+
+def user_map() -> dict:
+    return _cached("user:map", lambda: dict(User.objects.values_list("id", "username")))
+
+
+# -------------------------
+# Dropdown lijsten
+# -------------------------
+
+def active_statuses(scope: str | None = None) -> list:
+    def load():
+        qs = Status.objects.filter(is_active=True).order_by("sort_order", "name")
+        if scope:
+            qs = qs.filter(scope=scope)
+        return list(qs)
+
+    return _cached(f"status:active:{scope or 'all'}", load)
+
+
+def active_signal_types() -> list:
+    return _cached(
+        "signaltype:active",
+        lambda: list(SignalType.objects.filter(is_active=True).order_by("sort_order", "name")),
+    )
+
+
+def active_task_types() -> list:
+    return _cached(
+        "tasktype:active",
+        lambda: list(TaskType.objects.filter(is_active=True).order_by("sort_order", "name")),
+    )
+
+
+def staff_users(active_only: bool = True) -> list:
+    def load():
+        qs = User.objects.filter(is_staff=True).order_by("username")
+        if active_only:
+            qs = qs.filter(is_active=True)
+        return list(qs)
+
+    return _cached(f"user:staff:{'active' if active_only else 'all'}", load)
+
+
+def set_cached_choices(field, objects, label=str, extra=None):
+    """
+    Vult een ModelChoiceField met keuzes uit de cache, zodat renderen geen query kost.
+    De queryset blijft staan voor validatie. `extra` = (pk, label) van een huidige waarde
+    die niet (meer) in de lijst staat, bv. een inactieve status.
+    """
+    choices = [(obj.pk, label(obj)) for obj in objects]
+    if extra and extra[0] not in {pk for pk, _ in choices}:
+        choices.append(extra)
+    if field.empty_label is not None:
+        choices.insert(0, ("", field.empty_label))
+    field.choices = choices
+
+
+# -------------------------
+# Invalidatie
+# -------------------------
+
+def _invalidate_statuses(sender, **kwargs):
+    invalidate("status")
+
+
+def _invalidate_signal_types(sender, **kwargs):
+    invalidate("signaltype")
+
+
+def _invalidate_task_types(sender, **kwargs):
+    invalidate("tasktype")
+
+
+def _invalidate_users(sender, update_fields=None, **kwargs):
+    # login werkt alleen last_login bij; daarvoor hoeft de cache niet leeg
+    if update_fields and set(update_fields) <= {"last_login"}:
+        return
+    invalidate("user")
+
+
+def connect_signals():
+    for handler, model in (
+        (_invalidate_statuses, Status),
+        (_invalidate_signal_types, SignalType),
+        (_invalidate_task_types, TaskType),
+        (_invalidate_users, User),
+    ):
+        post_save.connect(handler, sender=model, dispatch_uid=f"refdata-save-{model._meta.label_lower}")
+        post_delete.connect(handler, sender=model, dispatch_uid=f"refdata-delete-{model._meta.label_lower}")
@@ -0,0 +1,166 @@
+"""
+Herinneringen voor taken: "verloopt binnenkort" (TASK_REMINDER_DUE_SOON_HOURS vóór de
+deadline) en "verlopen" (op de deadline), als Notification voor de assignee.
+
+`manage.py run_reminders` draait een ReminderScheduler: een min-heap met de herinneringen
+van het komende `window`, gesorteerd op het moment dat ze af moeten gaan. Een tick kijkt
+alleen naar de top van de heap; de database komt pas weer in beeld als er iets af gaat
+(één controlequery + één INSERT per batch) of als de heap wordt ververst (elke `refresh`,
+één range-query op due_at per soort over task_live_status_idx / task_live_due_idx).
+
+Idempotent: de kind van de notificatie bevat de deadline ("task_overdue:202610181400"),
+en (user, object, kind) is uniek. Dubbel versturen kan dus niet, ook niet met twee
+workers; een verschoven deadline krijgt wel een nieuwe herinnering.
+"""
+from __future__ import annotations
+
+import heapq
+from collections import Counter
+from datetime import timedelta, timezone as dt_timezone
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models.core import Task
+from core.models.notifications import Notification
+from core.models.status import Status
+from core.services.notifications import notify_rows
+
+TITLES = {
+    "task_due_soon": "Taak verloopt binnenkort",
+    "task_overdue": "Taak is verlopen",
+}
+
+
+def _due_soon() -> timedelta:
+    return timedelta(hours=getattr(settings, "TASK_REMINDER_DUE_SOON_HOURS", 24))
+
+
+def done_status_keys() -> list:
+    """Keys van de taakstatussen die als afgerond gelden (TASK_DONE_STATUS_KEYS)."""
+    return getattr(settings, "TASK_DONE_STATUS_KEYS", ["done"])
+
+
+def _chunks(iterable, size: int):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def reminder_kind(kind: str, due_at) -> str:
+    """Notification.kind voor deze herinnering bij deze deadline (UTC, op de minuut)."""
+    return f"{kind}:{due_at.astimezone(dt_timezone.utc):%Y%m%d%H%M}"
+
+
+def open_tasks():
+    """
+    Niet-gearchiveerde taken zonder afgeronde status. Per status een gelijkheid (plus
+    IS NULL) zodat Postgres task_live_status_idx (status, due_at, id) per status kan gebruiken.
+    """
+    open_ids = list(Status.objects.filter(scope="task").exclude(key__in=done_status_keys()).values_list("id", flat=True))
+    return Task.objects.filter(Q(status__isnull=True) | Q(status_id__in=open_ids), is_archived=False)
+
+
+class ReminderScheduler:
+    """
+    Min-heap van (fire_at, task_id, soort, due_at, user_id) voor de herinneringen die
+    tussen nu - `catch_up` en nu + `window` af moeten gaan en nog niet verstuurd zijn.
+    Nieuwe of verschoven deadlines zitten er uiterlijk na `refresh` in; wat tussendoor
+    gearchiveerd, afgerond of verschoven is, valt bij het versturen af.
+    """
+
+    def __init__(self, *, due_soon: timedelta | None = None, window=timedelta(minutes=15),
+                 refresh=timedelta(minutes=1), catch_up=timedelta(hours=24), batch_size: int = 500):
+        self.offsets = {"task_due_soon": due_soon or _due_soon(), "task_overdue": timedelta(0)}
+        self.window = window
+        self.refresh = refresh
+        self.catch_up = catch_up
+        self.batch_size = batch_size
+        self.heap = []
+        self.next_load = None
+        self.stats = Counter()
+        self._ct_id = ContentType.objects.get_for_model(Task).id
+
+    # ---- heap vullen ----
+
+    def load(self, now) -> int:
+        events = []
+        for kind, offset in self.offsets.items():
+            # fire_at = due_at - offset valt in [now - catch_up, now + window)
+            qs = open_tasks().filter(
+                due_at__gte=now - self.catch_up + offset,
+                due_at__lt=now + self.window + offset,
+            )
+            if offset:
+                # al verlopen: dan alleen de "verlopen"-herinnering
+                qs = qs.filter(due_at__gt=now)
+            rows = list(qs.order_by("due_at", "id").values_list("id", "due_at", "assigned_to_id"))
+            for chunk in _chunks(rows, self.batch_size):
+                sent = self._already_sent(kind, chunk)
+                events.extend(
+                    (due_at - offset, task_id, kind, due_at, user_id)
+                    for task_id, due_at, user_id in chunk
+                    if (task_id, user_id, reminder_kind(kind, due_at)) not in sent
+                )
+        heapq.heapify(events)
+        self.heap = events
+        self.next_load = now + self.refresh
+        self.stats["loads"] += 1
+        return len(events)
+
+    def _already_sent(self, kind: str, chunk) -> set:
+        return set(
+            Notification.objects.filter(
+                content_type_id=self._ct_id,
+                object_id__in=[task_id for task_id, _, _ in chunk],
+                kind__in={reminder_kind(kind, due_at) for _, due_at, _ in chunk},
+            ).values_list("object_id", "user_id", "kind")
+        )
+
+    # ---- versturen ----
+
+    def tick(self, now=None) -> int:
+        """Verstuurt alles wat nu aan de beurt is. Geeft het aantal nieuwe notificaties terug."""
+        now = now or timezone.now()
+        if self.next_load is None or now >= self.next_load:
+            self.load(now)
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            due.append(heapq.heappop(self.heap))
+        return sum(self._send(chunk, now) for chunk in _chunks(due, self.batch_size))
+
+    def next_fire(self):
+        """Wanneer de volgende herinnering af gaat (None = niets in de heap)."""
+        return self.heap[0][0] if self.heap else None
+
+    @transaction.atomic
+    def _send(self, events, now) -> int:
+        # de stand van nu: gearchiveerd/afgerond/verschoven/andere assignee -> overslaan
+        current = {
+            task_id: (due_at, user_id)
+            for task_id, due_at, user_id in open_tasks()
+            .filter(id__in=[e[1] for e in events])
+            .values_list("id", "due_at", "assigned_to_id")
+        }
+        rows = []
+        for _, task_id, kind, due_at, user_id in events:
+            if current.get(task_id) != (due_at, user_id) or (kind == "task_due_soon" and due_at <= now):
+                self.stats["skipped"] += 1
+                continue
+            rows.append({
+                "user_id": user_id,
+                "content_type_id": self._ct_id,
+                "object_id": task_id,
+                "kind": reminder_kind(kind, due_at),
+                "title": TITLES[kind],
+                "body": f"Taak #{task_id}, deadline {timezone.localtime(due_at):%d-%m-%Y %H:%M}",
+                "url": reverse("tasks:detail", args=[task_id]),
+            })
+        sent = notify_rows(rows)
+        self.stats["sent"] += sent
+        return sent
@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import re
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_delete, post_save
+from django.urls import reverse
+
+from core.models.core import Signal, Task
+from core.models.notes import Note
+from core.models.people import Person
+from core.models.search import SearchEntry
+from core.services import reference
+from core.services.stemming import stem, tokenize
+
+# meer zoekwoorden dan dit negeren we (elk woord is een extra term in de query)
+MAX_TOKENS = 8
+
+TYPE_LABELS = {
+    "signal": "Melding",
+    "task": "Taak",
+    "person": "Persoon",
+    "note": "Notitie",
+}
+
+DETAIL_URLS = {
+    "signal": "signals:detail",
+    "task": "tasks:detail",
+    "person": "people:detail",
+}
+
+
+# -------------------------
+# Documenten per model
+# -------------------------
+
+def _object_url(model_name: str, object_id: int) -> str:
+    name = DETAIL_URLS.get(model_name)
+    return reverse(name, args=[object_id]) if name else ""
+
+
+def _work_item_doc(obj, type_names: dict) -> dict:
+    model_name = obj._meta.model_name
+    return {
+        "label": f"{TYPE_LABELS[model_name]} #{obj.pk}",
+        "title": type_names.get(obj.type_id, ""),
+        "body": obj.body,
+        "url": _object_url(model_name, obj.pk),
+        # assignee + status zodat de lijstzoekopdracht ("q") daar ook op vindt
+        "keywords": " ".join(filter(None, [
+            reference.user_map().get(obj.assigned_to_id, ""),
+            reference.status_map().get(obj.status_id, ""),
+        ])),
+    }
+
+
+def _signal_doc(signal: Signal) -> dict:
+    return _work_item_doc(signal, reference.signal_type_map())
+
+
+def _task_doc(task: Task) -> dict:
+    return _work_item_doc(task, reference.task_type_map())
+
+
+def _person_doc(person: Person) -> dict:
+    return {
+        "label": TYPE_LABELS["person"],
+        "title": f"{person.first_name} {person.last_name}",
+        "body": " · ".join(filter(None, [person.email, person.phone])),
+        "url": _object_url("person", person.pk),
+        # "jan.jansen@uni.nl" -> "jan jansen uni nl", "06-1234 5678" -> "0612345678"
+        "keywords": " ".join(filter(None, [
+            re.sub(r"[@._+\-]", " ", person.email or ""),
+            re.sub(r"\D", "", person.phone or ""),
+        ])),
+    }
+
+
+def _note_doc(note: Note) -> dict:
+    parent = ContentType.objects.get_for_id(note.content_type_id).model
+    return {
+        "label": f"Notitie bij {TYPE_LABELS.get(parent, parent).lower()} #{note.object_id}",
+        "title": "",
+        "body": note.body,
+        "url": _object_url(parent, note.object_id),
+        "keywords": "",
+    }
+
+
+DOCUMENTS = {
+    Signal: _signal_doc,
+    Task: _task_doc,
+    Person: _person_doc,
+    Note: _note_doc,
+}
+
+
+# -------------------------
+# Backends
+# -------------------------
+
+class PostgresBackend:
+    """tsvector-kolom `document` (gegenereerd, Nederlandse stemming + 'simple' voor prefixen) met GIN-index."""
+
+    needs_terms = False
+
+    def compile(self, tokens):
+        # per woord: de Nederlandse stam, of het woord als prefix (typen-terwijl-je-zoekt)
+        sql = " && ".join(["(to_tsquery('dutch', %s) || to_tsquery('simple', %s))"] * len(tokens))
+        params = [p for token in tokens for p in (token, f"{token}:*")]
+        return sql, params
+
+    def match_sql(self, query):
+        sql, params = query
+        return f"SELECT id FROM core_searchentry WHERE document @@ ({sql})", params
+
+    def ranked(self, query, ct_ids, limit):
+        sql, params = query
+        return (
+            f"SELECT e.id, ts_rank_cd(e.document, q.query) AS score "
+            f"FROM core_searchentry e, (SELECT {sql} AS query) q "
+            f"WHERE e.document @@ q.query AND e.content_type_id IN ({', '.join(['%s'] * len(ct_ids))}) "
+            f"ORDER BY score DESC, e.id DESC LIMIT %s",
+            [*params, *ct_ids, limit],
+        )
+
+
+class SqliteBackend:
+    """FTS5-tabel core_searchentry_fts (external content, via triggers) over de gestemde terms-kolommen."""
+
+    needs_terms = True
+
+    def compile(self, tokens):
+        parts = []
+        for token in tokens:
+            stemmed = stem(token)
+            parts.append(f'("{token}"* OR "{stemmed}")' if stemmed != token else f'"{token}"*')
+        return " AND ".join(parts)
+
+    def match_sql(self, query):
+        return "SELECT rowid FROM core_searchentry_fts WHERE core_searchentry_fts MATCH %s", [query]
+
+    def ranked(self, query, ct_ids, limit):
+        # bm25: lager = beter; titel telt 5x zo zwaar als de rest
+        return (
+            f"SELECT e.id, -bm25(core_searchentry_fts, 5.0, 1.0) AS score "
+            f"FROM core_searchentry_fts JOIN core_searchentry e ON e.id = core_searchentry_fts.rowid "
+            f"WHERE core_searchentry_fts MATCH %s AND e.content_type_id IN ({', '.join(['%s'] * len(ct_ids))}) "
+            f"ORDER BY score DESC, e.id DESC LIMIT %s",
+            [query, *ct_ids, limit],
+        )
+
+
+class LikeBackend:
+    """Zonder Postgres of FTS5: LIKE op de indextabel. Traag bij veel data, maar het werkt."""
+
+    needs_terms = False
+
+    def compile(self, tokens):
+        return tokens
+
+    def filter(self, tokens):
+        condition = Q()
+        for token in tokens:
+            condition &= Q(title__icontains=token) | Q(body__icontains=token) | Q(keywords__icontains=token)
+        return condition
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        if connection.vendor == "postgresql":
+            _backend = PostgresBackend()
+        elif connection.vendor == "sqlite" and "core_searchentry_fts" in connection.introspection.table_names():
+            _backend = SqliteBackend()
+        else:
+            _backend = LikeBackend()
+    return _backend
+
+
+def _terms(text: str) -> str:
+    """Voor FTS5: elk woord plus (als die anders is) zijn stam, zodat zowel prefix als stam matcht."""
+    out = []
+    for token in tokenize(text):
+        out.append(token)
+        stemmed = stem(token)
+        if stemmed != token:
+            out.append(stemmed)
+    return " ".join(out)
+
+
+# -------------------------
+# Indexeren
+# -------------------------
+
+def index_objects(objs, batch_size: int = 500) -> int:
+    """Zet objecten (zelfde of gemengde modellen) in de index; bestaande entries worden bijgewerkt."""
+    backend = get_backend()
+    entries = []
+    for obj in objs:
+        build = DOCUMENTS[obj.__class__]
+        doc = build(obj)
+        entry = SearchEntry(
+            content_type=ContentType.objects.get_for_model(obj.__class__),
+            object_id=obj.pk,
+            label=doc["label"][:100],
+            title=doc["title"][:200],
+            body=doc["body"] or "",
+            url=doc["url"],
+            keywords=doc["keywords"],
+        )
+        if backend.needs_terms:
+            entry.title_terms = _terms(entry.title)
+            entry.terms = _terms(f"{entry.body} {entry.keywords}")
+        entries.append(entry)
+
+    SearchEntry.objects.bulk_create(
+        entries,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["content_type", "object_id"],
+        update_fields=["label", "title", "body", "url", "keywords", "title_terms", "terms", "updated_at"],
+    )
+    return len(entries)
+
+
+def unindex(model, object_ids) -> int:
+    ct = ContentType.objects.get_for_model(model)
+    deleted, _ = SearchEntry.objects.filter(content_type=ct, object_id__in=list(object_ids)).delete()
+    return deleted
+
+
+def rebuild(chunk_size: int = 1000) -> int:
+    SearchEntry.objects.all().delete()
+    total = 0
+    for model in DOCUMENTS:
+        chunk = []
+        for obj in model.objects.order_by("pk").iterator(chunk_size=chunk_size):
+            chunk.append(obj)
+            if len(chunk) >= chunk_size:
+                total += index_objects(chunk)
+                chunk = []
+        if chunk:
+            total += index_objects(chunk)
+    return total
+
+
+# -------------------------
+# Zoeken
+# -------------------------
+
+def _tokens(q: str) -> list[str]:
+    return tokenize(q)[:MAX_TOKENS]
+
+
+def matching_ids(model, q: str):
+    """
+    Subquery met de pk's van `model` die op `q` matchen; voor de lijstviews:
+    `qs.filter(pk__in=matching_ids(Signal, q))`.
+    """
+    ct = ContentType.objects.get_for_model(model)
+    entries = SearchEntry.objects.filter(content_type=ct)
+    tokens = _tokens(q)
+    if not tokens:
+        return entries.none().values("object_id")
+
+    backend = get_backend()
+    query = backend.compile(tokens)
+    if isinstance(backend, LikeBackend):
+        entries = entries.filter(backend.filter(query))
+    else:
+        sql, params = backend.match_sql(query)
+        entries = entries.filter(id__in=RawSQL(sql, params))
+    return entries.values("object_id")
+
+
+def search(q: str, models=None, limit: int = 50) -> list[SearchEntry]:
+    """Zoekt over alle geïndexeerde modellen (of `models`); beste match eerst, met `entry.score`."""
+    tokens = _tokens(q)
+    if not tokens:
+        return []
+
+    models = models or list(DOCUMENTS)
+    ct_ids = [ct.id for ct in ContentType.objects.get_for_models(*models).values()]
+    backend = get_backend()
+    query = backend.compile(tokens)
+
+    if isinstance(backend, LikeBackend):
+        entries = list(
+            SearchEntry.objects.filter(content_type_id__in=ct_ids).filter(backend.filter(query))
+            .select_related("content_type").order_by("-updated_at")[:limit]
+        )
+        for entry in entries:
+            entry.score = 0.0
+        return entries
+
+    sql, params = backend.ranked(query, ct_ids, limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        ranked = cursor.fetchall()
+
+    by_id = SearchEntry.objects.select_related("content_type").in_bulk([pk for pk, _ in ranked])
+    results = []
+    for pk, score in ranked:
+        entry = by_id.get(pk)
+        if entry is not None:
+            entry.score = score
+            results.append(entry)
+    return results
+
+
+# -------------------------
+# Bijhouden via signals
+# -------------------------
+
+def _index_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_objects([instance])
+
+
+def _unindex_deleted(sender, instance, **kwargs):
+    unindex(sender, [instance.pk])
+
+
+def connect_signals():
+    for model in DOCUMENTS:
+        label = model._meta.label_lower
+        post_save.connect(_index_saved, sender=model, dispatch_uid=f"search-save-{label}")
+        post_delete.connect(_unindex_deleted, sender=model, dispatch_uid=f"search-delete-{label}")
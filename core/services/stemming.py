@@ -0,0 +1,169 @@
+"""
+Tokenizer + Nederlandse stemmer (Snowball "dutch") voor de SQLite-zoekindex.
+
+Postgres stemt zelf met to_tsvector('dutch', ...); SQLite FTS5 kent alleen een
+Engelse porter-stemmer, dus daar stemmen we in Python bij het indexeren en zoeken.
+Volgt het klassieke Snowball-algoritme, zodat beide backends dezelfde stammen geven.
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+
+VOWELS = set("aeiouyè")
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def fold(text: str) -> str:
+    """Kleine letters, accenten eraf (é -> e, ë -> e, ...)."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_RE.findall(fold(text or ""))
+
+
+def _is_vowel(ch: str) -> bool:
+    return ch in VOWELS
+
+
+def _prelude(word: str) -> str:
+    chars = list(word)
+    if chars and chars[0] == "y":
+        chars[0] = "Y"
+    for i in range(1, len(chars)):
+        if not _is_vowel(chars[i - 1]):
+            continue
+        if chars[i] == "y":
+            chars[i] = "Y"
+        elif chars[i] == "i" and i + 1 < len(chars) and _is_vowel(chars[i + 1]):
+            chars[i] = "I"
+    return "".join(chars)
+
+
+def _regions(word: str) -> tuple[int, int]:
+    def after_vowel_consonant(start):
+        i = start
+        while i < len(word) and not _is_vowel(word[i]):
+            i += 1
+        while i < len(word) and _is_vowel(word[i]):
+            i += 1
+        return min(i + 1, len(word)) if i < len(word) else len(word)
+
+    p1 = max(after_vowel_consonant(0), 3)
+    p2 = after_vowel_consonant(p1) if p1 < len(word) else len(word)
+    return p1, p2
+
+
+class _Stemmer:
+    def __init__(self, word: str):
+        self.word = _prelude(word)
+        self.p1, self.p2 = _regions(self.word)
+        self.e_found = False
+
+    # hulpjes: `pos` = begin van het achtervoegsel
+    def in_r1(self, pos):
+        return pos >= self.p1
+
+    def in_r2(self, pos):
+        return pos >= self.p2
+
+    def before(self, pos, n=1):
+        return self.word[max(pos - n, 0):pos]
+
+    def undouble(self):
+        if self.word.endswith(("kk", "dd", "tt")):
+            self.word = self.word[:-1]
+
+    def e_ending(self):
+        self.e_found = False
+        pos = len(self.word) - 1
+        if self.word.endswith("e") and self.in_r1(pos) and pos > 0 and not _is_vowel(self.word[pos - 1]):
+            self.word = self.word[:pos]
+            self.e_found = True
+            self.undouble()
+
+    def en_ending(self, pos):
+        prev = self.before(pos)
+        if self.in_r1(pos) and prev and not _is_vowel(prev) and self.before(pos, 3) != "gem":
+            self.word = self.word[:pos]
+            self.undouble()
+            return True
+        return False
+
+    def step1(self):
+        w = self.word
+        if w.endswith("heden"):
+            pos = len(w) - 5
+            if self.in_r1(pos):
+                self.word = w[:pos] + "heid"
+        elif w.endswith(("ene", "en")):
+            self.en_ending(len(w) - (3 if w.endswith("ene") else 2))
+        elif w.endswith(("se", "s")):
+            pos = len(w) - (2 if w.endswith("se") else 1)
+            prev = self.before(pos)
+            if self.in_r1(pos) and prev and not _is_vowel(prev) and prev != "j":
+                self.word = w[:pos]
+
+    def step3a(self):
+        w = self.word
+        pos = len(w) - 4
+        if w.endswith("heid") and self.in_r2(pos) and self.before(pos) != "c":
+            self.word = w[:pos]
+            if self.word.endswith("en"):
+                self.en_ending(len(self.word) - 2)
+
+    def step3b(self):
+        w = self.word
+        for suffix in ("lijk", "baar", "end", "ing", "bar", "ig"):
+            if w.endswith(suffix):
+                break
+        else:
+            return
+        pos = len(w) - len(suffix)
+        if suffix in ("end", "ing"):
+            if self.in_r2(pos):
+                self.word = w[:pos]
+                ig = len(self.word) - 2
+                if self.word.endswith("ig") and self.in_r2(ig) and self.before(ig) != "e":
+                    self.word = self.word[:ig]
+                else:
+                    self.undouble()
+        elif suffix == "ig":
+            if self.in_r2(pos) and self.before(pos) != "e":
+                self.word = w[:pos]
+        elif suffix == "lijk":
+            if self.in_r2(pos):
+                self.word = w[:pos]
+                self.e_ending()
+        elif suffix == "baar":
+            if self.in_r2(pos):
+                self.word = w[:pos]
+        elif suffix == "bar":
+            if self.in_r2(pos) and self.e_found:
+                self.word = w[:pos]
+
+    def step4(self):
+        w = self.word
+        if (
+            len(w) >= 4
+            and w[-3:-1] in ("aa", "ee", "oo", "uu")
+            and not _is_vowel(w[-1]) and w[-1] != "I"
+            and not _is_vowel(w[-4])
+        ):
+            self.word = w[:-2] + w[-1]
+
+    def run(self) -> str:
+        self.step1()
+        self.e_ending()
+        self.step3a()
+        self.step3b()
+        self.step4()
+        return self.word.replace("Y", "y").replace("I", "i")
+
+
+def stem(word: str) -> str:
+    if len(word) < 3 or not word.isalpha():
+        return word
+    return _Stemmer(word).run()
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import CharField, F, JSONField, TextField, Value
+
+from core.models.history import HistoryEvent
+from core.models.notes import Note
+
+User = get_user_model()
+
+
+def _timeline_qs(model, ct, object_id, **columns):
+    return (
+        model.objects
+        .filter(content_type=ct, object_id=object_id)
+        .order_by()
+        .annotate(
+            t_kind=Value(model._meta.model_name, output_field=CharField()),
+            t_id=F("id"),
+            t_created_at=F("created_at"),
+            **columns,
+        )
+        .values_list("t_kind", "t_id", "t_created_at", "t_user_id", "t_username", "t_body", "t_action", "t_changes")
+    )
+
+
+def get_timeline(obj, limit: int | None = None):
+    """
+    Notities + history van één object in één query (UNION ALL), beide via de
+    (content_type, object_id, -created_at) index. Geeft (notes, history) terug,
+    nieuwste eerst, met author/actor al ingevuld (alleen id + username).
+    """
+    ct = ContentType.objects.get_for_model(obj.__class__)
+
+    history_qs = _timeline_qs(
+        HistoryEvent, ct, obj.pk,
+        t_user_id=F("actor_id"),
+        t_username=F("actor__username"),
+        t_body=Value("", output_field=TextField()),
+        t_action=F("action"),
+        t_changes=F("changes"),
+    )
+    notes_qs = _timeline_qs(
+        Note, ct, obj.pk,
+        t_user_id=F("author_id"),
+        t_username=F("author__username"),
+        t_body=F("body"),
+        t_action=Value("", output_field=CharField()),
+        t_changes=Value(None, output_field=JSONField()),
+    )
+
+    rows = history_qs.union(notes_qs, all=True).order_by("-t_created_at", "-t_id")
+    if limit is not None:
+        rows = rows[:limit]
+
+    notes, history = [], []
+    for kind, pk, created_at, user_id, username, body, action, changes in rows:
+        user = User(id=user_id, username=username) if user_id else None
+        if kind == "note":
+            item = Note(id=pk, content_type=ct, object_id=obj.pk, author=user, body=body)
+            notes.append(item)
+        else:
+            item = HistoryEvent(id=pk, content_type=ct, object_id=obj.pk, actor=user, action=action, changes=changes or {})
+            history.append(item)
+        item.created_at = created_at
+
+    return notes, history
@@ -2,6 +2,7 @@ from django import forms
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from core.models import Signal, Note, SignalType, Status
+from core.services import reference
 
 User = get_user_model()
 
@@ -27,6 +28,15 @@ class SignalForm(forms.ModelForm):
             # ✅ dropdown label alleen de naam (niet "signal: ...")
             self.fields["status"].label_from_instance = lambda obj: obj.name
 
+            # keuzes uit de cache; queryset hierboven blijft voor validatie
+            current = self.instance.status_id if self.instance.pk else None
+            reference.set_cached_choices(
+                self.fields["status"],
+                reference.active_statuses("signal"),
+                label=lambda obj: obj.name,
+                extra=(current, reference.status_map().get(current)) if current else None,
+            )
+
         # Type queryset (met huidige value erbij)
         if "type" in self.fields:
             qs = SignalType.objects.filter(is_active=True).order_by("sort_order", "name")
@@ -38,8 +48,16 @@ class SignalForm(forms.ModelForm):
             self.fields["type"].queryset = qs.distinct()
             self.fields["type"].required = False
 
+            current = self.instance.type_id if self.instance.pk else None
+            reference.set_cached_choices(
+                self.fields["type"],
+                reference.active_signal_types(),
+                extra=(current, reference.signal_type_map().get(current)) if current else None,
+            )
+
         self.fields["assigned_to"].queryset = User.objects.filter(is_staff=True).order_by("username")
         self.fields["assigned_to"].required = False
+        reference.set_cached_choices(self.fields["assigned_to"], reference.staff_users(active_only=False))
 
         for name, field in self.fields.items():
             is_select = field.widget.__class__.__name__.lower().find("select") >= 0
@@ -1,53 +1,77 @@
 from __future__ import annotations
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
-from django.db import transaction
+from django.utils import timezone
 
-from core.models import HistoryEvent, Notification, Signal
+from core.models import HistoryEvent, Signal
+from core.services.history import record
+from core.services.jobs import enqueue_on_commit, job_handler
+from core.services.notifications import fan_out, notify_users
 
 User = get_user_model()
 
 
 def log_history(obj, actor, action: str, changes: dict | None = None):
-    HistoryEvent.objects.create(
+    """
+    Legt een HistoryEvent vast (met HistoryChange-rijen en facetten). Binnen
+    buffered_history() pas bij het einde van het blok, in één bulk_create; het event
+    heeft dan nog geen id.
+    """
+    # get_for_model komt na de eerste keer uit de ContentType-cache
+    return record(HistoryEvent(
         content_type=ContentType.objects.get_for_model(obj.__class__),
         object_id=obj.id,
         actor=actor if getattr(actor, "is_authenticated", False) else None,
         action=action,
         changes=changes or {},
-    )
+    ))
 
 
-@transaction.atomic
 def create_signal_notifications(signal: Signal, created_by):
     """
     Regels:
     - assigned_to gezet -> notificatie alleen voor die user
     - assigned_to leeg -> notificatie voor alle staff users
+    - active_from in de toekomst -> nu niets; dat doet manage.py activate_signals op de dag zelf
+
+    De fan-out zelf gebeurt na de commit in een achtergrondjob (manage.py run_jobs).
+    """
+    if signal.active_from > timezone.localdate():
+        return
+    enqueue_on_commit("signal_notifications", {
+        "signal_id": signal.id,
+        "created_by_id": getattr(created_by, "id", None),
+    })
+
+
+def notify_if_activated(signal: Signal, old_active_from, actor):
+    """
+    Na het verzetten van active_from: van ingepland naar vandaag of eerder -> de
+    notificaties nu (de dagelijkse ronde komt niet meer langs deze datum).
+    Andersom (weer ingepland) sturen we niets; op de nieuwe datum zijn de ontvangers
+    die de melding al kregen dubbelen en slaat de fan-out ze over.
     """
-    title = "Nieuwe melding"
-    body = (signal.body or "")[:4000]
-    url = f"/signals/{signal.id}/"
+    if old_active_from and old_active_from > timezone.localdate():
+        create_signal_notifications(signal, actor)
+
+
+@job_handler("signal_notifications")
+def deliver_signal_notifications(signal_id: int, created_by_id: int | None = None) -> int:
+    signal = Signal.objects.filter(pk=signal_id).first()
+    if signal is None:
+        return 0
+
+    message = {
+        "kind": "signal_created",
+        "title": "Nieuwe melding",
+        "body": (signal.body or "")[:4000],
+        "url": f"/signals/{signal.id}/",
+    }
 
     if signal.assigned_to_id:
-        Notification.objects.create(
-            user=signal.assigned_to,
-            content_object=signal,
-            title=title,
-            body=body,
-            url=url,
-        )
-        return
+        return notify_users(signal, [signal.assigned_to_id], **message)
 
-    staff_users = User.objects.filter(is_staff=True, is_active=True).exclude(id=getattr(created_by, "id", None))
-    Notification.objects.bulk_create([
-        Notification(
-            user=u,
-            content_object=signal,
-            title=title,
-            body=body,
-            url=url,
-        )
-        for u in staff_users
-    ])
\ No newline at end of file
+    staff_users = User.objects.filter(is_staff=True, is_active=True).exclude(id=created_by_id)
+    return fan_out(signal, staff_users, batch_size=settings.NOTIFICATION_BATCH_SIZE, **message)
@@ -6,6 +6,8 @@ app_name = "signals"
 urlpatterns = [
     path("", views.signal_list, name="list"),
     path("new/", views.signal_create, name="create"),
+    path("export/", views.signal_export, name="export"),
+    path("bulk/", views.signal_bulk, name="bulk"),
     path("<int:pk>/", views.signal_detail, name="detail"),
     path("<int:pk>/update/", views.signal_update, name="signal_update"),
     path("<int:pk>/status/", views.signal_set_status, name="set_status"),
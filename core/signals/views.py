@@ -2,26 +2,42 @@ from datetime import timedelta
 
 from django.contrib import messages
 from django.contrib.auth import get_user_model
-from django.core.paginator import Paginator
 from django.db import transaction
-from django.db.models import Q
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 from django.views.decorators.http import require_POST
 from django.utils.dateparse import parse_date
+from django.utils.http import url_has_allowed_host_and_scheme
 
 from core.auth import staff_required
+from core.pagination import KeysetPaginator
+from core.services import bulk, export, reference, search
+from core.services.history import attach_change_rows
+from core.services.timeline import get_timeline
 from core.models.notes import Note
 from core.models.status import Status
 from core.models.types import SignalType
 from core.models.core import Signal
 from .forms import SignalForm, NoteForm
-from .services import log_history, create_signal_notifications
+from .services import log_history, create_signal_notifications, notify_if_activated
 
 User = get_user_model()
 
-@staff_required
-def signal_list(request):
+# kolommen van de export (kop -> lookup)
+EXPORT_COLUMNS = {
+    "id": "id",
+    "type": "type__name",
+    "status": "status__name",
+    "assigned_to": "assigned_to__username",
+    "active_from": "active_from",
+    "body": "body",
+    "is_archived": "is_archived",
+    "created_at": "created_at",
+}
+
+
+def _filtered_signals(request):
+    """Queryset + filterwaarden van de lijst; gedeeld door signal_list en signal_export."""
     qs = Signal.objects.select_related("type", "status", "assigned_to")
 
     # filters
@@ -30,9 +46,13 @@ def signal_list(request):
     type_id = (request.GET.get("type") or "").strip()
     assignee_id = (request.GET.get("assignee") or "").strip()
     show_archived = request.GET.get("archived") == "1"
+    show_scheduled = request.GET.get("scheduled") == "1"
 
     if not show_archived:
         qs = qs.filter(is_archived=False)
+    # ingeplande meldingen (active_from in de toekomst) pas op de dag zelf
+    if not show_scheduled:
+        qs = qs.filter(active_from__lte=timezone.localdate())
 
     if assignee_id == "unassigned":
         qs = qs.filter(assigned_to__isnull=True)
@@ -45,10 +65,7 @@ def signal_list(request):
         qs = qs.filter(type_id=int(type_id))
 
     if q:
-        qs = qs.filter(
-            Q(body__icontains=q) |
-            Q(assigned_to__username__icontains=q)
-        )
+        qs = qs.filter(pk__in=search.matching_ids(Signal, q))
 
     SORT_MAP = {
         "active_from": "active_from",
@@ -65,35 +82,52 @@ def signal_list(request):
 
     sort_field = SORT_MAP.get(sort, "active_from")
     prefix = "-" if dir_ == "desc" else ""
+    ordering = [f"{prefix}{sort_field}", "-active_from", "-created_at", "-id"]
+
+    return qs, ordering, {
+        "q": q,
+        "status_id": status_id,
+        "type_id": type_id,
+        "assignee_id": assignee_id,
+        "show_archived": show_archived,
+        "show_scheduled": show_scheduled,
+        "sort": sort,
+        "dir": dir_,
+    }
 
-    qs = qs.order_by(f"{prefix}{sort_field}", "-active_from", "-created_at")
 
-    paginator = Paginator(qs, 25)
-    page_obj = paginator.get_page(request.GET.get("page"))
+@staff_required
+def signal_list(request):
+    qs, ordering, filters = _filtered_signals(request)
 
-    statuses = Status.objects.filter(is_active=True).order_by("sort_order", "name")
-    types = SignalType.objects.filter(is_active=True).order_by("sort_order", "name")
+    paginator = KeysetPaginator(qs, 25, ordering)
+    page_obj = paginator.get_page(request.GET.get("cursor"))
 
-    assignees = User.objects.filter(is_staff=True, is_active=True).order_by("username")
+    statuses = reference.active_statuses()
+    types = reference.active_signal_types()
+    assignees = reference.staff_users()
 
 
     return render(request, "core/signals/list.html", {
         "page_obj": page_obj,
         "signals": page_obj.object_list,
-        "q": q,
-        "status_id": status_id,
-        "type_id": type_id,
-        "assignee_id": assignee_id,
+        **filters,
         "assignees": assignees,
-        "show_archived": show_archived,
         "statuses": statuses,
         "types": types,
-        "sort": sort,  
-        "dir": dir_,   
+        "bulk_actions": bulk.ACTIONS,
+        "bulk_statuses": reference.active_statuses("signal"),
+        "today": timezone.localdate(),
         "active_nav": "signals",
     })
 
 
+@staff_required
+def signal_export(request):
+    qs, ordering, _ = _filtered_signals(request)
+    return export.export_response(KeysetPaginator(qs, 25, ordering).ordered(), EXPORT_COLUMNS, "meldingen", request.GET.get("format", "csv"))
+
+
 @staff_required
 @transaction.atomic
 def signal_create(request):
@@ -126,16 +160,11 @@ def signal_detail(request, pk: int):
     form = SignalForm(instance=signal)
     note_form = NoteForm()
 
-    statuses = Status.objects.filter(is_active=True).order_by("sort_order", "name")
-    types = SignalType.objects.filter(is_active=True).order_by("sort_order", "name")
-    assignees = User.objects.filter(is_staff=True, is_active=True).order_by("username")
-
-    notes = signal.notes.select_related("author").all()
-    history = signal.history.select_related("actor").all()
+    statuses = reference.active_statuses()
+    types = reference.active_signal_types()
+    assignees = reference.staff_users()
 
-    status_map = {s.id: s.name for s in Status.objects.all()}
-    type_map = {t.id: t.name for t in SignalType.objects.all()}
-    user_map = {u.id: u.username for u in User.objects.all()}
+    notes, history = get_timeline(signal)
 
     ACTION_LABELS = {
         "created": "Melding aangemaakt",
@@ -148,6 +177,7 @@ def signal_detail(request, pk: int):
         "note_added": "Notitie toegevoegd",
     }
 
+    attach_change_rows(history, "signal")
     for h in history:
         h.action_label = ACTION_LABELS.get(h.action, h.action.replace("_", " ").capitalize())
 
@@ -161,9 +191,6 @@ def signal_detail(request, pk: int):
         "notes": notes,
         "history": history,
         "active_nav": "signals",
-        "status_map": status_map,
-        "type_map": type_map,
-        "user_map": user_map,
     })
 
 
@@ -175,6 +202,7 @@ def signal_update(request, pk: int):
     if request.method != "POST":
         return redirect("signals:detail", pk=signal.pk)
 
+    old_active_from = signal.active_from
     before = {
         "type_id": signal.type_id,
         "assigned_to_id": signal.assigned_to_id,
@@ -204,11 +232,11 @@ def signal_update(request, pk: int):
 
         # opnieuw alles laden wat je detail template verwacht
         note_form = NoteForm()
-        statuses = Status.objects.filter(is_active=True).order_by("sort_order", "name")
-        types = SignalType.objects.filter(is_active=True).order_by("sort_order", "name")
-        assignees = User.objects.filter(is_staff=True, is_active=True).order_by("username")
-        notes = signal.notes.select_related("author").all()
-        history = signal.history.select_related("actor").all()
+        statuses = reference.active_statuses()
+        types = reference.active_signal_types()
+        assignees = reference.staff_users()
+        notes, history = get_timeline(signal)
+        attach_change_rows(history, "signal")
 
         return render(request, "core/signals/detail.html", {
             "signal": signal,
@@ -237,6 +265,7 @@ def signal_update(request, pk: int):
 
     if changes:
         log_history(signal, request.user, "updated", changes)
+        notify_if_activated(signal, old_active_from, request.user)
         messages.success(request, "Melding bijgewerkt.")
 
     return redirect("signals:detail", pk=signal.pk)
@@ -317,11 +346,13 @@ def signal_set_active_from(request, pk: int):
         messages.error(request, "Ongeldige datum.")
         return redirect("signals:detail", pk=signal.pk)
 
-    old = signal.active_from.isoformat() if signal.active_from else None
+    old_date = signal.active_from
+    old = old_date.isoformat() if old_date else None
     if signal.active_from != new_date:
         signal.active_from = new_date
         signal.save(update_fields=["active_from"])
         log_history(signal, request.user, "active_from_changed", {"active_from": [old, new_date.isoformat()]})
+        notify_if_activated(signal, old_date, request.user)
         messages.success(request, "Actief vanaf bijgewerkt.")
 
     return redirect("signals:detail", pk=signal.pk)
@@ -362,4 +393,25 @@ def signal_toggle_archive(request, pk: int):
     signal.save(update_fields=["is_archived"])
     log_history(signal, request.user, "archived_toggled", {"is_archived": [old, signal.is_archived]})
     messages.success(request, "Archiefstatus bijgewerkt.")
-    return redirect("signals:detail", pk=signal.pk)
\ No newline at end of file
+    return redirect("signals:detail", pk=signal.pk)
+
+
+@staff_required
+@require_POST
+def signal_bulk(request):
+    try:
+        ids = bulk.parse_ids(request.POST.getlist("ids"))
+        updated = bulk.apply(
+            Signal, ids, request.user, request.POST.get("action", ""),
+            status_id=(request.POST.get("status_id") or "").strip(),
+            assigned_to=(request.POST.get("assigned_to") or "").strip(),
+        )
+    except ValueError as e:
+        messages.error(request, str(e))
+    else:
+        messages.success(request, f"{updated} van {len(ids)} meldingen bijgewerkt.")
+
+    next_url = request.POST.get("next")
+    if not url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()}, require_https=request.is_secure()):
+        next_url = "signals:list"
+    return redirect(next_url)
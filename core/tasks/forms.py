@@ -3,6 +3,7 @@ from django.contrib.auth import get_user_model
 from django.utils import timezone
 
 from core.models import Task, Status, TaskType
+from core.services import reference
 
 User = get_user_model()
 
@@ -45,11 +46,21 @@ class TaskForm(forms.ModelForm):
             self.fields["status"].queryset = qs.distinct()
             self.fields["status"].required = False  # status mag null
 
+            # keuzes uit de cache; queryset hierboven blijft voor validatie
+            current = self.instance.status_id if self.instance.pk else None
+            reference.set_cached_choices(
+                self.fields["status"],
+                reference.active_statuses("task"),
+                extra=(current, reference.status_map().get(current)) if current else None,
+            )
+
         # Alleen types voor tasks (als TaskType ook scope heeft, filter scope="task")
         if "type" in self.fields:
             self.fields["type"].queryset = TaskType.objects.filter(is_active=True).order_by("sort_order", "name")
+            reference.set_cached_choices(self.fields["type"], reference.active_task_types())
 
         # Assigned_to is verplicht in jouw model -> required True (default)
         if "assigned_to" in self.fields:
             self.fields["assigned_to"].queryset = User.objects.filter(is_staff=True, is_active=True).order_by("username")
-            self.fields["assigned_to"].required = True
\ No newline at end of file
+            self.fields["assigned_to"].required = True
+            reference.set_cached_choices(self.fields["assigned_to"], reference.staff_users())
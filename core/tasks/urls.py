@@ -6,6 +6,8 @@ app_name = "tasks"
 urlpatterns = [
     path("", views.task_list, name="list"),
     path("new/", views.task_create, name="create"),
+    path("export/", views.task_export, name="export"),
+    path("bulk/", views.task_bulk, name="bulk"),
     path("<int:pk>/", views.task_detail, name="detail"),
     path("<int:pk>/update/", views.task_update, name="update"),
     path("<int:pk>/note/", views.task_add_note, name="add_note"),
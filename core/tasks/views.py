@@ -1,21 +1,37 @@
 from django.contrib import messages
 from django.contrib.auth import get_user_model
-from django.core.paginator import Paginator
 from django.db import transaction
-from django.db.models import Q
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils.http import url_has_allowed_host_and_scheme
 from django.views.decorators.http import require_POST
 
 from core.auth import staff_required
-from core.models import Task, Note, Status, TaskType
+from core.pagination import KeysetPaginator
+from core.services import bulk, export, reference, search
+from core.services.history import attach_change_rows
+from core.services.timeline import get_timeline
+from core.models import Task, Note
 from .forms import TaskForm
 from core.signals.services import log_history
 
 User = get_user_model()
 
 
-@staff_required
-def task_list(request):
+# kolommen van de export (kop -> lookup)
+EXPORT_COLUMNS = {
+    "id": "id",
+    "type": "type__name",
+    "status": "status__name",
+    "assigned_to": "assigned_to__username",
+    "due_at": "due_at",
+    "body": "body",
+    "is_archived": "is_archived",
+    "created_at": "created_at",
+}
+
+
+def _filtered_tasks(request):
+    """Queryset + filterwaarden van de lijst; gedeeld door task_list en task_export."""
     qs = Task.objects.select_related("type", "status", "assigned_to")
 
     # filters
@@ -37,10 +53,7 @@ def task_list(request):
         qs = qs.filter(type_id=int(type_id))
 
     if q:
-        qs = qs.filter(
-            Q(body__icontains=q) |
-            Q(assigned_to__username__icontains=q)
-        )
+        qs = qs.filter(pk__in=search.matching_ids(Task, q))
 
     SORT_MAP = {
         "due_at": "due_at",
@@ -57,13 +70,28 @@ def task_list(request):
 
     sort_field = SORT_MAP.get(sort, "due_at")
     prefix = "-" if dir_ == "desc" else ""
-    qs = qs.order_by(f"{prefix}{sort_field}", "id")
+    ordering = [f"{prefix}{sort_field}", "id"]
+
+    return qs, ordering, {
+        "q": q,
+        "status_id": status_id,
+        "type_id": type_id,
+        "assignee_id": assignee_id,
+        "show_archived": show_archived,
+        "sort": sort,
+        "dir": dir_,
+    }
+
+
+@staff_required
+def task_list(request):
+    qs, ordering, filters = _filtered_tasks(request)
 
-    paginator = Paginator(qs, 25)
-    page_obj = paginator.get_page(request.GET.get("page"))
+    paginator = KeysetPaginator(qs, 25, ordering)
+    page_obj = paginator.get_page(request.GET.get("cursor"))
 
-    statuses = Status.objects.filter(scope="task", is_active=True).order_by("sort_order", "name")
-    types = TaskType.objects.filter(is_active=True).order_by("sort_order", "name")
+    statuses = reference.active_statuses("task")
+    types = reference.active_task_types()
 
     # assignees: alle users die minimaal 1 task hebben
     assignees = (
@@ -76,20 +104,22 @@ def task_list(request):
     return render(request, "core/tasks/list.html", {
         "page_obj": page_obj,
         "tasks": page_obj.object_list,
-        "q": q,
-        "status_id": status_id,
-        "type_id": type_id,
-        "assignee_id": assignee_id,
+        **filters,
         "assignees": assignees,
-        "show_archived": show_archived,
         "statuses": statuses,
         "types": types,
-        "sort": sort,
-        "dir": dir_,
+        "bulk_actions": bulk.ACTIONS,
+        "bulk_assignees": reference.staff_users(),
         "active_nav": "tasks",
     })
 
 
+@staff_required
+def task_export(request):
+    qs, ordering, _ = _filtered_tasks(request)
+    return export.export_response(KeysetPaginator(qs, 25, ordering).ordered(), EXPORT_COLUMNS, "taken", request.GET.get("format", "csv"))
+
+
 @staff_required
 @transaction.atomic
 def task_create(request):
@@ -115,8 +145,7 @@ def task_detail(request, pk: int):
     task = get_object_or_404(Task.objects.select_related("type", "status", "assigned_to"), pk=pk)
     form = TaskForm(instance=task)
 
-    notes = task.notes.select_related("author").all().order_by("-created_at")
-    history = task.history.select_related("actor").all().order_by("-created_at")
+    notes, history = get_timeline(task)
 
     ACTION_LABELS = {
         "created": "Task aangemaakt",
@@ -124,6 +153,7 @@ def task_detail(request, pk: int):
         "archived_toggled": "Archiefstatus gewijzigd",
         "note_added": "Notitie toegevoegd",
     }
+    attach_change_rows(history, "task")
     for h in history:
         h.action_label = ACTION_LABELS.get(h.action, h.action.replace("_", " ").capitalize())
 
@@ -204,4 +234,25 @@ def task_toggle_archive(request, pk: int):
     task.save(update_fields=["is_archived"])
     log_history(task, request.user, "archived_toggled", {"is_archived": [old, task.is_archived]})
     messages.success(request, "Archiefstatus bijgewerkt.")
-    return redirect("tasks:detail", pk=task.pk)
\ No newline at end of file
+    return redirect("tasks:detail", pk=task.pk)
+
+
+@staff_required
+@require_POST
+def task_bulk(request):
+    try:
+        ids = bulk.parse_ids(request.POST.getlist("ids"))
+        updated = bulk.apply(
+            Task, ids, request.user, request.POST.get("action", ""),
+            status_id=(request.POST.get("status_id") or "").strip(),
+            assigned_to=(request.POST.get("assigned_to") or "").strip(),
+        )
+    except ValueError as e:
+        messages.error(request, str(e))
+    else:
+        messages.success(request, f"{updated} van {len(ids)} taken bijgewerkt.")
+
+    next_url = request.POST.get("next")
+    if not url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()}, require_https=request.is_secure()):
+        next_url = "tasks:list"
+    return redirect(next_url)
@@ -1,3 +1,1601 @@
-from django.test import TestCase
+import asyncio
+import csv
+import gzip
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock, skipIf
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, reverse
+from django.utils import timezone
+
+from core.models import DashboardStatDelta, HistoryArchive, HistoryChange, HistoryEvent, HistoryFacet, Job, Note, Notification, NotificationCounter, Person, Signal, SignalType, Status, Task, TaskType
+from core.pagination import KeysetPaginator
+from core.services import archive, bulk, dashboard, imports, jobs, reference, search
+from core.services.pubsub import broker
+from core.services.querybudget import QueryRecorder, shape
+from core.services.stemming import stem
+from core.services.fakedata import FakeData, IdPool
+from core.services.fuzzy import fuzzy_people
+from core.services.activation import activate_signals
+from core.services.inbox import inbox
+from core.services.reminders import ReminderScheduler, reminder_kind
+from core.services.history import attach_change_rows, buffered_history, facets, filter_by_change, flush_sizes, rebuild_facets
+from core.services.normalize import fold_name, normalize_phone
+from core.services.notifications import fan_out, mark_all_read, notify_users, rebuild_unread_counts, unread_count
+from core.services.timeline import get_timeline
+from core.signals.forms import SignalForm
+from core.signals.services import deliver_signal_notifications, log_history
+from core.urls import urlpatterns as core_urlpatterns
+from core.tasks.forms import TaskForm
+
+User = get_user_model()
+
+
+class ListQueryPlanTests(TestCase):
+    """
+    Elke variant van signal_list/task_list (filter + SORT_MAP-kolom) moet de hoofdtabel
+    via een index lezen, niet via een volledige tabelscan.
+
+    Uitzondering: archief tonen + sorteren op een naam uit een gekoppelde tabel
+    (type/status/assignee). Dan moet elke rij gesorteerd worden op een kolom buiten
+    de tabel; geen index op core_signal/core_task kan die volgorde leveren.
+    """
+
+    JOINED_SORTS = {"type", "status", "assigned_to"}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("staff", password="pw", is_staff=True)
+        cls.signal_status = Status.objects.create(key="open", name="Open", scope="signal")
+        cls.task_status = Status.objects.create(key="todo", name="Te doen", scope="task")
+        cls.signal_type = SignalType.objects.create(name="Algemeen")
+        cls.task_type = TaskType.objects.create(name="Opvolgen")
+        for i in range(3):
+            Signal.objects.create(type=cls.signal_type, status=cls.signal_status, body=f"melding {i}")
+            Signal.objects.create(type=cls.signal_type, assigned_to=cls.user, body=f"toegewezen {i}")
+            Task.objects.create(type=cls.task_type, status=cls.task_status, assigned_to=cls.user, body=f"taak {i}")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def _list_query(self, url, params, table):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        sqls = [
+            q["sql"] for q in ctx.captured_queries
+            if f'FROM "{table}"' in q["sql"] and "ORDER BY" in q["sql"] and "LIMIT" in q["sql"]
+        ]
+        self.assertEqual(len(sqls), 1, sqls)
+        return sqls[0]
+
+    def _plan(self, sql):
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                # kleine testtabellen: forceer de planner om indexen te overwegen
+                cursor.execute("SET LOCAL enable_seqscan = off")
+                cursor.execute("EXPLAIN " + sql)
+                return [row[0] for row in cursor.fetchall()]
+            cursor.execute("EXPLAIN QUERY PLAN " + sql)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assertIndexScan(self, sql, table):
+        plan = self._plan(sql)
+        table_re = re.compile(rf"\b{table}\b")
+        self.assertTrue([line for line in plan if table_re.search(line)], plan)
+        if connection.vendor == "postgresql":
+            full_scans = [line for line in plan if f"Seq Scan on {table}" in line]
+        else:
+            full_scans = [line for line in plan if line.strip() == f"SCAN {table}"]
+        self.assertFalse(full_scans, plan)
+
+    def _variants(self, sorts, filters):
+        for sort in sorts:
+            for dir_ in ("asc", "desc"):
+                for extra in filters:
+                    yield {"sort": sort, "dir": dir_, **extra}
+
+    def test_signal_list_uses_indexes(self):
+        filters = [
+            {},
+            {"status": self.signal_status.id},
+            {"type": self.signal_type.id},
+            {"assignee": self.user.id},
+            {"archived": "1"},
+        ]
+        sorts = ["active_from", "type", "status", "assigned_to", "created_at"]
+        for params in self._variants(sorts, filters):
+            if params.get("archived") and params["sort"] in self.JOINED_SORTS:
+                continue
+            with self.subTest(**params):
+                sql = self._list_query(reverse("signals:list"), params, "core_signal")
+                self.assertIndexScan(sql, "core_signal")
+
+    def test_task_list_uses_indexes(self):
+        filters = [
+            {},
+            {"status": self.task_status.id},
+            {"type": self.task_type.id},
+            {"assignee": self.user.id},
+            {"archived": "1"},
+        ]
+        sorts = ["due_at", "type", "status", "assigned_to", "created_at"]
+        for params in self._variants(sorts, filters):
+            if params.get("archived") and params["sort"] in self.JOINED_SORTS:
+                continue
+            with self.subTest(**params):
+                sql = self._list_query(reverse("tasks:list"), params, "core_task")
+                self.assertIndexScan(sql, "core_task")
+
+
+class KeysetPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [User.objects.create_user(f"user{i}", is_staff=True) for i in range(3)]
+        cls.statuses = [Status.objects.create(key=f"s{i}", name=f"Status {i}", scope="task") for i in range(2)]
+        task_type = TaskType.objects.create(name="Opvolgen")
+        now = timezone.now()
+        for i in range(23):
+            Task.objects.create(
+                type=task_type,
+                assigned_to=cls.users[i % 3],
+                # dubbele en lege due_at waarden om tie-breakers en NULLs te raken
+                due_at=None if i % 5 == 0 else now + timedelta(days=i % 4),
+                status=None if i % 4 == 0 else cls.statuses[i % 2],
+                body=f"taak {i}",
+            )
+
+    def _walk(self, paginator):
+        pages = []
+        page = paginator.get_page(None)
+        pages.append([t.id for t in page])
+        while page.has_next:
+            page = paginator.get_page(page.next_cursor)
+            pages.append([t.id for t in page])
+
+        backwards = [[t.id for t in page]]
+        while page.has_previous:
+            page = paginator.get_page(page.previous_cursor)
+            backwards.insert(0, [t.id for t in page])
+        return pages, backwards
+
+    def test_walks_every_row_once_in_both_directions(self):
+        qs = Task.objects.select_related("status", "assigned_to")
+        for ordering in (["due_at", "id"], ["-due_at", "id"], ["status__name", "id"],
+                         ["-status__name", "id"], ["-assigned_to__username"], ["created_at"]):
+            with self.subTest(ordering=ordering):
+                paginator = KeysetPaginator(qs, 4, ordering)
+                expected = list(qs.order_by(*paginator._order_by(False)).values_list("id", flat=True))
+                pages, backwards = self._walk(paginator)
+                self.assertEqual([pk for page in pages for pk in page], expected)
+                self.assertEqual(backwards, pages)
+
+    def test_invalid_or_foreign_cursor_falls_back_to_first_page(self):
+        qs = Task.objects.all()
+        paginator = KeysetPaginator(qs, 5, ["due_at"])
+        first = [t.id for t in paginator.get_page(None)]
+        other_cursor = KeysetPaginator(qs, 5, ["-created_at"]).get_page(None).next_cursor
+
+        for cursor in ("garbage", other_cursor):
+            with self.subTest(cursor=cursor):
+                self.assertEqual([t.id for t in paginator.get_page(cursor)], first)
+
+    @skipIf(connection.vendor == "postgresql", "Postgres geeft een planner-schatting")
+    def test_approx_total(self):
+        paginator = KeysetPaginator(Task.objects.all(), 5, ["due_at"])
+        self.assertEqual(paginator.approx_total, 23)
+        self.assertFalse(paginator.approx_total_capped)
+
+
+class TimelineTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("staff", is_staff=True)
+        cls.person = Person.objects.create(first_name="Sanne", last_name="de Vries")
+        other = Person.objects.create(first_name="Ander", last_name="Persoon")
+        for obj in (cls.person, other):
+            Note.objects.create(content_object=obj, author=cls.user, body=f"notitie {obj.pk}")
+            HistoryEvent.objects.create(content_object=obj, actor=cls.user, action="updated", changes={"phone": ["1", "2"]})
+            HistoryEvent.objects.create(content_object=obj, actor=None, action="created")
+
+    def test_notes_and_history_in_one_query(self):
+        get_timeline(self.person)  # ContentType-cache opwarmen
+        with self.assertNumQueries(1):
+            notes, history = get_timeline(self.person)
+
+            self.assertEqual([n.body for n in notes], [f"notitie {self.person.pk}"])
+            self.assertEqual(notes[0].author.username, "staff")
+            self.assertEqual([h.action for h in history], ["created", "updated"])
+            self.assertIsNone(history[0].actor)
+            self.assertEqual(history[1].changes, {"phone": ["1", "2"]})
+            self.assertEqual(history[1].actor.username, "staff")
+
+
+class ReferenceCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("staff", is_staff=True)
+        cls.status = Status.objects.create(key="open", name="Open", scope="signal")
+        cls.task_status = Status.objects.create(key="todo", name="Te doen", scope="task")
+        cls.signal_type = SignalType.objects.create(name="Algemeen")
+        cls.task_type = TaskType.objects.create(name="Opvolgen")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_maps_are_cached(self):
+        with self.assertNumQueries(4):
+            reference.status_map()
+            reference.signal_type_map()
+            reference.task_type_map()
+            reference.user_map()
+        with self.assertNumQueries(0):
+            self.assertEqual(reference.status_map()[self.status.id], "Open")
+            self.assertEqual(reference.user_map()[self.user.id], "staff")
+
+    def test_save_and_delete_invalidate(self):
+        reference.status_map()
+        self.status.name = "Nieuw"
+        self.status.save()
+        self.assertEqual(reference.status_map()[self.status.id], "Nieuw")
+
+        reference.active_signal_types()
+        extra = SignalType.objects.create(name="Contract")
+        self.assertIn(extra, reference.active_signal_types())
+        extra.delete()
+        self.assertNotIn("Contract", [t.name for t in reference.active_signal_types()])
+
+        other = User.objects.create_user("other", is_staff=True)
+        self.assertIn(other.id, reference.user_map())
+
+    def test_login_does_not_flush_users(self):
+        reference.user_map()
+        self.client.force_login(self.user)
+        with self.assertNumQueries(0):
+            reference.user_map()
+
+    def test_forms_render_choices_from_cache(self):
+        signal = Signal.objects.create(type=self.signal_type, status=self.status, body="x")
+        task = Task.objects.create(type=self.task_type, assigned_to=self.user)
+        SignalForm(instance=signal).as_p()
+        TaskForm(instance=task).as_p()
+
+        with self.assertNumQueries(0):
+            html = SignalForm(instance=signal).as_p() + TaskForm(instance=task).as_p()
+        self.assertIn("Open", html)
+        self.assertIn("Opvolgen", html)
+
+    def test_inactive_current_status_stays_selectable(self):
+        self.status.is_active = False
+        self.status.save()
+        signal = Signal.objects.create(type=self.signal_type, status=self.status, body="x")
+
+        choices = dict(SignalForm(instance=signal).fields["status"].choices)
+        self.assertEqual(choices[self.status.id], "Open")
+        form = SignalForm({"type": self.signal_type.id, "status": self.status.id, "active_from": "2026-01-01",
+                           "assigned_to": "", "body": "x"}, instance=signal)
+        self.assertTrue(form.is_valid(), form.errors)
+
+
+class HistoryChangeRowsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("staff", is_staff=True)
+        cls.other = User.objects.create_user("other", is_staff=True)
+        for i in range(20):
+            User.objects.create_user(f"niet-gebruikt-{i}")
+        cls.open = Status.objects.create(key="open", name="Open", scope="signal")
+        cls.done = Status.objects.create(key="done", name="Afgerond", scope="signal")
+        cls.signal_type = SignalType.objects.create(name="Algemeen")
+        cls.task_type = TaskType.objects.create(name="Opvolgen")
+        cls.signal = Signal.objects.create(type=cls.signal_type, body="x")
+        cls.task = Task.objects.create(type=cls.task_type, assigned_to=cls.user)
+
+    def test_resolves_only_referenced_ids_with_one_query_per_model(self):
+        events = [
+            HistoryEvent(content_object=self.signal, action="status_changed", changes={"status_id": [None, self.open.id]}),
+            HistoryEvent(content_object=self.signal, action="updated", changes={
+                "status_id": [self.open.id, self.done.id],
+                "assigned_to_id": [self.user.id, self.other.id],
+                "body": ["oud", "nieuw"],
+            }),
+            HistoryEvent(content_object=self.task, action="updated", changes={"type_id": [self.task_type.id, 999]}),
+        ]
+
+        # Status, User, TaskType
+        with self.assertNumQueries(3):
+            attach_change_rows(events)
+
+        self.assertEqual(events[0].change_rows, [{"field": "status_id", "old": None, "new": "Open"}])
+        self.assertEqual(events[1].change_rows, [
+            {"field": "status_id", "old": "Open", "new": "Afgerond"},
+            {"field": "assigned_to_id", "old": "staff", "new": "other"},
+            {"field": "body", "old": "oud", "new": "nieuw"},
+        ])
+        self.assertEqual(events[2].change_rows, [{"field": "type_id", "old": "Opvolgen", "new": None}])
+
+    def test_no_references_no_queries(self):
+        events = [HistoryEvent(content_object=self.signal, action="archived_toggled", changes={"is_archived": [False, True]})]
+        with self.assertNumQueries(0):
+            attach_change_rows(events, "signal")
+        self.assertEqual(events[0].change_rows, [{"field": "is_archived", "old": False, "new": True}])
+
+
+class HistoryChangeFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("staff", is_staff=True)
+        cls.open = Status.objects.create(key="open", name="Open", scope="signal")
+        cls.done = Status.objects.create(key="done", name="Afgerond", scope="signal")
+        signal_type = SignalType.objects.create(name="Algemeen")
+        cls.signal = Signal.objects.create(type=signal_type, body="x")
+        cls.to_open = log_history(cls.signal, cls.user, "status_changed", {"status_id": [None, cls.open.id]})
+        cls.to_done = log_history(cls.signal, cls.user, "status_changed", {"status_id": [cls.open.id, cls.done.id]})
+        cls.archived = log_history(cls.signal, cls.user, "archived_toggled", {"is_archived": [False, True]})
+
+    def setUp(self):
+        cache.clear()
+
+    def filtered(self, field, old="", new=""):
+        return set(filter_by_change(HistoryEvent.objects.all(), field, old=old, new=new))
+
+    def test_log_history_writes_one_row_per_field(self):
+        self.assertEqual(
+            list(self.to_done.field_changes.values_list("field", "old_value", "new_value")),
+            [("status_id", str(self.open.id), str(self.done.id))],
+        )
+        self.assertEqual(
+            list(self.archived.field_changes.values_list("old_value", "new_value")),
+            [("false", "true")],
+        )
+
+    def test_filters_on_field_old_and_new_value(self):
+        self.assertEqual(self.filtered("status_id"), {self.to_open, self.to_done})
+        self.assertEqual(self.filtered("status_id", new=str(self.done.id)), {self.to_done})
+        self.assertEqual(self.filtered("status_id", old="leeg"), {self.to_open})
+        self.assertEqual(self.filtered("is_archived", new="true"), {self.archived})
+
+    def test_reference_fields_accept_labels(self):
+        self.assertEqual(self.filtered("status_id", old="open", new="Afgerond"), {self.to_done})
+        self.assertEqual(self.filtered("status_id", new="Onbekend"), set())
+
+    def test_activities_view_uses_change_filter(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("activities:list"), {"field": "status_id", "new": "Open"})
+        self.assertEqual([e["id"] for e in response.context["events"]], [self.to_open.id])
+
+
+class HistoryFacetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("staff", is_staff=True)
+        signal_type = SignalType.objects.create(name="Algemeen")
+        cls.signal = Signal.objects.create(type=signal_type, body="x")
+        cls.person = Person.objects.create(first_name="Jan", last_name="Jansen")
+
+    def test_log_history_keeps_counts(self):
+        log_history(self.signal, self.user, "created", {})
+        log_history(self.signal, self.user, "archived_toggled", {"is_archived": [False, True]})
+        log_history(self.signal, self.user, "archived_toggled", {"is_archived": [True, False]})
+        log_history(self.person, self.user, "created", {})
+
+        self.assertEqual(facets(), (
+            [("archived_toggled", 2), ("created", 2)],
+            [("person", 1), ("signal", 3)],
+        ))
+        self.assertEqual(facets(exclude_models=["person"])[0], [("archived_toggled", 2), ("created", 1)])
+
+    def test_rebuild_matches_log(self):
+        log_history(self.signal, self.user, "created", {})
+        log_history(self.person, self.user, "created", {})
+        before = facets()
+        HistoryFacet.objects.update(count=0)
+
+        self.assertEqual(rebuild_facets(), 2)
+        self.assertEqual(facets(), before)
+
+    def test_activities_view_reads_facets_not_the_log(self):
+        log_history(self.signal, self.user, "created", {})
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("activities:list"))
+        self.assertEqual(response.context["models"], [{"value": "signal", "count": 1}])
+        self.assertFalse([q for q in ctx.captured_queries if "DISTINCT" in q["sql"]])
+
+
+class HistoryWriterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("staff", is_staff=True)
+        signal_type = SignalType.objects.create(name="Algemeen")
+        cls.signals = Signal.objects.bulk_create([Signal(type=signal_type, body=str(i)) for i in range(30)])
+
+    def log_all(self):
+        for signal in self.signals:
+            log_history(signal, self.user, "archived_toggled", {"is_archived": [False, True]})
+
+    def test_buffer_flushes_once_with_constant_queries(self):
+        flush_sizes.clear()
+        # savepoint, events, changes, facet (update, eerste insert, update), activiteitsdelta (insert), release
+        with self.assertNumQueries(8):
+            with buffered_history() as writer:
+                self.log_all()
+                self.assertEqual(len(writer.pending), 30)
+
+        self.assertEqual(writer.written, 30)
+        self.assertEqual(flush_sizes, {30: 1})
+        self.assertEqual(HistoryEvent.objects.count(), 30)
+        self.assertEqual(HistoryChange.objects.filter(field="is_archived", new_value="true").count(), 30)
+        self.assertEqual(facets()[0], [("archived_toggled", 30)])
+
+    def test_batch_size_and_nesting(self):
+        flush_sizes.clear()
+        with buffered_history(batch_size=20) as outer:
+            with buffered_history() as inner:
+                self.assertIs(inner, outer)
+                self.log_all()
+        self.assertEqual(flush_sizes, {20: 1, 10: 1})
+
+    def test_error_writes_nothing(self):
+        with self.assertRaises(ValueError):
+            with buffered_history():
+                self.log_all()
+                raise ValueError
+        self.assertFalse(HistoryEvent.objects.exists())
+        self.assertFalse(HistoryFacet.objects.exists())
+
+    def test_without_buffer_writes_immediately(self):
+        event = log_history(self.signals[0], self.user, "created", {})
+        self.assertIsNotNone(event.pk)
+
+
+class HistoryArchiveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("staff", is_staff=True)
+        signal_type = SignalType.objects.create(name="Algemeen")
+        cls.signal = Signal.objects.create(type=signal_type, body="x")
+        now = timezone.now()
+        cls.old_month = archive.cutoff(8, now)
+        with buffered_history():
+            for i in range(40):
+                log_history(cls.signal, cls.user, "archived_toggled", {"is_archived": [i % 2 == 0, i % 2 == 1]})
+        # 15 oude events (8 maanden geleden), 25 recente
+        ids = list(HistoryEvent.objects.order_by("id").values_list("id", flat=True))
+        HistoryEvent.objects.filter(id__in=ids[:15]).update(created_at=cls.old_month + timedelta(days=3))
+        HistoryEvent.objects.filter(id__in=ids[15:]).update(created_at=now - timedelta(days=1))
+
+    def test_archive_moves_old_months_and_list_reads_through(self):
+        before = [e.id for e in HistoryEvent.objects.order_by("-created_at", "-id")]
+        self.assertEqual(archive.months_before(HistoryEvent.objects.all(), archive.cutoff(6)), [self.old_month])
+
+        self.assertEqual(archive.archive_month(self.old_month), 15)
+        self.assertEqual(HistoryEvent.objects.count(), 25)
+        self.assertEqual(HistoryArchive.objects.count(), 15)
+        self.assertFalse(HistoryChange.objects.filter(event_id__in=before[-15:]).exists())
+
+        self.client.force_login(self.user)
+        url = reverse("activities:list")
+        first = self.client.get(url).context
+        second = self.client.get(url, {"cursor": first["page_obj"].next_cursor}).context
+        self.assertEqual([e["id"] for e in first["events"] + second["events"]], before)
+        self.assertEqual([e["archived"] for e in second["events"]], [True] * 15)
+        back = self.client.get(url, {"cursor": second["page_obj"].previous_cursor}).context
+        self.assertEqual([e["id"] for e in back["events"]], before[:25])
+
+    def test_export_writes_gzipped_jsonl_and_drops_month(self):
+        archive.archive_month(self.old_month)
+        with tempfile.TemporaryDirectory() as tmp:
+            path, written = archive.export_month(self.old_month, Path(tmp))
+            rows = list(archive.read_export(path))
+
+        self.assertEqual(written, 15)
+        self.assertEqual(path.name, f"history-{self.old_month:%Y-%m}.jsonl.gz")
+        self.assertEqual({row["model"] for row in rows}, {"core.signal"})
+        self.assertFalse(HistoryArchive.objects.exists())
+        self.assertEqual(facets()[0], [("archived_toggled", 25)])
+
+    def test_export_interrupted_before_delete_writes_nothing_twice(self):
+        archive.archive_month(self.old_month)
+        with tempfile.TemporaryDirectory() as tmp:
+            # eerder deel van dezelfde maand staat er al
+            path = archive.archive_path(self.old_month, Path(tmp))
+            with gzip.open(path, "wt", encoding="utf-8") as out:
+                out.write(json.dumps({"id": 0}) + "\n")
+            with mock.patch.object(archive, "_drop_partition", side_effect=RuntimeError("afgebroken")):
+                with self.assertRaises(RuntimeError):
+                    archive.export_month(self.old_month, Path(tmp))
+            self.assertEqual([row["id"] for row in archive.read_export(path)], [0])
+            self.assertEqual(HistoryArchive.objects.count(), 15)
+
+            archive.export_month(self.old_month, Path(tmp))
+            ids = [row["id"] for row in archive.read_export(path)]
+            self.assertEqual(os.listdir(tmp), [path.name])
+        self.assertEqual((len(ids), len(set(ids))), (16, 16))
+        self.assertFalse(HistoryArchive.objects.exists())
+
+    def test_command(self):
+        out = StringIO()
+        with tempfile.TemporaryDirectory() as tmp:
+            call_command("archive_history", keep_months=6, export_months=6, dir=tmp, stdout=out)
+            self.assertEqual(len(list(Path(tmp).glob("history-*.jsonl.gz"))), 1)
+        self.assertEqual(HistoryEvent.objects.count(), 25)
+        self.assertFalse(HistoryArchive.objects.exists())
+
+
+class SignalNotificationJobTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.creator = User.objects.create_user("creator", password="pw", is_staff=True)
+        cls.staff = [User.objects.create_user(f"staff{i}", is_staff=True) for i in range(5)]
+        User.objects.create_user("inactive", is_staff=True, is_active=False)
+        User.objects.create_user("external")
+        cls.signal_type = SignalType.objects.create(name="Algemeen")
+
+    def _create_signal(self, **data):
+        self.client.force_login(self.creator)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("signals:create"), {
+                "type": self.signal_type.id, "active_from": "2026-01-01", "body": "Nieuw", **data,
+            })
+        self.assertEqual(response.status_code, 302)
+        return Signal.objects.latest("id")
+
+    @override_settings(NOTIFICATION_BATCH_SIZE=2)
+    def test_fan_out_runs_in_worker_in_batches(self):
+        signal = self._create_signal()
+        self.assertEqual(Notification.objects.count(), 0)
+        self.assertEqual(Job.objects.get().payload, {"signal_id": signal.id, "created_by_id": self.creator.id})
+
+        self.assertEqual(jobs.run_pending(), (1, 0))
+        self.assertEqual(
+            set(Notification.objects.values_list("user__username", flat=True)),
+            {u.username for u in self.staff},
+        )
+        self.assertEqual(Job.objects.get().status, Job.STATUS_DONE)
+
+    def test_assigned_signal_notifies_only_assignee(self):
+        self._create_signal(assigned_to=self.staff[0].id)
+        jobs.run_pending()
+        self.assertEqual(list(Notification.objects.values_list("user_id", flat=True)), [self.staff[0].id])
+
+    def test_retry_is_idempotent(self):
+        signal = self._create_signal()
+        jobs.run_pending()
+        deliver_signal_notifications(signal.id, self.creator.id)
+        self.assertEqual(Notification.objects.count(), len(self.staff))
+
+    def test_failing_job_is_retried_then_failed(self):
+        calls = []
+
+        @jobs.job_handler("test_boom")
+        def boom():
+            calls.append(1)
+            raise RuntimeError("boom")
+
+        job = jobs.enqueue("test_boom", max_attempts=2)
+        self.assertEqual(jobs.run_pending(), (0, 1))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.STATUS_PENDING, 1))
+        self.assertIn("boom", job.last_error)
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        jobs.run_pending()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, len(calls)), (Job.STATUS_FAILED, 2, 2))
+        jobs.HANDLERS.pop("test_boom")
+
+
+class FanOutTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = [User.objects.create_user(f"staff{i}", is_staff=True) for i in range(7)]
+        User.objects.create_user("external")
+        cls.signal = Signal.objects.create(type=SignalType.objects.create(name="Algemeen"), body="x")
+
+    def test_insert_select_in_batches(self):
+        recipients = User.objects.filter(is_staff=True).exclude(id=self.staff[0].id)
+        for batch_size in (None, 1, 4, 100):
+            with self.subTest(batch_size=batch_size):
+                Notification.objects.all().delete()
+                inserted = fan_out(self.signal, recipients, kind="signal_created", title="Nieuwe melding",
+                                   body="x", url="/signals/1/", batch_size=batch_size)
+                self.assertEqual(inserted, 6)
+                self.assertEqual(
+                    sorted(Notification.objects.values_list("user_id", flat=True)),
+                    [u.id for u in self.staff[1:]],
+                )
+
+        n = Notification.objects.first()
+        self.assertEqual((n.content_object, n.kind, n.title, n.is_read), (self.signal, "signal_created", "Nieuwe melding", False))
+        self.assertIsNotNone(n.created_at)
+
+    def test_rerun_inserts_nothing(self):
+        recipients = User.objects.filter(is_staff=True)
+        fan_out(self.signal, recipients, kind="signal_created", title="t", batch_size=3)
+        self.assertEqual(fan_out(self.signal, recipients, kind="signal_created", title="t", batch_size=3), 0)
+        self.assertEqual(Notification.objects.count(), 7)
+
+
+class BulkActionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("staff", is_staff=True)
+        cls.other = User.objects.create_user("other", is_staff=True)
+        cls.open = Status.objects.create(key="open", name="Open", scope="signal")
+        cls.task_status = Status.objects.create(key="todo", name="Te doen", scope="task")
+        signal_type = SignalType.objects.create(name="Algemeen")
+        cls.signals = Signal.objects.bulk_create([Signal(type=signal_type, body=f"melding {i}") for i in range(30)])
+        Signal.objects.filter(id=cls.signals[0].id).update(assigned_to=cls.other)
+        cls.ids = [s.id for s in cls.signals]
+
+    def setUp(self):
+        cache.clear()
+
+    def post(self, **data):
+        self.client.force_login(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse("signals:bulk"), {"ids": self.ids, "next": "/signals/?q=x", **data})
+
+    def test_reassign_is_one_update_with_bulk_history_and_notifications(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.post(action="assign", assigned_to=self.other.id)
+        self.assertRedirects(response, "/signals/?q=x", fetch_redirect_response=False)
+
+        updates = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith('UPDATE "core_signal"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(Signal.objects.filter(assigned_to=self.other).count(), 30)
+        # de al toegewezen melding telt niet mee
+        self.assertEqual(HistoryEvent.objects.filter(action="reassigned").count(), 29)
+        self.assertEqual(flush_sizes[29], 1)
+
+        self.assertEqual(jobs.run_pending(), (1, 0))
+        self.assertEqual(Notification.objects.filter(user=self.other, kind__startswith="assigned:").count(), 29)
+        self.assertEqual(unread_count(self.other), 29)
+        n = Notification.objects.filter(kind__startswith="assigned:").first()
+        self.assertEqual((n.title, n.url), ("Melding aan je toegewezen", f"/signals/{n.object_id}/"))
+
+    def test_odd_and_too_many_ids(self):
+        self.ids = ["²", self.signals[0].id]
+        response = self.post(action="archive")
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Signal.objects.filter(is_archived=True).count(), 1)
+
+        self.ids = list(range(1, bulk.MAX_IDS + 2))
+        self.post(action="unarchive")
+        self.assertEqual(Signal.objects.filter(is_archived=True).count(), 1)
+        with self.assertRaisesMessage(ValueError, "maximaal"):
+            bulk.parse_ids(self.ids)
+
+    def test_reassign_back_notifies_again(self):
+        self.ids = [self.signals[1].id]
+        for user in (self.other, self.user, self.other):
+            self.post(action="assign", assigned_to=user.id)
+            jobs.run_pending()
+        self.assertEqual(Notification.objects.filter(user=self.other, object_id=self.ids[0]).count(), 2)
+        self.assertEqual(unread_count(self.other), 2)
+
+    def test_status_and_archive(self):
+        self.post(action="status", status_id=self.open.id)
+        self.assertEqual(Signal.objects.filter(status=self.open).count(), 30)
+        self.assertEqual(HistoryChange.objects.filter(field="status_id", new_value=str(self.open.id)).count(), 30)
+
+        self.post(action="archive")
+        self.assertFalse(Signal.objects.filter(is_archived=False).exists())
+
+    def test_invalid_input_changes_nothing(self):
+        response = self.post(action="status", status_id=self.task_status.id)
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Signal.objects.filter(status__isnull=False).exists())
+        self.assertFalse(HistoryEvent.objects.exists())
+
+    def test_task_assign_requires_user(self):
+        # taken moeten een assignee houden: leeg geeft een melding, geen IntegrityError
+        task = Task.objects.create(type=TaskType.objects.create(name="Bellen"), assigned_to=self.other)
+        self.client.force_login(self.user)
+        response = self.client.post(reverse("tasks:bulk"), {"ids": [task.id], "action": "assign", "assigned_to": ""})
+        self.assertEqual(response.status_code, 302)
+        task.refresh_from_db()
+        self.assertEqual(task.assigned_to, self.other)
+        with self.assertRaisesMessage(ValueError, "Kies een gebruiker."):
+            bulk.apply(Task, [task.id], self.user, "assign", assigned_to="")
+
+        response = self.client.get(reverse("tasks:list"))
+        self.assertNotContains(response, "Niemand")
+
+    def test_search_index_follows_bulk_update(self):
+        search.index_objects(Signal.objects.all())
+        self.post(action="assign", assigned_to=self.other.id)
+        self.assertEqual(Signal.objects.filter(pk__in=search.matching_ids(Signal, "other")).count(), 30)
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("staff", is_staff=True)
+        cls.open = Status.objects.create(key="open", name="Open", scope="signal")
+        signal_type = SignalType.objects.create(name="Algemeen")
+        today = timezone.localdate()
+        Signal.objects.bulk_create([
+            Signal(type=signal_type, body=f"melding {i}", status=cls.open if i % 2 else None,
+                   active_from=today - timedelta(days=i))
+            for i in range(30)
+        ])
+        Signal.objects.create(type=signal_type, body="oud", is_archived=True)
+        Person.objects.create(first_name="Anna", last_name="Zwart", email="anna@example.nl")
+        Person.objects.create(first_name="Bert", last_name="Appel", person_type="employee")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def get(self, name, **params):
+        response = self.client.get(reverse(name), params)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode("utf-8-sig")
+
+    def test_signal_csv_uses_list_filters_and_sort(self):
+        with CaptureQueriesContext(connection) as ctx:
+            content = self.get("signals:export", status=self.open.id, sort="active_from", dir="asc")
+        # alles in één query, ook type/status/assignee (joins i.p.v. een query per rij)
+        self.assertEqual(len([q for q in ctx.captured_queries if "core_signal" in q["sql"]]), 1)
+
+        lines = content.splitlines()
+        self.assertEqual(lines[0], "id,type,status,assigned_to,active_from,body,is_archived,created_at")
+        rows = lines[1:]
+        self.assertEqual(len(rows), 15)
+        self.assertEqual(rows[0].split(",")[5], "melding 29")
+        self.assertEqual(rows[-1].split(",")[5], "melding 1")
+
+    def test_signal_json_matches_list_order(self):
+        data = json.loads(self.get("signals:export", format="json", archived="1"))
+        self.assertEqual(len(data), 31)
+        listed = [s.id for s in self.client.get(reverse("signals:list"), {"archived": "1"}).context["signals"]]
+        self.assertEqual([row["id"] for row in data][:25], listed)
+
+    def test_task_export_keeps_nulls_last_like_the_list(self):
+        task_type = TaskType.objects.create(name="Bellen")
+        now = timezone.now()
+        for due_at in (None, now, now + timedelta(days=1)):
+            Task.objects.create(type=task_type, assigned_to=self.user, due_at=due_at)
+        for direction in ("asc", "desc"):
+            params = {"sort": "due_at", "dir": direction}
+            listed = [t.id for t in self.client.get(reverse("tasks:list"), params).context["tasks"]]
+            exported = [row["id"] for row in json.loads(self.get("tasks:export", format="json", **params))]
+            self.assertEqual(exported, listed)
+            self.assertIsNone(Task.objects.get(pk=exported[-1]).due_at)
+
+    def test_people_export(self):
+        rows = self.get("people:export", type="employee").splitlines()[1:]
+        self.assertEqual(len(rows), 1)
+        self.assertIn("Bert,Appel", rows[0])
+        data = json.loads(self.get("people:export", format="json", q="ana zwrt"))
+        self.assertEqual([row["email"] for row in data], ["anna@example.nl"])
+
+
+class DashboardStatsTests(TestCase):
+    """De DashboardStat-tabel moet na elke soort wijziging hetzelfde opleveren als de live GROUP BY's."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("staff", is_staff=True)
+        cls.other = User.objects.create_user("other", is_staff=True)
+        cls.open = Status.objects.create(key="open", name="Open", scope="signal")
+        cls.done = Status.objects.create(key="done", name="Klaar", scope="signal")
+        cls.signal_type = SignalType.objects.create(name="Algemeen")
+        cls.task_type = TaskType.objects.create(name="Bellen")
+
+    def setUp(self):
+        cache.clear()
+        # vast "nu" midden op de dag: taken van vanochtend zijn al te laat, van vanmiddag nog niet
+        self.now = timezone.make_aware(timezone.datetime.combine(timezone.localdate(), timezone.datetime.min.time())) + timedelta(hours=12)
+
+    def assertInSync(self):
+        self.assertEqual(dashboard.summary_stats(self.now), dashboard.live_stats(self.now))
+
+    def make_tasks(self):
+        for hours in (-72, -3, 3, 72):
+            Task.objects.create(type=self.task_type, assigned_to=self.other, due_at=self.now + timedelta(hours=hours))
+        Task.objects.create(type=self.task_type, assigned_to=self.user)
+
+    def test_counts_follow_saves_views_bulk_and_deletes(self):
+        signals = [Signal.objects.create(type=self.signal_type, status=self.open, body=f"m{i}") for i in range(4)]
+        self.make_tasks()
+        self.assertInSync()
+        stats = dashboard.summary_stats(self.now)
+        self.assertEqual((stats["open_signals"], stats["overdue_tasks"]), (4, 2))
+        self.assertEqual(stats["overdue_by_assignee"], [("other", 2)])
+
+        self.client.force_login(self.user)
+        self.client.post(reverse("signals:set_status", args=[signals[0].id]), {"status_id": self.done.id})
+        self.client.post(reverse("signals:toggle_archive", args=[signals[1].id]))
+        bulk.apply(Signal, [s.id for s in signals], self.user, "status", status_id=str(self.done.id))
+        bulk.apply(Task, list(Task.objects.values_list("id", flat=True)), self.user, "assign", assigned_to=str(self.user.id))
+        signals[2].delete()
+        self.assertInSync()
+        stats = dashboard.summary_stats(self.now)
+        self.assertEqual(stats["signals_by_status"], [("Klaar", 2)])
+        self.assertEqual(stats["overdue_by_assignee"], [("staff", 2)])
+        # alle events van vandaag (zonder notificaties) in de laatste week
+        self.assertEqual(stats["activity_weeks"][-1]["count"], HistoryEvent.objects.exclude(content_type__model="notification").count())
+
+    def test_history_writes_deltas_and_worker_folds_them(self):
+        signal = Signal.objects.create(type=self.signal_type, body="x")
+        with CaptureQueriesContext(connection) as ctx:
+            with buffered_history():
+                for i in range(5):
+                    log_history(signal, self.user, "updated", {"body": [str(i), str(i + 1)]})
+        # geen UPDATE op de gedeelde activity_week-rij in de transactie van het request
+        self.assertFalse([q for q in ctx.captured_queries if "core_dashboardstat" in q["sql"] and "delta" not in q["sql"]])
+        self.assertEqual(DashboardStatDelta.objects.count(), 1)
+        self.assertInSync()
+
+        call_command("run_jobs", "--once", stdout=StringIO())
+        self.assertFalse(DashboardStatDelta.objects.exists())
+        self.assertInSync()
+        self.assertEqual(dashboard.fold_deltas(), 0)
+
+    def test_save_without_tracked_fields_skips_lookup(self):
+        signal = Signal.objects.create(type=self.signal_type, body="x")
+        signal.body = "y"
+        with CaptureQueriesContext(connection) as ctx:
+            signal.save(update_fields=["body"])
+        # geen SELECT van de oude stand, geen tellerupdate
+        self.assertFalse([q for q in ctx.captured_queries if "core_dashboardstat" in q["sql"] or q["sql"].startswith("SELECT")])
+
+    def test_rebuild_and_cached_dashboard(self):
+        Signal.objects.bulk_create([Signal(type=self.signal_type, body=f"b{i}") for i in range(3)])
+        self.make_tasks()
+        self.assertEqual(dashboard.summary_stats(self.now)["open_signals"], 0)
+        call_command("rebuild_dashboard_stats", stdout=StringIO())
+        self.assertInSync()
+        self.assertEqual(dashboard.summary_stats(self.now)["open_signals"], 3)
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(reverse("dashboard")).context["stats"]["open_signals"], 3)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse("dashboard"))
+        self.assertFalse([q for q in ctx.captured_queries if "core_dashboardstat" in q["sql"]])
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command("bench_dashboard", "--sizes", "50", "--repeat", "1", stdout=out)
+        self.assertIn("live", out.getvalue())
+        self.assertFalse(Signal.objects.exists())
+
+
+class InboxTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("staff", is_staff=True)
+        cls.other = User.objects.create_user("other", is_staff=True)
+        signal_type = SignalType.objects.create(name="Algemeen")
+        task_type = TaskType.objects.create(name="Bellen")
+        today = timezone.localdate()
+        now = timezone.now()
+
+        def signal(body, days_ago, **kwargs):
+            return Signal.objects.create(type=signal_type, body=body, active_from=today - timedelta(days=days_ago), **kwargs)
+
+        cls.mine = signal("mijn melding", 1, assigned_to=cls.user)
+        cls.everyone = signal("voor iedereen", 3)
+        signal("van een ander", 0, assigned_to=cls.other)
+        signal("gearchiveerd", 0, assigned_to=cls.user, is_archived=True)
+        signal("nog niet actief", -5)
+
+        cls.overdue = Task.objects.create(type=task_type, assigned_to=cls.user, body="te laat", due_at=now - timedelta(days=2))
+        cls.soon = Task.objects.create(type=task_type, assigned_to=cls.user, body="bijna", due_at=now + timedelta(days=2))
+        Task.objects.create(type=task_type, assigned_to=cls.user, body="later", due_at=now + timedelta(days=30))
+        Task.objects.create(type=task_type, assigned_to=cls.other, body="ander", due_at=now)
+
+        Notification.objects.create(user=cls.user, content_object=cls.everyone, title="Nieuw")
+        Notification.objects.create(user=cls.user, content_object=cls.everyone, title="Gelezen", is_read=True)
+        Notification.objects.create(user=cls.other, content_object=cls.everyone, title="Niet voor mij")
+
+    def test_merged_stream_in_four_queries(self):
+        with self.assertNumQueries(4):
+            data = inbox(self.user)
+        self.assertEqual(
+            [(item["kind"], item["title"] if item["kind"] == "notification" else item["body"]) for item in data["items"]],
+            [("task", "bijna"), ("notification", "Nieuw"), ("signal_mine", "mijn melding"),
+             ("task", "te laat"), ("signal_all", "voor iedereen")],
+        )
+        self.assertTrue(data["items"][3]["overdue"])
+        self.assertFalse(any(data["more"].values()))
+
+    def test_per_source_limit_keeps_query_count(self):
+        Signal.objects.bulk_create([Signal(type=self.mine.type, body=f"extra {i}") for i in range(20)])
+        with self.assertNumQueries(4):
+            data = inbox(self.user, limit=2)
+        self.assertEqual(len([i for i in data["items"] if i["kind"] == "signal_all"]), 2)
+        self.assertEqual(data["more"], {"signal_mine": False, "signal_all": True, "task": False, "notification": False})
+
+    def test_tasks_most_overdue_first_without_done(self):
+        done = Status.objects.create(key="done", name="Afgerond", scope="task")
+        Task.objects.create(type=self.overdue.type, assigned_to=self.user, body="klaar", status=done,
+                            due_at=timezone.now() - timedelta(days=5))
+        data = inbox(self.user, limit=1)
+        self.assertEqual([i["body"] for i in data["items"] if i["kind"] == "task"], ["te laat"])
+        self.assertTrue(data["more"]["task"])
+        self.assertNotIn("klaar", [i["body"] for i in inbox(self.user)["items"]])
+
+    def test_view(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("inbox"))
+        self.assertContains(response, "mijn melding")
+        self.assertNotContains(response, "nog niet actief")
+
+    def test_view_is_staff_only(self):
+        self.client.force_login(User.objects.create_user("student"))
+        self.assertEqual(self.client.get(reverse("inbox")).status_code, 403)
+
+
+class ReminderTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("staff", is_staff=True)
+        todo = Status.objects.create(key="todo", name="Te doen", scope="task")
+        done = Status.objects.create(key="done", name="Afgerond", scope="task")
+        task_type = TaskType.objects.create(name="Bellen")
+        cls.now = timezone.now().replace(microsecond=0)
+
+        def task(hours, **kwargs):
+            return Task.objects.create(type=task_type, assigned_to=cls.user, due_at=cls.now + timedelta(hours=hours), **kwargs)
+
+        cls.overdue = task(-2, status=todo)
+        cls.soon = task(3)
+        task(72)
+        task(-2, status=done)
+        task(-2, is_archived=True)
+
+    def kinds(self):
+        return sorted(Notification.objects.values_list("object_id", "kind"))
+
+    def test_due_soon_and_overdue_once(self):
+        scheduler = ReminderScheduler()
+        self.assertEqual(scheduler.tick(self.now), 2)
+        self.assertEqual(self.kinds(), sorted([
+            (self.overdue.id, reminder_kind("task_overdue", self.overdue.due_at)),
+            (self.soon.id, reminder_kind("task_due_soon", self.soon.due_at)),
+        ]))
+        self.assertEqual(unread_count(self.user), 2)
+
+        # opnieuw, en met een tweede worker: niets dubbel
+        self.assertEqual(scheduler.tick(self.now + timedelta(minutes=5)), 0)
+        self.assertEqual(ReminderScheduler().tick(self.now), 0)
+        self.assertEqual(Notification.objects.count(), 2)
+
+    def test_concurrent_worker_does_not_inflate_unread(self):
+        other = ReminderScheduler()
+        other.load(self.now)
+        self.assertEqual(ReminderScheduler().tick(self.now), 2)
+        # alsof de eerste worker schreef terwijl de tweede al bezig was
+        Notification.objects.update(created_at=timezone.now() + timedelta(minutes=1))
+        self.assertEqual(other.tick(self.now), 0)
+        self.assertEqual(unread_count(self.user), 2)
+
+    def test_heap_fires_without_reloading(self):
+        scheduler = ReminderScheduler(window=timedelta(hours=4), refresh=timedelta(hours=5))
+        scheduler.tick(self.now)
+        self.assertEqual(scheduler.next_fire(), self.soon.due_at)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(scheduler.tick(self.now + timedelta(minutes=30)), 0)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+        self.assertEqual(scheduler.tick(self.soon.due_at), 1)
+        self.assertEqual(scheduler.stats["loads"], 1)
+        self.assertTrue(Notification.objects.filter(kind__startswith="task_overdue:", object_id=self.soon.id).exists())
+
+    def test_changed_tasks(self):
+        scheduler = ReminderScheduler(window=timedelta(hours=4), refresh=timedelta(hours=5))
+        scheduler.tick(self.now)
+        # afgerond voordat de herinnering af gaat: overslaan
+        Task.objects.filter(id=self.soon.id).update(status=Status.objects.get(key="done"))
+        self.assertEqual(scheduler.tick(self.soon.due_at), 0)
+        self.assertEqual(scheduler.stats["skipped"], 1)
+
+        # verschoven deadline: na het verversen een nieuwe herinnering
+        Task.objects.filter(id=self.overdue.id).update(due_at=self.now + timedelta(hours=1))
+        self.assertEqual(ReminderScheduler().tick(self.now + timedelta(hours=2)), 1)
+        self.assertEqual(Notification.objects.filter(object_id=self.overdue.id).count(), 2)
+
+    def test_command_once(self):
+        out = StringIO()
+        call_command("run_reminders", "--once", stdout=out)
+        self.assertIn("2 herinneringen verstuurd", out.getvalue())
+
+
+class CsvImportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("staff", is_staff=True)
+        Person.objects.create(first_name="Bestaand", last_name="Persoon", email="Jan@Example.nl")
+        cls.signal_type = SignalType.objects.create(name="Algemeen")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_people_in_batches_with_dedupe_and_row_errors(self):
+        lines = ["first_name;last_name;email;person_type"]
+        lines += [f"Voor{i};Achter{i};p{i}@example.nl;" for i in range(25)]
+        lines += [
+            "Jan;Dubbel;jan@example.nl;",        # bestaat al
+            "Piet;Twee;p3@EXAMPLE.nl;",         # eerder in het bestand
+            ";Zonder voornaam;x@example.nl;",   # fout
+            "Kees;Fout;geen-email;employee",    # fout
+        ]
+        errors = []
+        with CaptureQueriesContext(connection) as ctx:
+            result = imports.import_rows(
+                "person", imports.read_csv(StringIO("\n".join(lines) + "\n")), self.user,
+                batch_size=10, on_error=lambda line, e: errors.append((line, sorted(e))),
+            )
+
+        self.assertEqual((result.rows, result.created, result.duplicates, result.error_count), (29, 25, 2, 2))
+        # per blok eerst de formulierfouten, dan de dubbele e-mailadressen
+        self.assertEqual(sorted(errors), [(27, ["email"]), (28, ["email"]), (29, ["first_name"]), (30, ["email"])])
+        self.assertEqual(Person.objects.count(), 26)
+        self.assertEqual(HistoryEvent.objects.filter(action="created").count(), 25)
+        # per blok één INSERT voor de personen
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith('INSERT INTO "core_person"')]
+        self.assertEqual(len(inserts), 3)
+
+        imported = Person.objects.get(email="p7@example.nl")
+        self.assertEqual((imported.person_type, imported.search_text), ("student", "voor7 achter7 p7 example nl"))
+        self.assertIn(imported, fuzzy_people("Achter7"))
+
+    def test_signals_resolve_names_and_dry_run(self):
+        csv_text = "type,body,assigned_to,active_from\nAlgemeen,Eerste,staff,2026-02-01\nOnbekend,Tweede,,\n"
+        result = imports.import_rows("signal", imports.read_csv(StringIO(csv_text)), self.user, dry_run=True)
+        self.assertEqual((result.created, result.error_count), (1, 1))
+        self.assertEqual(result.errors[0][0], 3)
+        self.assertFalse(Signal.objects.exists())
+
+        imports.import_rows("signal", imports.read_csv(StringIO(csv_text)), self.user)
+        signal = Signal.objects.get()
+        self.assertEqual((signal.type, signal.assigned_to, str(signal.active_from)), (self.signal_type, self.user, "2026-02-01"))
+        self.assertEqual(Signal.objects.filter(pk__in=search.matching_ids(Signal, "eerste")).count(), 1)
+
+    def test_read_errors_stop_the_import_without_raising(self):
+        # de fout valt ver na het eerste blok
+        lines = ["first_name;last_name"] + [f"Voor{i};Achter{i}" for i in range(1000)]
+        data = ("\n".join(lines) + "\nJosé;Kapot\nNa;Fout\n").encode("cp1252")
+        result = imports.import_rows("person", imports.read_csv(io.BytesIO(data)), self.user, batch_size=100)
+        self.assertTrue(result.aborted)
+        self.assertEqual(result.created, 1000)
+        self.assertEqual(result.errors[-1][0], 1002)
+        self.assertIn("geen utf-8", result.errors[-1][1]["bestand"][0])
+        self.assertEqual(Person.objects.count(), 1001)
+
+        too_long = "x" * (csv.field_size_limit() + 1)
+        result = imports.import_rows("person", imports.read_csv(StringIO(f"first_name;last_name\nA;{too_long}\n")), self.user)
+        self.assertTrue(result.aborted)
+        self.assertIn("Ongeldige CSV", result.errors[0][1]["bestand"][0])
+
+    def test_admin_upload_with_encoding(self):
+        admin_user = User.objects.create_superuser("admin", "admin@example.nl", "pw")
+        self.client.force_login(admin_user)
+        url = reverse("admin:core_person_import_csv")
+        data = "first_name;last_name;email\nJosé;Smit;jose@example.nl\n".encode("cp1252")
+
+        response = self.client.post(url, {"file": SimpleUploadedFile("p.csv", data), "batch_size": 500, "encoding": "utf-8-sig"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["result"].aborted)
+        self.assertContains(response, "geen utf-8")
+        self.assertFalse(Person.objects.filter(first_name="José").exists())
+
+        response = self.client.post(url, {"file": SimpleUploadedFile("p.csv", data), "batch_size": 500, "encoding": "cp1252"})
+        self.assertEqual(response.context["result"].created, 1)
+        self.assertTrue(Person.objects.filter(first_name="José").exists())
+
+    def test_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as f:
+            f.write("first_name,last_name,email\nAnna,Smit,anna@example.nl\n")
+        out = StringIO()
+        call_command("import_csv", "person", f.name, "--user", "staff", stdout=out, stderr=StringIO())
+        Path(f.name).unlink()
+        self.assertIn("1 aangemaakt", out.getvalue())
+        self.assertEqual(HistoryEvent.objects.get().actor, self.user)
+
+
+class UnreadCounterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = [User.objects.create_user(f"staff{i}", password="pw", is_staff=True) for i in range(3)]
+        signal_type = SignalType.objects.create(name="Algemeen")
+        cls.signals = [Signal.objects.create(type=signal_type, body=f"melding {i}") for i in range(2)]
+
+    def counts(self):
+        return [unread_count(u) for u in self.staff]
+
+    def test_fan_out_and_mark_read_keep_counter_in_sync(self):
+        recipients = User.objects.filter(is_staff=True)
+        self.assertEqual(self.counts(), [0, 0, 0])
+
+        fan_out(self.signals[0], recipients, kind="signal_created", title="t", batch_size=2)
+        fan_out(self.signals[0], recipients, kind="signal_created", title="t", batch_size=2)  # dubbel: telt niet
+        notify_users(self.signals[1], [self.staff[0].id], kind="signal_created", title="t")
+        self.assertEqual(self.counts(), [2, 1, 1])
+
+        n = Notification.objects.get(user=self.staff[0], object_id=self.signals[0].id)
+        n.mark_read()
+        Notification.objects.get(pk=n.pk).mark_read()  # verouderde kopie: geen tweede aftrek
+        self.assertEqual(self.counts(), [1, 1, 1])
+
+        self.assertEqual(mark_all_read(self.staff[1]), 1)
+        self.assertEqual(self.counts(), [1, 0, 1])
+
+        NotificationCounter.objects.update(unread=42)
+        rebuild_unread_counts()
+        self.assertEqual(self.counts(), [1, 0, 1])
+
+    def test_badge_is_one_query_and_mark_all_read_endpoint(self):
+        notify_users(self.signals[0], [self.staff[0].id], kind="signal_created", title="t")
+        self.client.force_login(self.staff[0])
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("signals:list"))
+        self.assertContains(response, "data-unread-count>1</span>")
+        self.assertEqual(len([q for q in ctx.captured_queries if "core_notification" in q["sql"]]), 1)
+
+        response = self.client.post(reverse("notifications_mark_all_read"), HTTP_ACCEPT="application/json")
+        self.assertEqual(response.json(), {"marked_read": 1, "unread": 0})
+        self.assertFalse(Notification.objects.filter(is_read=False).exists())
+        self.assertEqual(unread_count(self.staff[0]), 0)
+
+
+class NotificationStreamTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("staff", password="pw", is_staff=True)
+        cls.signal = Signal.objects.create(type=SignalType.objects.create(name="Algemeen"), body="x")
+
+    async def test_broker_wakes_subscriber_from_other_thread(self):
+        sub = broker.subscribe(self.user.id)
+        try:
+            self.assertIn(self.user.id, broker.user_ids())
+            thread = threading.Thread(target=lambda: [broker.publish([self.user.id]) for _ in range(3)])
+            thread.start()
+            thread.join()
+            self.assertIs(await sub.wait(1), True)
+            self.assertIsNone(await sub.wait(0.01))  # drie wake-ups vallen samen
+        finally:
+            sub.close()
+        self.assertNotIn(self.user.id, broker.user_ids())
+
+    @override_settings(NOTIFICATION_STREAM_POLL_INTERVAL=30)
+    async def test_stream_pushes_new_notifications_after_commit(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse("notification_stream"))
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        chunks = aiter(response.streaming_content)
+        self.assertEqual(await anext(chunks), b"retry: 5000\n\n")
+
+        # eerste read is klaar, de stream wacht nu op de broker
+        next_chunk = asyncio.ensure_future(anext(chunks))
+        await asyncio.sleep(0.05)
+        self.assertFalse(next_chunk.done())
+
+        def deliver():
+            with self.captureOnCommitCallbacks(execute=True):
+                notify_users(self.signal, [self.user.id], kind="signal_created", title="Nieuwe melding", url="/signals/1/")
+
+        await sync_to_async(deliver)()
+        chunk = (await asyncio.wait_for(next_chunk, 5)).decode()
+        await chunks.aclose()
+
+        self.assertIn("event: notification", chunk)
+        data = json.loads(chunk.split("data: ", 1)[1])
+        self.assertEqual((data["title"], data["url"], data["unread"]), ("Nieuwe melding", "/signals/1/", 1))
+
+    def test_wsgi_request_gets_no_content(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(reverse("notification_stream")).status_code, 204)
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("staff", password="pw", is_staff=True)
+        cls.signal_type = SignalType.objects.create(name="Verzuim")
+        cls.sick = Signal.objects.create(type=cls.signal_type, body="Student meldt zich ziek voor de lessen")
+        cls.other = Signal.objects.create(type=cls.signal_type, body="Gesprek over studievoortgang en meldingen")
+        cls.person = Person.objects.create(first_name="Jan", last_name="de Vries", email="jan.devries@school.nl", phone="06-1234 5678")
+        cls.task = Task.objects.create(type=TaskType.objects.create(name="Bellen"), body="Ouders bellen", assigned_to=cls.user)
+
+    def titles(self, q, **kwargs):
+        return [str(entry) for entry in search.search(q, **kwargs)]
+
+    def test_dutch_stemmer(self):
+        for word, expected in (("meldingen", "melding"), ("lichamelijk", "licham"), ("mogelijkheden", "mogelijk"), ("katten", "kat")):
+            self.assertEqual(stem(word), expected)
+
+    def test_index_follows_saves_and_deletes(self):
+        self.assertEqual(self.titles("ziek"), [f"Melding #{self.sick.pk} · Verzuim"])
+        self.assertEqual(self.titles("melding"), [f"Melding #{self.other.pk} · Verzuim"])  # stam van "meldingen"
+        self.assertEqual(self.titles("studievoort"), [f"Melding #{self.other.pk} · Verzuim"])  # prefix
+        self.assertEqual(self.titles("jan vries"), ["Persoon · Jan de Vries"])
+        self.assertEqual(self.titles("0612345"), ["Persoon · Jan de Vries"])
+        self.assertEqual(self.titles("devries"), ["Persoon · Jan de Vries"])
+
+        note = Note.objects.create(content_object=self.task, author=self.user, body="Geen gehoor, morgen opnieuw")
+        self.assertEqual(self.titles("gehoor"), [f"Notitie bij taak #{self.task.pk}"])
+        self.assertEqual(search.search("gehoor")[0].url, reverse("tasks:detail", args=[self.task.pk]))
+
+        self.sick.body = "Student is weer beter"
+        self.sick.save()
+        self.assertEqual(self.titles("ziek"), [])
+        note.delete()
+        self.assertEqual(self.titles("gehoor"), [])
+
+        # titel (type) weegt zwaarder dan body
+        Signal.objects.create(type=SignalType.objects.create(name="Ziekte"), body="lang verhaal")
+        self.assertEqual(self.titles("ziek", models=[Signal])[0].split(" · ")[1], "Ziekte")
+
+    def test_list_views_and_global_search(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse("signals:list"), {"q": "ziek"})
+        self.assertEqual([s.pk for s in response.context["signals"]], [self.sick.pk])
+
+        response = self.client.get(reverse("tasks:list"), {"q": "staff"})  # assignee-naam
+        self.assertEqual([t.pk for t in response.context["tasks"]], [self.task.pk])
+
+        response = self.client.get(reverse("people:list"), {"q": "jan.devries@school.nl"})
+        self.assertEqual([p.pk for p in response.context["people"]], [self.person.pk])
+
+        response = self.client.get(reverse("search"), {"q": "studievoortgang"})
+        self.assertContains(response, reverse("signals:detail", args=[self.other.pk]))
+        response = self.client.get(reverse("search"), {"q": "studievoortgang", "type": "person"})
+        self.assertContains(response, "Niets gevonden")
+
+
+class FuzzyPersonSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("staff", password="pw", is_staff=True)
+        cls.jansen = Person.objects.create(first_name="Anna", last_name="Jansen", email="anna@school.nl")
+        cls.vries = Person.objects.create(first_name="Jan", last_name="van der Vries", phone="06-1234 5678")
+        cls.dupont = Person.objects.create(first_name="Émile", last_name="Dûpont", phone="+31 6 8765 4321")
+
+    def names(self, q):
+        with self.assertNumQueries(1):
+            return [str(p) for p in fuzzy_people(q).order_by("-fuzzy_score", "id")]
+
+    def test_normalisation(self):
+        self.assertEqual(fold_name("Émile", "Dûpont-Ölçer"), "emile dupont olcer")
+        self.assertEqual(normalize_phone("+31 6 8765 4321"), "0687654321")
+        self.assertEqual(normalize_phone("0031 (0)6-1234"), "0061234")
+        self.assertEqual(normalize_phone("06-1234 5678"), "0612345678")
+
+    def test_typos_accents_and_phone(self):
+        self.assertEqual(self.names("jansn")[0], "Anna Jansen")
+        self.assertEqual(self.names("emile dupont"), ["Émile Dûpont"])
+        self.assertEqual(self.names("vries"), ["Jan van der Vries"])
+        self.assertEqual(self.names("0687654321"), ["Émile Dûpont"])
+        self.assertEqual(self.names("1234 56"), ["Jan van der Vries"])
+        self.assertEqual(self.names("xyz"), [])
+
+        self.jansen.last_name = "Pietersen"
+        self.jansen.save()
+        self.assertNotIn("Anna Pietersen", self.names("jansen"))
+        self.assertIn("Anna Pietersen", self.names("pietersen"))
+
+    def test_person_list_ranks_and_pages_by_score(self):
+        for i in range(30):
+            Person.objects.create(first_name=f"Kees{i}", last_name="Jansen")
+        self.client.force_login(self.user)
+
+        seen, cursor = [], None
+        for _ in range(3):
+            response = self.client.get(reverse("people:list"), {"q": "jansen", "cursor": cursor or ""})
+            page = response.context["page_obj"]
+            seen += [p.pk for p in page]
+            cursor = page.next_cursor
+            if not cursor:
+                break
+        # alle Jansens eerst (meeste gedeelde trigrammen), "Jan" van der Vries als zwakke match erachter
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(seen[-1], self.vries.pk)
+        self.assertEqual(set(seen[:-1]), set(Person.objects.filter(last_name="Jansen").values_list("pk", flat=True)))
+
+        response = self.client.get(reverse("people:list"), {"q": "jansn", "match": "words"})
+        self.assertEqual(list(response.context["people"]), [])
+
+
+class SignalActivationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.creator = User.objects.create_user("creator", password="pw", is_staff=True)
+        cls.staff = [User.objects.create_user(f"staff{i}", is_staff=True) for i in range(3)]
+        cls.signal_type = SignalType.objects.create(name="Algemeen")
+        cls.today = timezone.localdate()
+        cls.later = cls.today + timedelta(days=3)
+
+    def setUp(self):
+        self.client.force_login(self.creator)
+
+    def _create_signal(self, active_from, **data):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("signals:create"), {
+                "type": self.signal_type.id, "active_from": active_from.isoformat(), "body": "Later", **data,
+            })
+        return Signal.objects.latest("id")
+
+    def test_scheduled_signal_is_hidden_and_silent(self):
+        signal = self._create_signal(self.later)
+        self.assertFalse(Job.objects.exists())
+
+        response = self.client.get(reverse("signals:list"))
+        self.assertNotIn(signal, response.context["signals"])
+        response = self.client.get(reverse("signals:list"), {"scheduled": "1"})
+        self.assertIn(signal, response.context["signals"])
+        self.assertEqual(inbox(self.staff[0])["items"], [])
+
+    def test_daily_pass_notifies_once(self):
+        unassigned = self._create_signal(self.later)
+        assigned = self._create_signal(self.later, assigned_to=self.staff[0].id)
+        self._create_signal(self.later + timedelta(days=1))
+        # vandaag aangemaakt en actief: die kreeg zijn notificaties al bij het aanmaken
+        Signal.objects.create(type=self.signal_type, body="Nu")
+
+        self.assertEqual(activate_signals(self.later - timedelta(days=1))["signals"], 0)
+        stats = activate_signals(self.later)
+        self.assertEqual(stats["signals"], 2)
+        self.assertEqual(stats["notifications"], 1 + len(self.staff) + 1)
+        self.assertEqual(
+            set(Notification.objects.filter(object_id=unassigned.id).values_list("user_id", flat=True)),
+            {self.creator.id, *(u.id for u in self.staff)},
+        )
+        n = Notification.objects.get(object_id=assigned.id)
+        self.assertEqual((n.user_id, n.kind, n.body, n.url), (self.staff[0].id, "signal_created", "Later", f"/signals/{assigned.id}/"))
+        self.assertEqual(unread_count(self.staff[0]), 2)
+
+        # opnieuw (of met inhalen): niets dubbel
+        self.assertEqual(activate_signals(self.later + timedelta(days=1), days=2)["notifications"], len(self.staff) + 1)
+        self.assertEqual(activate_signals(self.later + timedelta(days=1), days=2)["notifications"], 0)
+
+    def test_moving_date_to_today_notifies_now(self):
+        signal = self._create_signal(self.later)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("signals:set_active_from", args=[signal.id]), {"active_from": self.today.isoformat()})
+        self.assertEqual(Job.objects.get().payload, {"signal_id": signal.id, "created_by_id": self.creator.id})
+
+        # terug naar de toekomst: nu niets
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("signals:set_active_from", args=[signal.id]), {"active_from": self.later.isoformat()})
+        self.assertEqual(Job.objects.count(), 1)
+
+
+def _url_names(patterns, prefix=""):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _url_names(pattern.url_patterns, f"{prefix}{pattern.namespace}:" if pattern.namespace else prefix)
+        elif pattern.name:
+            yield prefix + pattern.name
+
+
+class QueryCountMixin:
+    """assertQueries: een view mag hooguit `budget` queries doen en geen queryvorm herhalen (N+1)."""
+
+    # zoveel keer dezelfde vorm geldt als N+1 (zoveel rijen per model in de fixtures); minder
+    # is meestal een vast aantal, bv. één UPDATE per dashboardteller
+    repeat_threshold = 5
+
+    def assertQueries(self, budget: int, method: str, url: str, data=None):
+        with QueryRecorder() as recorder:
+            response = getattr(self.client, method)(url, data or {})
+            if response.streaming:
+                b"".join(response.streaming_content)
+        self.assertLess(response.status_code, 400, f"{method.upper()} {url}")
+        listing = "\n".join(f"  {sql}" for sql, _ in recorder.queries)
+        self.assertLessEqual(recorder.count, budget, f"{method.upper()} {url}: {recorder.count} queries\n{listing}")
+        repeated = recorder.repeated(self.repeat_threshold)
+        self.assertEqual(repeated, [], f"{method.upper()} {url}: herhaalde queries (N+1)")
+        return response
+
+
+class QueryBudgetTests(QueryCountMixin, TestCase):
+    ROWS = QueryCountMixin.repeat_threshold
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("staff", password="pw", is_staff=True)
+        cls.other = User.objects.create_user("collega", is_staff=True)
+        cls.signal_status = Status.objects.create(key="open", name="Open", scope="signal")
+        cls.task_status = Status.objects.create(key="todo", name="Te doen", scope="task")
+        cls.signal_type = SignalType.objects.create(name="Algemeen")
+        cls.task_type = TaskType.objects.create(name="Bellen")
+        due = timezone.now() + timedelta(days=1)
+        for i in range(cls.ROWS):
+            user = cls.user if i % 2 else cls.other
+            objs = [
+                Signal.objects.create(type=cls.signal_type, status=cls.signal_status, assigned_to=user, body=f"melding {i}"),
+                Task.objects.create(type=cls.task_type, status=cls.task_status, assigned_to=user, due_at=due, body=f"taak {i}"),
+                Person.objects.create(first_name=f"Persoon{i}", last_name="Jansen", email=f"p{i}@example.nl"),
+            ]
+            for obj in objs:
+                log_history(obj, user, "created", {})
+                Note.objects.create(content_object=obj, author=user, body=f"notitie {i}")
+                notify_users(obj, [cls.user.id], kind="test", title=f"notificatie {i}")
+        cls.signal, cls.task, cls.person = objs
+
+    def setUp(self):
+        # referentiedata en dashboardcijfers komen anders uit de cache van een eerdere test
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def cases(self):
+        """
+        url-naam -> (budget, methode, url, data); None = niet via de test client te meten.
+        Het budget is het huidige aantal queries met een lege cache: meer is een regressie,
+        minder mag omlaag.
+        """
+        signal, task, person = self.signal.pk, self.task.pk, self.person.pk
+        signal_data = {"type": self.signal_type.pk, "active_from": "2026-01-01", "status": self.signal_status.pk, "body": "x"}
+        task_data = {"type": self.task_type.pk, "due_at": "2026-01-01T09:00", "status": self.task_status.pk, "body": "x"}
+        person_data = {"person_type": "student", "first_name": "Nieuw", "last_name": "Persoon"}
+        ids = {"ids": [signal], "action": "status", "status_id": self.signal_status.pk}
+        return {
+            "dashboard": (10, "get", reverse("dashboard"), None),
+            "login": (0, "get", reverse("login"), None),
+            "logout": (4, "post", reverse("logout"), None),
+            "inbox": (7, "get", reverse("inbox"), None),
+            "search": (5, "get", reverse("search"), {"q": "jansen"}),
+            "notifications_mark_all_read": (4, "post", reverse("notifications_mark_all_read"), None),
+            # eindeloze event-stream; zie NotificationStreamTests
+            "notification_stream": None,
+            "signals:list": (8, "get", reverse("signals:list"), None),
+            "signals:create": (21, "post", reverse("signals:create"), signal_data),
+            "signals:export": (3, "get", reverse("signals:export"), None),
+            "signals:bulk": (8, "post", reverse("signals:bulk"), ids),
+            "signals:detail": (12, "get", reverse("signals:detail", args=[signal]), None),
+            "signals:signal_update": (26, "post", reverse("signals:signal_update", args=[signal]), {**signal_data, "body": "y"}),
+            "signals:set_status": (5, "post", reverse("signals:set_status", args=[signal]), {"status_id": ""}),
+            "signals:set_type": (6, "post", reverse("signals:set_type", args=[signal]), {"type_id": self.signal_type.pk}),
+            "signals:set_active_from": (16, "post", reverse("signals:set_active_from", args=[signal]), {"active_from": "2026-01-02"}),
+            "signals:set_assignee": (16, "post", reverse("signals:set_assignee", args=[signal]), {"assigned_to": ""}),
+            "signals:add_note": (13, "post", reverse("signals:add_note", args=[signal]), {"body": "notitie"}),
+            "signals:toggle_archive": (19, "post", reverse("signals:toggle_archive", args=[signal]), None),
+            "activities:list": (7, "get", reverse("activities:list"), None),
+            "people:list": (4, "get", reverse("people:list"), None),
+            "people:create": (11, "post", reverse("people:create"), person_data),
+            "people:export": (3, "get", reverse("people:export"), None),
+            "people:detail": (5, "get", reverse("people:detail", args=[person]), None),
+            "people:update": (15, "post", reverse("people:update", args=[person]), {**person_data, "first_name": "Ander"}),
+            "people:add_note": (13, "post", reverse("people:add_note", args=[person]), {"body": "notitie"}),
+            "tasks:list": (8, "get", reverse("tasks:list"), None),
+            "tasks:create": (12, "post", reverse("tasks:create"), task_data),
+            "tasks:export": (3, "get", reverse("tasks:export"), None),
+            "tasks:bulk": (8, "post", reverse("tasks:bulk"), {**ids, "ids": [task], "status_id": self.task_status.pk}),
+            "tasks:detail": (9, "get", reverse("tasks:detail", args=[task]), None),
+            "tasks:update": (13, "post", reverse("tasks:update", args=[task]), {**task_data, "body": "y"}),
+            "tasks:add_note": (13, "post", reverse("tasks:add_note", args=[task]), {"body": "notitie"}),
+            "tasks:toggle_archive": (18, "post", reverse("tasks:toggle_archive", args=[task]), None),
+        }
+
+    def test_every_url_has_a_budget(self):
+        self.assertEqual(sorted(_url_names(core_urlpatterns)), sorted(self.cases()))
+
+    def test_query_budgets(self):
+        for name, case in self.cases().items():
+            if case is None:
+                continue
+            with self.subTest(name):
+                cache.clear()
+                self.client.force_login(self.user)
+                self.assertQueries(*case)
+
+    def test_shape_ignores_values(self):
+        self.assertEqual(
+            shape('SELECT * FROM "t" WHERE "id" = 12 AND "k" IN (%s, %s,%s) AND "n" = \'x\' LIMIT 21'),
+            shape('SELECT * FROM  "t" WHERE "id" = 7 AND "k" IN (%s) AND "n" = \'y\' LIMIT 21'),
+        )
+
+    @override_settings(QUERY_BUDGET_ENABLED=True, QUERY_BUDGET=3, QUERY_BUDGET_REPEAT=2)
+    def test_middleware_reports_budget_and_repeats(self):
+        with self.assertLogs("core.querybudget", "WARNING") as logs:
+            response = self.client.get(reverse("signals:list"))
+        self.assertRegex(response["Server-Timing"], r'^db;dur=[\d.]+;desc="\d+ queries", total;dur=[\d.]+$')
+        details = logs.records[0].query_budget
+        self.assertEqual((details["view"], details["budget"]), ("signals:list", 3))
+        self.assertGreater(details["queries"], 3)
+
+    @override_settings(QUERY_BUDGET_ENABLED=True, QUERY_BUDGET_VIEWS={"signals:list": 50})
+    def test_middleware_quiet_within_budget(self):
+        with self.assertNoLogs("core.querybudget"):
+            response = self.client.get(reverse("signals:list"))
+        self.assertIn("Server-Timing", response)
+
+    def test_middleware_is_opt_in(self):
+        self.assertNotIn("Server-Timing", self.client.get(reverse("signals:list")))
+
+
+class FakeDataTests(TestCase):
+    VOLUMES = {"user": 3, "person": 6, "signal": 8, "task": 8, "note": 10, "history": 12, "notification": 10}
+
+    def test_fill_is_consistent_and_deterministic(self):
+        counts = FakeData(seed=7, batch_size=4).fill(self.VOLUMES)
+        self.assertEqual(dict(counts), self.VOLUMES)
+        self.assertEqual(Signal.objects.count(), 8)
+        self.assertEqual(HistoryEvent.objects.count(), 12)
+        # bijgehouden zoals bij gewone saves
+        self.assertTrue(search.search(Person.objects.first().last_name, models=[Person]))
+        self.assertEqual(dashboard.summary_stats()["open_signals"], dashboard.live_stats()["open_signals"])
+        self.assertEqual(
+            sum(NotificationCounter.objects.values_list("unread", flat=True)),
+            Notification.objects.filter(is_read=False).count(),
+        )
+
+        names = list(Person.objects.order_by("id").values_list("first_name", "last_name"))
+        FakeData(seed=7, batch_size=3).fill({"user": 3, "person": 6})
+        self.assertEqual(list(Person.objects.order_by("id").values_list("first_name", "last_name"))[6:], names)
+
+    def test_created_at_spread_after_parent(self):
+        FakeData(seed=7, batch_size=4).fill({**self.VOLUMES, "note": 40, "history": 40, "notification": 40})
+        parents = {
+            model: dict(model.objects.values_list("id", "created_at")) for model in (Signal, Task, Person)
+        }
+        for model in (Note, HistoryEvent, Notification):
+            rows = model.objects.values_list("content_type_id", "object_id", "created_at")
+            self.assertGreater(len({timezone.localdate(created_at) for _, _, created_at in rows}), 10)
+            for ct_id, object_id, created_at in rows:
+                born = parents[ContentType.objects.get_for_id(ct_id).model_class()][object_id]
+                self.assertGreaterEqual(created_at, born)
+        # de activiteitsweken tellen op de verspreide created_at
+        self.assertEqual(dashboard.summary_stats()["activity_weeks"], dashboard.live_stats()["activity_weeks"])
+
+    def test_id_pool(self):
+        pool = IdPool([5, 6, 7, 20, 21, 9])
+        self.assertEqual((len(pool), pool.starts), (6, [5, 20, 9]))
+        self.assertEqual([pool[i] for i in range(6)], [5, 6, 7, 20, 21, 9])
+        self.assertEqual((list(pool), pool[-1]), ([5, 6, 7, 20, 21, 9], 9))
+        with self.assertRaises(IndexError):
+            pool[6]
+
+    def test_seed_bulk_command(self):
+        out = StringIO()
+        args = ["--users=2", "--people=4", "--signals=6", "--tasks=6", "--notes=5", "--history=7", "--notifications=5"]
+        call_command("seed_bulk", *args, "--batch-size=4", "--seed=3", stdout=out)
+        self.assertIn("rijen/s", out.getvalue())
+        self.assertEqual((Signal.objects.count(), Note.objects.count(), HistoryEvent.objects.count()), (6, 5, 7))
+        # notities en history hangen aan rijen uit de run
+        self.assertEqual(Note.objects.filter(content_type__model="signal", object_id__in=Signal.objects.values("id")).count()
+                         + Note.objects.filter(content_type__model="task", object_id__in=Task.objects.values("id")).count()
+                         + Note.objects.filter(content_type__model="person", object_id__in=Person.objects.values("id")).count(), 5)
+        if connection.vendor != "postgresql":
+            with self.assertRaisesMessage(CommandError, "PostgreSQL"):
+                call_command("seed_bulk", "--copy", stdout=out)
+
+    def test_benchmark_command(self):
+        path = Path(tempfile.mkdtemp()) / "bench.json"
+        volumes = [f"--volume={kind}={n}" for kind, n in self.VOLUMES.items()]
+        out = StringIO()
+        call_command("bench_views", "--scales", "1,2", "--repeat", "2", "--warmup", "0", *volumes, "--json", str(path), stdout=out)
+        report = json.loads(path.read_text())
+        self.assertEqual(report["volumes"]["2.0"]["signal"], 16)
+        row = next(r for r in report["results"] if r["view"] == "signals:list" and r["scale"] == 2)
+        self.assertGreater(row["queries"], 0)
+        self.assertLessEqual(row["p50_ms"], row["p99_ms"])
+        self.assertFalse(Signal.objects.exists())
+
+        call_command("bench_views", "--scales", "1", "--repeat", "1", "--views", "dashboard", *volumes,
+                     "--baseline", str(path), stdout=out)
+        self.assertIn("p50 ", out.getvalue().splitlines()[-1])
@@ -1,11 +1,21 @@
 from django.urls import path, include
-from .views import dashboard, AppLoginView, AppLogoutView
+from .views import dashboard, global_search, inbox, notification_stream, notifications_mark_all_read, AppLoginView, AppLogoutView
 
 urlpatterns = [
     path("", dashboard, name="dashboard"),
     path("login/", AppLoginView.as_view(), name="login"),
     path("logout/", AppLogoutView.as_view(), name="logout"),
 
+    ## INBOX ("mijn werk")
+    path("inbox/", inbox, name="inbox"),
+
+    ## SEARCH
+    path("search/", global_search, name="search"),
+
+    ## NOTIFICATIONS
+    path("notifications/read-all/", notifications_mark_all_read, name="notifications_mark_all_read"),
+    path("notifications/stream/", notification_stream, name="notification_stream"),
+
     ## SIGNALS
     path("signals/", include("core.signals.urls", namespace="signals")),
 
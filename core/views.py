@@ -1,11 +1,27 @@
+import json
+
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.views import LoginView, LogoutView
-from django.shortcuts import render
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Max, Subquery
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.shortcuts import redirect, render
 from django.contrib.contenttypes.models import ContentType
+from django.utils.http import url_has_allowed_host_and_scheme
+from django.views.decorators.http import require_POST
 
 from core.models.history import HistoryEvent
-from core.models.notifications import Notification
-from core.models.core import Signal
+from core.models.notifications import Notification, NotificationCounter
+from core.models.core import Signal, Task
+from core.models.notes import Note
+from core.models.people import Person
+from core.auth import staff_required
+from core.services import search
+from core.services.inbox import SOURCES as INBOX_SOURCES, inbox as build_inbox
+from core.services.dashboard import stats as dashboard_stats
+from core.services.notifications import mark_all_read
+from core.services.pubsub import broker
 
 class AppLoginView(LoginView):
     template_name = "core/auth/login.html"
@@ -73,4 +89,122 @@ def dashboard(request):
     return render(request, "core/dashboard.html", {
         "active_nav": "dashboard",
         "activities": activities,
-    })
\ No newline at end of file
+        "stats": dashboard_stats(),
+    })
+
+
+@staff_required
+def inbox(request):
+    data = build_inbox(request.user)
+    return render(request, "core/inbox.html", {
+        "items": data["items"],
+        # labels zonder dubbelen: twee bronnen heten "Melding"
+        "more": list(dict.fromkeys(INBOX_SOURCES[source][0] for source, more in data["more"].items() if more)),
+        "active_nav": "inbox",
+    })
+
+
+SEARCH_TYPES = {
+    "signal": Signal,
+    "task": Task,
+    "note": Note,
+    "person": Person,
+}
+
+
+@staff_required
+def global_search(request):
+    q = (request.GET.get("q") or "").strip()
+    type_ = (request.GET.get("type") or "").strip()
+
+    results = []
+    if q:
+        models = [SEARCH_TYPES[type_]] if type_ in SEARCH_TYPES else None
+        results = search.search(q, models=models, limit=50)
+        for r in results:
+            r.type_label = search.TYPE_LABELS.get(r.content_type.model, r.content_type.model)
+
+    return render(request, "core/search.html", {
+        "q": q,
+        "type": type_,
+        "type_choices": [(key, search.TYPE_LABELS[key]) for key in SEARCH_TYPES],
+        "results": results,
+    })
+
+
+@login_required
+@require_POST
+def notifications_mark_all_read(request):
+    updated = mark_all_read(request.user)
+
+    if request.accepts("application/json") and not request.accepts("text/html"):
+        return JsonResponse({"marked_read": updated, "unread": 0})
+
+    next_url = request.POST.get("next") or request.META.get("HTTP_REFERER")
+    if not url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()}, require_https=request.is_secure()):
+        next_url = "dashboard"
+    return redirect(next_url)
+
+
+def _sse(data: dict, event: str, event_id: int) -> str:
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _notification_events(user_id: int, last_id: int, poll_interval: float, batch_size: int = 50):
+    """
+    Nieuwe notificaties (id > last_id) van één user als server-sent events.
+
+    Wakker via de in-process broker zodra de fan-out commit; zonder wake-up kijkt de
+    stream toch elke `poll_interval` seconden in de DB (jobs uit een ander proces)
+    en stuurt anders een keepalive-commentaar.
+    """
+    unread = NotificationCounter.objects.filter(user_id=user_id).values("unread")
+    subscription = broker.subscribe(user_id)
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            rows = [
+                row async for row in (
+                    Notification.objects
+                    .filter(user_id=user_id, id__gt=last_id)
+                    .order_by("id")
+                    .annotate(unread=Subquery(unread))
+                    .values("id", "title", "body", "url", "created_at", "unread")[:batch_size]
+                )
+            ]
+            for row in rows:
+                last_id = row["id"]
+                row["created_at"] = row["created_at"].isoformat()
+                row["unread"] = row["unread"] or 0
+                yield _sse(row, "notification", last_id)
+            if len(rows) == batch_size:
+                continue
+
+            if await subscription.wait(poll_interval) is None:
+                yield ": keepalive\n\n"
+    finally:
+        subscription.close()
+
+
+@login_required
+async def notification_stream(request):
+    if not isinstance(request, ASGIRequest):
+        # onder WSGI zou de stream een worker-thread voor altijd bezet houden;
+        # 204 vertelt EventSource dat hij niet opnieuw moet verbinden
+        return HttpResponse(status=204)
+
+    user = await request.auser()
+    last_id = request.headers.get("Last-Event-ID") or request.GET.get("last_id")
+    if last_id and last_id.isdigit():
+        last_id = int(last_id)
+    else:
+        latest = await Notification.objects.filter(user_id=user.id).aaggregate(m=Max("id"))
+        last_id = latest["m"] or 0
+
+    response = StreamingHttpResponse(
+        _notification_events(user.id, last_id, settings.NOTIFICATION_STREAM_POLL_INTERVAL),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
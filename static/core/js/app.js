@@ -1,4 +1,4 @@
-function () {
+!function () {
     const toggles = document.querySelectorAll("[data-sidebar-toggle]");
     const sidebar = document.getElementById("sidebar");
 
@@ -21,4 +21,44 @@ function () {
             sidebar.classList.remove("open");
         }
     });
-}();
\ No newline at end of file
+}();
+
+(function () {
+    // Live notificaties (server-sent events); zonder ASGI antwoordt de server 204 en stopt dit vanzelf
+    const el = document.querySelector("[data-notification-stream]");
+    if (!el || !window.EventSource) return;
+
+    const badge = el.querySelector("[data-unread-count]");
+    const markAll = el.querySelector("[data-mark-all-read]");
+    const source = new EventSource(el.dataset.notificationStream);
+
+    source.addEventListener("notification", (e) => {
+        const data = JSON.parse(e.data);
+        if (badge) badge.textContent = data.unread;
+        if (markAll) markAll.hidden = !data.unread;
+    });
+})();
+
+(function () {
+    // Bulkacties: "alles selecteren" en het aantal geselecteerde regels
+    const form = document.querySelector("[data-bulk-form]");
+    if (!form) return;
+
+    const boxes = () => document.querySelectorAll(`input[name="ids"][form="${form.id}"]`);
+    const all = document.querySelector("[data-bulk-all]");
+    const count = form.querySelector("[data-bulk-count]");
+
+    const update = () => {
+        const checked = [...boxes()].filter(b => b.checked).length;
+        if (count) count.textContent = checked ? `${checked} geselecteerd` : "";
+        if (all) all.checked = checked > 0 && checked === boxes().length;
+    };
+
+    if (all) {
+        all.addEventListener("change", () => {
+            boxes().forEach(b => { b.checked = all.checked; });
+            update();
+        });
+    }
+    boxes().forEach(b => b.addEventListener("change", update));
+})();